@@ -0,0 +1,10 @@
+"""Path hack to make the benchmarks work, rendering without a display."""
+
+import os
+import sys
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../")
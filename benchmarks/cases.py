@@ -0,0 +1,226 @@
+"""Benchmarks of the public entry points of mpl_bsic.
+
+Each benchmark has a ``setup`` function which, given the input size and
+a temporary directory, prepares the inputs (not timed) and returns
+the function to time.
+The data of each size is generated only once, and reused across runs.
+"""
+
+import os
+from functools import lru_cache
+from typing import Callable
+
+import benchconf  # noqa
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from mpl_bsic import (
+    apply_bsic_logo,
+    apply_bsic_style,
+    df_to_excel,
+    export_figure,
+    format_timeseries_axis,
+    plot_trade,
+    preprocess_dataframe,
+    release_figure,
+    style_excel_file,
+)
+from mpl_bsic.export_figure import _save_figure
+from utils.run_animations import run_animations
+
+POINTS = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+"""Sizes (number of points of the timeseries) of the plotting benchmarks."""
+
+CELLS = [100, 10_000, 1_000_000]
+"""Sizes (number of cells of the table) of the Excel benchmarks."""
+
+EXCEL_COLUMNS = 10
+
+PNG_DPIS = [100, 300, 1200]
+
+Setup = Callable[[int, str], Callable[[], object]]
+
+
+@lru_cache(maxsize=2)
+def _timeseries(n: int) -> tuple[pd.Series, pd.Series]:
+    """Underlying and PnL of a trade, one tick per minute.
+
+    The trade is entered (at most) 30 days before the end,
+    within the months plotted by ``plot_trade``.
+    """
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2000-01-03", periods=n, freq="min")
+
+    underlying = pd.Series(100 + rng.standard_normal(n).cumsum(), index)
+    pnl = pd.Series(rng.standard_normal(n), index)
+    pnl.iloc[: n - min(n // 2, 30 * 24 * 60)] = np.nan
+
+    return underlying, pnl
+
+
+@lru_cache(maxsize=1)
+def _raw_dataframe(n: int) -> pd.DataFrame:
+    """DataFrame as read from a CSV (dates as strings)."""
+    underlying, pnl = _timeseries(n)
+
+    return pd.DataFrame(
+        {
+            "Date": underlying.index.strftime("%Y-%m-%d %H:%M"),
+            "Underlying": underlying.to_numpy(),
+            "PnL": pnl.to_numpy(),
+            "Ticker": np.where(np.arange(n) % 2 == 0, "UST", "TIPS"),
+        }
+    )
+
+
+@lru_cache(maxsize=1)
+def _table(cells: int) -> pd.DataFrame:
+    rows = max(cells // EXCEL_COLUMNS, 1)
+    rng = np.random.default_rng(0)
+
+    return pd.DataFrame(
+        rng.standard_normal((rows, EXCEL_COLUMNS)),
+        columns=[f"Col {i}" for i in range(EXCEL_COLUMNS)],
+    )
+
+
+@lru_cache(maxsize=1)
+def _excel_file(cells: int, tmp_dir: str) -> str:
+    path = os.path.join(tmp_dir, f"table_{cells}.xlsx")
+    _table(cells).to_excel(path, sheet_name="data")
+
+    return path
+
+
+def _line_figure(n: int):
+    underlying, _ = _timeseries(n)
+
+    fig, ax = plt.subplots(1, 1)
+    ax.plot(underlying.index, underlying.to_numpy())
+    ax.set_title("Benchmark")
+
+    return fig, ax
+
+
+def _setup_style(n: int, tmp_dir: str):
+    fig, ax = _line_figure(n)
+
+    def run():
+        apply_bsic_style(fig, ax)
+        run_animations(fig)
+
+    return run
+
+
+def _setup_logo(n: int, tmp_dir: str):
+    fig, ax = _line_figure(n)
+
+    def run():
+        apply_bsic_logo(fig, ax)
+        run_animations(fig)
+
+    return run
+
+
+def _setup_export_svg(n: int, tmp_dir: str):
+    fig, ax = _line_figure(n)
+    apply_bsic_style(fig, ax)
+
+    return lambda: export_figure(fig, os.path.join(tmp_dir, "figure"))
+
+
+def _setup_export_png(dpi: int) -> Setup:
+    def setup(n: int, tmp_dir: str):
+        fig, ax = _line_figure(n)
+        apply_bsic_style(fig, ax)
+        run_animations(fig)
+
+        # as export_figure, in PNG (as render_charts and the chart service)
+        path = os.path.join(tmp_dir, "figure.png")
+        return lambda: _save_figure(fig, path, "png", dpi)
+
+    return setup
+
+
+def _setup_plot_trade(n: int, tmp_dir: str):
+    underlying, pnl = _timeseries(n)
+
+    # the chart is only styled when it is drawn (not exported: see export_figure_*)
+    def run():
+        trade = plot_trade(underlying, pnl, "nominal", "Benchmark", "Underlying")
+        run_animations(trade.fig)
+        trade.fig.canvas.draw()
+        release_figure(trade.fig, collect=False)
+
+    return run
+
+
+def _setup_format_axis(n: int, tmp_dir: str):
+    index = _timeseries(n)[0].index
+
+    # the ticks only depend on the limits (and the index), not on the lines
+    fig, ax = plt.subplots(1, 1)
+    ax.set_xlim(index[0], index[-1])
+
+    def run():
+        format_timeseries_axis(ax, business_index=index)
+        fig.canvas.draw()
+
+    return run
+
+
+def _setup_preprocess(n: int, tmp_dir: str):
+    df = _raw_dataframe(n)
+
+    return lambda: preprocess_dataframe(df, inplace=False)
+
+
+def _setup_df_to_excel(cells: int, tmp_dir: str):
+    df = _table(cells)
+    path = os.path.join(tmp_dir, "table.xlsx")
+
+    return lambda: df_to_excel(df, path, title="Benchmark")
+
+
+def _setup_style_excel(cells: int, tmp_dir: str):
+    path = _excel_file(cells, tmp_dir)
+
+    return lambda: style_excel_file(path, "data", "Benchmark")
+
+
+BENCHMARKS: dict[str, dict] = {
+    "apply_bsic_style": {"setup": _setup_style, "sizes": POINTS, "unit": "points"},
+    "apply_bsic_logo": {"setup": _setup_logo, "sizes": POINTS, "unit": "points"},
+    "export_figure_svg": {
+        "setup": _setup_export_svg,
+        "sizes": POINTS,
+        "unit": "points",
+    },
+    **{
+        f"export_figure_png_{dpi}dpi": {
+            "setup": _setup_export_png(dpi),
+            "sizes": POINTS,
+            "unit": "points",
+        }
+        for dpi in PNG_DPIS
+    },
+    "plot_trade": {"setup": _setup_plot_trade, "sizes": POINTS, "unit": "points"},
+    "format_timeseries_axis": {
+        "setup": _setup_format_axis,
+        "sizes": POINTS,
+        "unit": "points",
+    },
+    "preprocess_dataframe": {
+        "setup": _setup_preprocess,
+        "sizes": POINTS,
+        "unit": "rows",
+    },
+    "df_to_excel": {"setup": _setup_df_to_excel, "sizes": CELLS, "unit": "cells"},
+    "style_excel_file": {
+        "setup": _setup_style_excel,
+        "sizes": CELLS,
+        "unit": "cells",
+    },
+}
+"""Benchmarks, by name: their setup, the sizes swept and the unit of the sizes."""
@@ -0,0 +1,248 @@
+"""Times the public entry points of mpl_bsic, and measures their peak memory.
+
+The peak memory is the peak resident set size (RSS) of a fresh process
+running the benchmark once: unlike ``tracemalloc``, it includes the
+buffers allocated outside of Python (e.g. by the Agg renderer).
+It also includes the interpreter, the imports and the inputs.
+
+The results are stored as JSON, so that runs can be compared::
+
+    python benchmarks/run_benchmarks.py --max-size 100000 --output before.json
+    # ... change the code ...
+    python benchmarks/run_benchmarks.py --max-size 100000 --compare before.json
+
+With ``--compare``, the exit code is 1 if any benchmark is slower
+(or uses more memory) than the baseline by more than ``--threshold``.
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing
+import multiprocessing.forkserver
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional
+
+import benchconf  # noqa
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from cases import BENCHMARKS
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "results")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.realpath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _metadata() -> dict:
+    return {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "matplotlib": matplotlib.__version__,
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def _peak_rss() -> int:
+    """Peak resident set size of the current process, in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # in kilobytes on Linux, but in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _measure_memory(name: str, size: int, tmp_dir: str) -> int:
+    """Runs the benchmark once, and returns the peak RSS of the process."""
+    func = BENCHMARKS[name]["setup"](size, tmp_dir)
+    gc.collect()
+    func()
+
+    return _peak_rss()
+
+
+def _memory_context() -> multiprocessing.context.BaseContext:
+    """Context of the processes measuring the peak memory.
+
+    A forked process starts with the RSS of its parent as its peak:
+    they are forked from a server started now, before any benchmark runs
+    (with the benchmarks already imported), not from this process.
+    """
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(["cases"])
+    multiprocessing.forkserver.ensure_running()
+
+    return context
+
+
+def run_benchmark(
+    name: str,
+    size: int,
+    repeat: int,
+    tmp_dir: str,
+    context: multiprocessing.context.BaseContext,
+) -> dict:
+    """Times ``repeat`` runs of the benchmark, then measures the peak memory
+    of one more run, in a new process (so that the peak is its own)."""
+    setup = BENCHMARKS[name]["setup"]
+
+    times = []
+    for _ in range(repeat):
+        func = setup(size, tmp_dir)
+        gc.collect()
+
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+        plt.close("all")
+
+    with ProcessPoolExecutor(1, mp_context=context) as pool:
+        peak_rss = pool.submit(_measure_memory, name, size, tmp_dir).result()
+
+    return {
+        "name": name,
+        "size": size,
+        "unit": BENCHMARKS[name]["unit"],
+        "repeat": repeat,
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+        "peak_rss": peak_rss,
+    }
+
+
+def run_benchmarks(
+    names: list[str], max_size: Optional[int], repeat: int
+) -> list[dict]:
+    results = []
+    context = _memory_context()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in names:
+            for size in BENCHMARKS[name]["sizes"]:
+                if max_size is not None and size > max_size:
+                    continue
+
+                result = run_benchmark(name, size, repeat, tmp_dir, context)
+                results.append(result)
+                print(
+                    f"{name:<28} {size:>12,} {result['unit']:<6} "
+                    f"{result['median'] * 1e3:>12.2f} ms "
+                    f"{result['peak_rss'] / 2**20:>10.2f} MiB",
+                    flush=True,
+                )
+
+    return results
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float) -> bool:
+    """Prints the ratios to the baseline, and returns whether any regressed."""
+    baseline_by_key = {(r["name"], r["size"]): r for r in baseline}
+
+    regressed = False
+    print(f"\n{'':<28} {'size':>12} {'time':>8} {'memory':>8}")
+    for result in results:
+        base = baseline_by_key.get((result["name"], result["size"]))
+        if base is None:
+            continue
+
+        time_ratio = result["median"] / base["median"]
+        # the baselines measured with tracemalloc have no peak RSS
+        memory_ratio = result["peak_rss"] / max(base.get("peak_rss", np.inf), 1)
+        slower = time_ratio > threshold or memory_ratio > threshold
+        regressed = regressed or slower
+
+        memory = f"{memory_ratio:>7.2f}x" if "peak_rss" in base else f"{'-':>8}"
+        print(
+            f"{result['name']:<28} {result['size']:>12,} "
+            f"{time_ratio:>7.2f}x {memory}" + ("  <- regression" if slower else "")
+        )
+
+    return regressed
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "names",
+        nargs="*",
+        help="Benchmarks to run (substrings of their names), by default all.",
+    )
+    parser.add_argument("--max-size", type=int, help="Skip the sizes larger than this.")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs of each benchmark."
+    )
+    parser.add_argument("--output", help="Path of the JSON file of the results.")
+    parser.add_argument("--compare", help="JSON file of the results to compare to.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="Ratio to the baseline above which a benchmark has regressed.",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="List the benchmarks and exit."
+    )
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, bench in BENCHMARKS.items():
+            sizes = ", ".join(f"{size:,}" for size in bench["sizes"])
+            print(f"{name:<28} {bench['unit']}: {sizes}")
+        return 0
+
+    names = [
+        name
+        for name in BENCHMARKS
+        if not args.names or any(pattern in name for pattern in args.names)
+    ]
+    if not names:
+        parser.error(f"No benchmark matches {args.names}")
+
+    results = run_benchmarks(names, args.max_size, args.repeat)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{stamp}.json")
+
+    with open(output, "w") as f:
+        json.dump({"metadata": _metadata(), "results": results}, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+        if compare(results, baseline, args.threshold):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Soak test: exports many trades in a loop, and tracks the memory (RSS).
+
+With ``release_figure``, the RSS should stay flat after the first charts::
+
+    python benchmarks/soak.py --charts 10000
+    # the figures are only closed with plt.close: the RSS grows steadily
+    python benchmarks/soak.py --charts 1000 --no-release
+
+Each chart is exported as with ``export_figure`` (about a second each),
+so 10k charts take a few hours.
+"""
+
+import argparse
+import gc
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from typing import Optional
+
+import benchconf  # noqa
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from mpl_bsic import export_figure, plot_trade
+
+WARMUP_CHARTS = 20
+"""Charts after which the memory should be flat (caches filled, fonts loaded)."""
+
+
+def _rss_mib() -> float:
+    """Current RSS (on Linux), or the peak RSS on other platforms."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _trade(i: int) -> tuple[pd.Series, pd.Series]:
+    rng = np.random.default_rng(i)
+    index = pd.bdate_range("2022-01-03", periods=300)
+
+    underlying = pd.Series(100 + rng.standard_normal(300).cumsum(), index)
+    pnl = pd.Series(rng.standard_normal(300), index)
+    pnl.iloc[:250] = np.nan
+
+    return underlying, pnl
+
+
+def soak(charts: int, every: int, release: bool) -> list[dict]:
+    samples = []
+    start = time.perf_counter()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, "trade")
+
+        for i in range(1, charts + 1):
+            underlying, pnl = _trade(i)
+            trade = plot_trade(underlying, pnl, "nominal", f"Trade {i}", "Underlying")
+
+            if release:
+                export_figure(trade.fig, filename, release=True)
+            else:
+                export_figure(trade.fig, filename)
+                plt.close(trade.fig)
+            del trade
+
+            if i % every == 0 or i == WARMUP_CHARTS:
+                sample = {
+                    "charts": i,
+                    "rss_mib": _rss_mib(),
+                    "gc_objects": len(gc.get_objects()),
+                    "elapsed": time.perf_counter() - start,
+                }
+                samples.append(sample)
+                print(
+                    f"{i:>8} charts {sample['rss_mib']:>10.1f} MiB "
+                    f"{sample['gc_objects']:>10} objects "
+                    f"{sample['elapsed']:>10.1f} s",
+                    flush=True,
+                )
+
+    return samples
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--charts", type=int, default=10_000)
+    parser.add_argument(
+        "--every", type=int, default=500, help="Charts between two samples."
+    )
+    parser.add_argument(
+        "--no-release",
+        action="store_true",
+        help="Only close the figures with plt.close (the behavior before).",
+    )
+    parser.add_argument("--output", help="Path of the JSON file of the samples.")
+    args = parser.parse_args(argv)
+
+    samples = soak(args.charts, args.every, release=not args.no_release)
+
+    warm = [s for s in samples if s["charts"] >= WARMUP_CHARTS]
+    if len(warm) > 1:
+        growth = warm[-1]["rss_mib"] - warm[0]["rss_mib"]
+        per_chart = growth / (warm[-1]["charts"] - warm[0]["charts"]) * 2**10
+        print(
+            f"\nRSS growth after warm-up: {growth:.1f} MiB ({per_chart:.1f} KiB/chart)"
+        )
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump({"release": not args.no_release, "samples": samples}, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,27 @@
 from .apply_bsic_logo import apply_bsic_logo  # noqa
 from .apply_bsic_style import apply_bsic_style  # noqa
+from .async_renderer import (  # noqa
+    AsyncRenderer,
+    df_to_excel_async,
+    export_figure_async,
+    plot_trade_async,
+    render_chart_async,
+)
+from .bsic_figure import FigurePool, bsic_figure  # noqa
+from .bsic_style import bsic_style  # noqa
 from .check_figsize import check_figsize  # noqa
+from .dates_to_num import dates_to_num  # noqa
+from .decimate import decimate  # noqa
 from .export_figure import export_figure  # noqa
 from .format_timeseries_axis import format_timeseries_axis  # noqa
+from .headless import headless  # noqa
+from .load_dataframe import load_dataframe  # noqa
+from .plot_timeseries import plot_timeseries  # noqa
 from .plot_trade import plot_trade  # noqa
+from .plot_trades import plot_trades  # noqa
 from .preprocess_dataframe import preprocess_dataframe  # noqa
+from .profiling import profiling  # noqa
+from .release_figure import closing_figures, release_figure  # noqa
+from .render_charts import hash_chart, render_charts  # noqa
 from .style_excel import df_to_excel, style_excel_file  # noqa
+from .trade_stats import trade_stats  # noqa
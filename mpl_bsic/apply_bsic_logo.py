@@ -1,15 +1,20 @@
 import os
 import sysconfig
+from functools import lru_cache
 from typing import Literal
 
 import matplotlib.image as image
 from matplotlib.animation import FuncAnimation
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
+from matplotlib.image import BboxImage
 from matplotlib.offsetbox import AnnotationBbox, OffsetImage
+from matplotlib.transforms import Bbox
 
 from utils.set_animations import insert_animation
 
+from .profiling import _phase
+
 Location = Literal["top left", "top right", "bottom left", "bottom right"]
 
 _ANN_ANCHOR_POINTS = {
@@ -33,6 +38,13 @@ def _get_img_path(logo_type: str):
     return path
 
 
+@lru_cache(maxsize=None)
+def _load_logo(logo_type: str):
+    """Reads the logo image, only once per logo type."""
+    with _phase("logo_imread"):
+        return image.imread(_get_img_path(logo_type))
+
+
 def _get_annotation_position(ax: Axes, location: Location, fr: float):
     x0, x1 = ax.get_xbound()
     y0, y1 = ax.get_ybound()
@@ -52,6 +64,62 @@ def _get_annotation_position(ax: Axes, location: Location, fr: float):
     return pos
 
 
+@lru_cache(maxsize=None)
+def _normalized_logo(logo_type: str):
+    """The logo as normalized by matplotlib for drawing, only once per logo type."""
+    image = BboxImage(Bbox.unit())
+    image.set_data(_load_logo(logo_type))
+
+    normalized = image.get_array()
+    # shared by all the logos drawn: it must never change
+    normalized.flags.writeable = False
+
+    return normalized
+
+
+class _LogoImage(OffsetImage):
+    """An ``OffsetImage`` of the logo, sharing its normalized array.
+
+    ``OffsetImage`` keeps its own normalized copy of the image, 44 MB for
+    the formal logo: a grid of 100 trades would hold 100 copies of it.
+    """
+
+    def __init__(self, logo_type: str, zoom: float):
+        self._logo_type = logo_type
+        super().__init__(_load_logo(logo_type), zoom=zoom)
+
+    def set_data(self, arr):
+        self._data = arr
+        self.image._A = _normalized_logo(self._logo_type)
+        self.image._imcache = None
+        self.stale = True
+
+
+def _logo_imagebox(logo_type: str, scale: float, alpha: float) -> OffsetImage:
+    # gets the logo image (read from disk, and normalized, only the first time)
+    imagebox = _LogoImage(logo_type, zoom=scale)
+    imagebox.image.set_alpha(alpha)
+
+    return imagebox
+
+
+def _logo_annotation_box(
+    imagebox: OffsetImage, position: tuple[float, float], location: Location
+) -> AnnotationBbox:
+    """Create the annotation box containing the logo,
+    at the correct location (top left, top right, bottom left, bottom right),
+    at the correct position on the plot (from the corner).
+    """
+    return AnnotationBbox(
+        imagebox,
+        position,
+        box_alignment=_ANN_ANCHOR_POINTS[location],
+        pad=0,
+        frameon=False,
+        bboxprops=dict(edgecolor="None"),
+    )
+
+
 def apply_bsic_logo(
     fig: Figure,
     ax: Axes,
@@ -145,35 +213,12 @@ def apply_bsic_logo(
         run_animations(fig) # only needed for the docs, don't call in the actual code
     """
 
-    # gets the path for the logo and reads the image
-    image_path = _get_img_path(logo_type)
-    logo = image.imread(image_path)
-
-    imagebox = OffsetImage(logo, zoom=scale)
-    imagebox.image.set_alpha(alpha)
-
-    # generates the annotation box containing the logo at the correct position
-    def gen_logo_annotation_box(position: tuple[float, float]) -> AnnotationBbox:
-        """Create the annotation box containing the logo,
-        at the correct location (top left, top right, bottom left, bottom right),
-        at the correct position on the plot (from the corner).
-        """
-
-        ab = AnnotationBbox(
-            imagebox,
-            position,
-            box_alignment=_ANN_ANCHOR_POINTS[location],
-            pad=0,
-            frameon=False,
-            bboxprops=dict(edgecolor="None"),
-        )
-
-        return ab
+    imagebox = _logo_imagebox(logo_type, scale, alpha)
 
     def logo_animation_func(_):
         position = _get_annotation_position(ax, location, closeness_to_border)
 
-        ab = gen_logo_annotation_box(position)
+        ab = _logo_annotation_box(imagebox, position, location)
         new_ab = ax.add_artist(ab)
         return [new_ab]
 
@@ -1,14 +1,18 @@
+import os
 from typing import Union
 
+import matplotlib as mpl
+import matplotlib.colors as mcolors
 import numpy as np
 from cycler import cycler
-from matplotlib import pyplot as plt
-from matplotlib.animation import FuncAnimation
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
+from matplotlib.text import Text
 
 from utils.add_fonts import add_fonts
-from utils.set_animations import insert_animation
+from utils.set_animations import insert_deferred
+
+from .profiling import _phase
 
 DEFAULT_TITLE_STYLE = {
     "fontname": "Gill Sans MT",
@@ -84,41 +88,80 @@ This is the examples section. WIP.
 """
 
 
-def _style_axis(fig: Figure, ax: Axes):
-    ax.set_prop_cycle(DEFAULT_COLOR_CYCLE)
+BSIC_FONT = "Garamond"
+"""Font family of the text of the plots (labels, ticks...)."""
+
+BSIC_STYLE_PATH = os.path.join(os.path.dirname(__file__), "bsic.mplstyle")
+"""Path of the BSIC matplotlib style (``bsic.mplstyle``)."""
+
+BSIC_RC = dict(mpl.rc_params_from_file(BSIC_STYLE_PATH, use_default_template=False))
+"""Matplotlib rc settings of the BSIC style.
+
+They are read once from ``bsic.mplstyle``, which is also registered
+as the ``"bsic"`` matplotlib style, so figures can be created already
+in the BSIC style (``plt.style.use("bsic")``).
+They are written to the global ``rcParams`` by ``apply_bsic_style``
+(unless ``scoped=True``), or applied only within ``bsic_style``.
+"""
+
+
+def _style_texts(fig: Figure):
+    """Sets the BSIC font on the texts of the figure that use the default font.
+
+    Used by the scoped style instead of the rcParams,
+    so texts with a font set explicitly (e.g. titles) are left as they are.
+    """
+    default_family = list(mpl.rcParams["font.family"])
+    default_size = float(mpl.rcParams["font.size"])
+
+    for text in fig.findobj(Text):
+        text: Text
+        if text.get_fontfamily() == default_family:
+            text.set_fontfamily(BSIC_FONT)
+        if text.get_fontsize() == default_size:
+            text.set_fontsize(DEFAULT_FONT_SIZE)
+
+
+def _has_bsic_colors(lines: list) -> bool:
+    return all(
+        mcolors.same_color(line.get_color(), color)
+        for line, color in zip(lines, BSIC_COLORS)
+    )
+
+
+def _style_title(ax: Axes):
+    ax.set_title(ax.get_title(), **DEFAULT_TITLE_STYLE)
+
+
+def _style_axis(ax: Axes) -> bool:
+    """Styles the axis, and returns whether its title still has to be styled."""
+    lines = ax.get_lines()
 
-    def update_title_anim(_):
-        ax.set_title(ax.get_title(), **DEFAULT_TITLE_STYLE)
+    # axes created with the BSIC style (e.g. with plt.style.use("bsic"))
+    # already have the right colors, and do not need to be recolored
+    restyle_lines = len(lines) > 0 and not _has_bsic_colors(lines)
+    if len(lines) == 0 or restyle_lines:
+        ax.set_prop_cycle(DEFAULT_COLOR_CYCLE)
 
-        return ax.artists
+    if restyle_lines:
+        # set line colors if already plotted
+        for line, color in zip(lines, BSIC_COLORS):
+            line.set(color=color)
+
+        # set legend colors if already plotted
+        if ax.get_legend() is not None:
+            ax.legend()
 
     # if title has already been set, apply the style
     if ax.get_title() != "":
-        ax.set_title(ax.get_title(), **DEFAULT_TITLE_STYLE)
-    # otherwise, wait for it to get applied and then apply the style
-    else:
-        ani = FuncAnimation(
-            fig,
-            update_title_anim,
-            frames=1,
-            blit=False,
-            cache_frame_data=False,
-            repeat=False,
-        )
-
-        insert_animation(fig, ani)
-
-    # set line colors if already plotted
-    lines = ax.get_lines()
-    for line, color in zip(lines, BSIC_COLORS):
-        line.set(color=color)
+        _style_title(ax)
+        return False
 
-    # set legend colors if already plotted
-    if ax.get_legend() is not None:
-        ax.legend()
+    # otherwise, wait for it to get applied and then apply the style
+    return True
 
 
-def _add_sources(fig: Figure, sources: Union[str, list[str]]):
+def _sources_text(sources: Union[str, list[str]]) -> str:
     txt = ""
 
     # if a single source which is not BSIC, add BSIC
@@ -129,9 +172,9 @@ def _add_sources(fig: Figure, sources: Union[str, list[str]]):
         txt = f"Source: {sources}"
 
     else:
-        # if BSIC is not the first source, insert it
+        # if BSIC is not the first source, insert it (without changing the list)
         if "BSIC" not in sources:
-            sources.insert(0, "BSIC")
+            sources = ["BSIC", *sources]
         txt += "Sources: " if len(sources) > 1 else "Source: "
 
         for i, source in enumerate(sources):
@@ -139,17 +182,25 @@ def _add_sources(fig: Figure, sources: Union[str, list[str]]):
             if i != len(sources) - 1:
                 txt += ", "
 
+    return txt
+
+
+def _add_sources(fig: Figure, sources: Union[str, list[str]]):
     # add the text to the figure
-    fig.text(0.5, 0, txt, ha="center")
+    fig.text(0.5, 0, _sources_text(sources), ha="center")
 
 
 def apply_bsic_style(
-    fig: Figure, ax: Union[Axes, np.ndarray], sources: Union[str, list[str]] = "BSIC"
+    fig: Figure,
+    ax: Union[Axes, np.ndarray],
+    sources: Union[str, list[str]] = "BSIC",
+    scoped: bool = False,
 ):
     r"""Apply the BSIC Style to an existing matplotlib plot.
 
     You can call this function at any point in your code, the BSIC style will be applied
     regardless. Before saving, however, make sure you do ``plt.show()``
+    (or export with ``export_figure``, which does it for you)
     so that the style gets applied to the plot.
     This function works by adding an animation such that,
     regardless of where you specify your title,
@@ -173,13 +224,18 @@ def apply_bsic_style(
     .. warning:: You have to make sure you always call ``plt.show()``,
         even if you just want to export the figure. This makes sure
         that the animation is performed and the correct style is applied to the title.
+        ``export_figure`` performs the animations itself: in batch jobs
+        (see ``headless``), export with it and skip ``plt.show()``.
 
     Parameters
     ----------
     fig : matplotlib.figure.Figure
         Matplotlib Figure instance.
-    ax : matplotlib.axes.Axes
-        Matplotlib Axes instance.
+    ax : matplotlib.axes.Axes | numpy.ndarray
+        Matplotlib Axes instance, or array of Axes of any shape
+        (e.g. as returned by ``plt.subplots(10, 10)``).
+        All the Axes are styled in a single pass,
+        with a single animation for the whole figure.
     sources : str | list[str], optional
         List of sources, by default "BSIC".
         You can either specify a string (if you have only one source)
@@ -193,11 +249,23 @@ def apply_bsic_style(
         This happens because I want to make sure
         there is enough space between the plot and the sources text,
         so I position the text at the very bottom of the figure.
+    scoped : bool, optional
+        Whether to apply the style only to this figure, by default False.
+        By default, the font, the color cycle and the export settings
+        are written to the global ``rcParams`` (see ``BSIC_RC``),
+        so they also apply to the figures created afterwards.
+        If True, no global setting is written: the font is set on the texts
+        of the figure (including the ones added before it is drawn),
+        so that figures with different styles can be rendered
+        at the same time, e.g. from a ``ThreadPoolExecutor``.
+        Use ``export_figure`` to export it with the BSIC settings.
 
     See Also
     --------
     mpl_bsic.apply_bsic_logo :
         Applies the BSIC Logo to plots.
+    mpl_bsic.bsic_style :
+        Applies the BSIC rc settings within a context.
 
     Examples
     --------
@@ -232,27 +300,41 @@ def apply_bsic_style(
 
         ax.plot(x,y)
     """
-    add_fonts()
-
-    # sets font family, size, and cycler to rcparams
-    plt.rcParams["font.sans-serif"] = "Garamond"
-    plt.rcParams["font.size"] = DEFAULT_FONT_SIZE
-    plt.rcParams["axes.prop_cycle"] = DEFAULT_COLOR_CYCLE
+    with _phase("add_fonts"):
+        add_fonts()
 
-    # to make sure the figure is saved correctly
-    plt.rcParams["savefig.bbox"] = "tight"
-    plt.rcParams["savefig.dpi"] = 1200
+    # sets font family, size, cycler and export settings to rcparams
+    if not scoped:
+        mpl.rcParams.update(BSIC_RC)
 
     # apply style to suptitle
     if hasattr(fig, "get_suptitle") and fig.get_suptitle() != "":
         fig.suptitle(fig.get_suptitle(), **DEFAULT_TITLE_STYLE)
 
-    if isinstance(ax, Axes):
-        _style_axis(fig, ax)
-    else:
-        for axis in ax:
-            axis: Axes
-            _style_axis(fig, axis)
+    # any shape of axes (e.g. a 2D grid of subplots) is styled in one pass
+    axes = [ax] if isinstance(ax, Axes) else np.ravel(ax)
+    untitled = []
+    for axis in axes:
+        with _phase("_style_axis"):
+            if _style_axis(axis):
+                untitled.append(axis)
 
     # add sources to plot
-    _add_sources(fig, sources)
+    with _phase("_add_sources"):
+        _add_sources(fig, sources)
+
+    if scoped:
+        _style_texts(fig)
+
+    # one deferred call for the whole figure styles the titles set afterwards
+    # (and, if scoped, the texts added afterwards, e.g. labels and legends)
+    if untitled or scoped:
+
+        def style_deferred():
+            for axis in untitled:
+                _style_title(axis)
+
+            if scoped:
+                _style_texts(fig)
+
+        insert_deferred(fig, style_deferred)
@@ -0,0 +1,519 @@
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, Union
+
+import pandas as pd
+from matplotlib.figure import Figure
+
+from .export_figure import EXPORT_DPI, export_figure
+from .plot_trade import Timeseries
+from .render_charts import _normalize_spec, _ping, _render_spec, _warm_worker
+from .style_excel import df_to_excel
+
+
+def _render_to_file(spec: dict) -> bytes:
+    """Renders a normalized spec, and writes its file (if any), in a worker."""
+    image = _render_spec(spec)
+
+    if "filename" in spec:
+        with open(f"{spec['filename']}.{spec['format']}", "wb") as f:
+            f.write(image)
+
+    return image
+
+
+def _check_headless(fig: Figure):
+    """Refuses the figures managed by pyplot, which threads must not touch."""
+    if fig.canvas.manager is not None:
+        raise Exception(
+            "Only headless figures can be exported in a thread. "
+            "Create the figure within headless(), or use export_figure."
+        )
+
+
+class _Lane:
+    """An executor, with a bounded number of jobs submitted to it.
+
+    A job holds its slot until it is done (or cancelled before it started),
+    even if the task awaiting it was cancelled meanwhile: the slots bound
+    the work actually queued or running in the executor.
+    """
+
+    def __init__(
+        self,
+        start: Callable[[], Executor],
+        max_pending: int,
+        max_waiting: Optional[int],
+    ):
+        self._start = start
+        self.max_pending = max_pending
+        self.max_waiting = max_waiting
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        # asyncio primitives belong to a loop: the slots (and the tasks
+        # waiting for them) of each loop
+        self._slots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._waiting: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @property
+    def executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._start()
+
+            return self._executor
+
+    def _restart(self, executor: Executor):
+        # a worker died (e.g. out of memory): the next jobs get a new executor
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable, *args):
+        loop = asyncio.get_running_loop()
+        slots = self._slots.setdefault(loop, asyncio.Semaphore(self.max_pending))
+
+        if slots.locked():
+            waiting = self._waiting.get(loop, 0)
+            if self.max_waiting is not None and waiting >= self.max_waiting:
+                raise Exception(
+                    f"Too many jobs are waiting ({waiting}): try again later"
+                )
+            self._waiting[loop] = waiting + 1
+            try:
+                await slots.acquire()
+            finally:
+                self._waiting[loop] -= 1
+        else:
+            await slots.acquire()
+
+        executor = self.executor
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            slots.release()
+            raise
+
+        def release(_: Future):
+            try:
+                loop.call_soon_threadsafe(slots.release)
+            except RuntimeError:
+                pass  # the loop is closed
+
+        future.add_done_callback(release)
+
+        try:
+            # cancelling the task cancels the job too, if it has not started yet
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            self._restart(executor)
+            raise
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class AsyncRenderer:
+    """Render charts and export files from asyncio, off the event loop.
+
+    The CPU-bound work runs on two bounded executors, so that a slow chart
+    never blocks the other tasks of the event loop:
+
+    - a pool of worker processes renders the charts described by specs
+      (``render`` and ``plot_trade``). They are warmed up (fonts, logos
+      and matplotlib caches) when they start, and are headless.
+    - a pool of threads exports the figures of the current process
+      (``export_figure``) and writes the Excel files (``df_to_excel``).
+      Since pyplot is not thread-safe, only headless figures
+      (see ``headless``) can be exported by the threads.
+
+    Back-pressure: at most ``max_pending`` jobs are submitted to each
+    executor (per event loop). The tasks beyond it wait for a slot,
+    without blocking the loop; if ``max_waiting`` tasks (of the same
+    event loop) are already waiting, the next ones fail at once
+    (e.g. to answer "503 busy").
+
+    Cancellation: cancelling a task waiting for a slot, or whose job has
+    not started yet, drops the job. A job already running cannot be
+    interrupted: it runs to the end (and keeps its slot until then),
+    and its result is discarded.
+
+    Parameters
+    ----------
+    processes : int | None, optional
+        The number of worker processes, by default None (as many as the CPUs).
+    threads : int | None, optional
+        The number of threads, by default None (4).
+    max_pending : int | None, optional
+        The maximum number of jobs submitted to each executor,
+        by default None (4 per worker).
+    max_waiting : int | None, optional
+        The maximum number of tasks waiting for a slot,
+        by default None (unbounded).
+
+    See Also
+    --------
+    mpl_bsic.render_charts :
+        Render charts described by specs, in batches.
+    mpl_bsic.plot_trade_async :
+        Render a trade chart, without blocking the event loop.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import AsyncRenderer
+
+        async def main(trades):
+            async with AsyncRenderer(processes=4, max_waiting=100) as renderer:
+                await renderer.start()  # optional: warms up the workers now
+                images = await asyncio.gather(
+                    *[
+                        renderer.plot_trade(underlying, pnl, "nominal", name, name)
+                        for name, (underlying, pnl) in trades.items()
+                    ]
+                )
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        threads: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        max_waiting: Optional[int] = None,
+    ):
+        self.processes = processes or os.cpu_count() or 1
+        self.threads = threads or 4
+
+        self._processes = _Lane(
+            self._start_processes,
+            max_pending or 4 * self.processes,
+            max_waiting,
+        )
+        self._threads = _Lane(
+            self._start_threads,
+            max_pending or 4 * self.threads,
+            max_waiting,
+        )
+
+    def _start_processes(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.processes, initializer=_warm_worker)
+
+    def _start_threads(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(self.threads, thread_name_prefix="mpl_bsic")
+
+    async def start(self):
+        """Starts (and warms up) the worker processes now, not on the first chart."""
+        await asyncio.gather(
+            *[self._processes.run(_ping) for _ in range(self.processes)]
+        )
+
+    async def render(self, spec: dict) -> bytes:
+        """Renders a chart spec (see ``render_charts``) in a worker process.
+
+        The spec is checked at once, in the current process. If it has
+        a ``filename``, the worker also writes the image to its file.
+        """
+        return await self._processes.run(_render_to_file, _normalize_spec(spec))
+
+    async def plot_trade(
+        self,
+        underlying: Timeseries,
+        pnl: Timeseries,
+        pnl_type: str,
+        title: str,
+        underlying_name: str,
+        format: str = "svg",
+        dpi: float = EXPORT_DPI,
+        filename: Optional[str] = None,
+        **kwargs,
+    ) -> bytes:
+        """Renders a trade (as ``plot_trade``) in a worker process, to an image.
+
+        The keyword arguments are the options of the trade spec
+        (see ``render_charts``): the parameters of ``plot_trade``,
+        ``sources`` and ``figsize``.
+        """
+        spec = {
+            "kind": "trade",
+            "underlying": underlying,
+            "pnl": pnl,
+            "pnl_type": pnl_type,
+            "title": title,
+            "underlying_name": underlying_name,
+            "format": format,
+            "dpi": dpi,
+            **kwargs,
+        }
+        if filename is not None:
+            spec["filename"] = filename
+
+        return await self.render(spec)
+
+    async def export_figure(self, fig: Figure, filename: str, release: bool = False):
+        """Exports a figure (as ``export_figure``) in a thread.
+
+        The figure lives in the current process, so it is exported by
+        a thread: do not modify it until the export is done.
+        It must be headless (created within ``headless``): pyplot is not
+        thread-safe, so the figures it manages (e.g. shown in a GUI)
+        are refused, with an Exception.
+        """
+        _check_headless(fig)
+        await self._threads.run(export_figure, fig, filename, release)
+
+    async def df_to_excel(
+        self,
+        df: Union[pd.DataFrame, list[pd.DataFrame]],
+        path_to_excel: str,
+        title: Optional[Union[str, list[str]]] = None,
+        offset: tuple[int, int] = (1, 1),
+    ):
+        """Writes the Excel file (as ``df_to_excel``) in a thread.
+
+        Do not modify the DataFrames until the file is written.
+        """
+        await self._threads.run(df_to_excel, df, path_to_excel, title, offset)
+
+    def shutdown(self, wait: bool = True):
+        """Stops the executors, cancelling the jobs which have not started."""
+        self._processes.shutdown(wait)
+        self._threads.shutdown(wait)
+
+    async def __aenter__(self) -> "AsyncRenderer":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # waiting for the running jobs would block the loop
+        await asyncio.get_running_loop().run_in_executor(None, self.shutdown)
+
+
+_RENDERER: Optional[AsyncRenderer] = None
+_RENDERER_LOCK = threading.Lock()
+
+
+def _default_renderer() -> AsyncRenderer:
+    global _RENDERER
+    with _RENDERER_LOCK:
+        if _RENDERER is None:
+            _RENDERER = AsyncRenderer()
+
+        return _RENDERER
+
+
+async def render_chart_async(spec: dict) -> bytes:
+    """Render a chart spec, without blocking the event loop.
+
+    Same as ``render_charts([spec])[0]`` (without cache), but rendered by
+    a worker process of the shared ``AsyncRenderer``, while the event loop
+    keeps running the other tasks.
+
+    Parameters
+    ----------
+    spec : dict
+        The chart spec (see ``render_charts``).
+
+    Returns
+    -------
+    bytes
+        The image of the chart.
+
+    Raises
+    ------
+    Exception
+        If the spec is not valid (before it is sent to a worker).
+
+    See Also
+    --------
+    mpl_bsic.AsyncRenderer :
+        Render charts and export files from asyncio, with custom limits.
+    mpl_bsic.render_charts :
+        Render charts described by specs, in batches.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import render_chart_async
+
+        async def prices_chart(prices):
+            return await render_chart_async(
+                {
+                    "kind": "line",
+                    "title": "Prices",
+                    "index": prices.index,
+                    "series": prices,
+                    "format": "png",
+                    "dpi": 200,
+                }
+            )
+    """
+    return await _default_renderer().render(spec)
+
+
+async def plot_trade_async(
+    underlying: Timeseries,
+    pnl: Timeseries,
+    pnl_type: str,
+    title: str,
+    underlying_name: str,
+    format: str = "svg",
+    dpi: float = EXPORT_DPI,
+    filename: Optional[str] = None,
+    **kwargs,
+) -> bytes:
+    """Render a trade chart, without blocking the event loop.
+
+    The trade is plotted (as ``plot_trade``) and exported
+    (as ``export_figure``) by a worker process of the shared
+    ``AsyncRenderer``, and its image is returned: the figure itself
+    cannot leave the worker.
+
+    Parameters
+    ----------
+    underlying : Timeseries
+        The price of the underlying (see ``plot_trade``).
+    pnl : Timeseries
+        The PnL of the trade (see ``plot_trade``).
+    pnl_type : str
+        "nominal" or "cumulative".
+    title : str
+        The title of the chart.
+    underlying_name : str
+        The name of the underlying.
+    format : str, optional
+        The format of the image, "svg" (the default) or "png".
+    dpi : float, optional
+        The DPI of the image, by default 1200.
+    filename : str | None, optional
+        Also write the image to ``filename + "." + format``, by default None.
+    **kwargs
+        The other parameters of ``plot_trade`` (e.g. ``months_offset``,
+        ``sources`` or ``stats``) and ``figsize``, as in a trade spec.
+
+    Returns
+    -------
+    bytes
+        The image of the chart.
+
+    See Also
+    --------
+    mpl_bsic.plot_trade :
+        Plot a single trade.
+    mpl_bsic.AsyncRenderer :
+        Render charts and export files from asyncio, with custom limits.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import plot_trade_async
+
+        async def trade_chart(underlying, pnl):
+            return await plot_trade_async(
+                underlying, pnl, "nominal", "Long 10Y", "10Y Yield", format="png"
+            )
+    """
+    return await _default_renderer().plot_trade(
+        underlying,
+        pnl,
+        pnl_type,
+        title,
+        underlying_name,
+        format=format,
+        dpi=dpi,
+        filename=filename,
+        **kwargs,
+    )
+
+
+async def export_figure_async(fig: Figure, filename: str, release: bool = False):
+    """Export a figure, without blocking the event loop.
+
+    Same as ``export_figure``, run by a thread of the shared
+    ``AsyncRenderer``. The figure must not be modified until it is exported.
+    Since pyplot is not thread-safe, the figure must be headless
+    (created within ``headless``, so not managed by pyplot).
+
+    Parameters
+    ----------
+    fig : Figure
+        The ``matplotlib`` figure to export.
+    filename : str
+        The filename that should be used when exporting.
+    release : bool, optional
+        Whether to release the figure once exported, by default False.
+
+    Raises
+    ------
+    Exception
+        If the figure is managed by pyplot (not headless).
+
+    See Also
+    --------
+    mpl_bsic.export_figure :
+        Export a figure according to BSIC Standards.
+    mpl_bsic.plot_trade_async :
+        Render a trade chart in a worker process.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import export_figure_async, headless, plot_trade
+
+        async def export(underlying, pnl):
+            with headless():
+                trade = plot_trade(underlying, pnl, "nominal", "Trade", "Underlying")
+
+            await export_figure_async(trade.fig, "output_filename", release=True)
+    """
+    await _default_renderer().export_figure(fig, filename, release)
+
+
+async def df_to_excel_async(
+    df: Union[pd.DataFrame, list[pd.DataFrame]],
+    path_to_excel: str,
+    title: Optional[Union[str, list[str]]] = None,
+    offset: tuple[int, int] = (1, 1),
+):
+    """Export a Pandas DataFrame to Excel, without blocking the event loop.
+
+    Same as ``df_to_excel``, run by a thread of the shared ``AsyncRenderer``.
+    The DataFrames must not be modified until the file is written.
+
+    Parameters
+    ----------
+    df : Union[pandas.DataFrame, list[pandas.DataFrame]]
+        Either a single DataFrame or a list of dataframes.
+    path_to_excel : str
+        The path of the Excel file.
+    title : Optional[Union[str, list[str]]], optional
+        The title (or titles) of the tables, by default None.
+    offset : tuple[int, int], optional
+        The offset of the table, by default (1, 1).
+
+    See Also
+    --------
+    mpl_bsic.df_to_excel :
+        Export a Pandas DataFrame as a formatted Excel table.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import df_to_excel_async
+
+        async def report(df):
+            await df_to_excel_async(df, "report.xlsx", "Positions")
+    """
+    await _default_renderer().df_to_excel(df, path_to_excel, title, offset)
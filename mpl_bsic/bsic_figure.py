@@ -0,0 +1,361 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Literal, Optional, Union
+
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.axis import Axis
+from matplotlib.figure import Figure
+from matplotlib.offsetbox import AnnotationBbox
+
+from utils.set_animations import clear_animations, insert_deferred
+
+from .apply_bsic_logo import (
+    _get_annotation_position,
+    _logo_annotation_box,
+    _logo_imagebox,
+)
+from .apply_bsic_style import (
+    DEFAULT_COLOR_CYCLE,
+    DEFAULT_TITLE_STYLE,
+    _sources_text,
+    _style_texts,
+    _style_title,
+    apply_bsic_style,
+)
+from .check_figsize import MAX_FIGURE_WIDTH
+from .plot_trade import TRADE_GRIDSPEC
+
+Layout = Literal["trade", "single", "grid"]
+
+FIGURE_TEMPLATES = {
+    "trade": {
+        "figsize": (6.4, 4.8),
+        "subplots": {
+            "nrows": 2,
+            "ncols": 1,
+            "sharex": True,
+            "gridspec_kw": TRADE_GRIDSPEC,
+        },
+        "subplots_adjust": {"bottom": 0.2},
+        "logo": (0, "top left"),
+    },
+    "single": {
+        "figsize": (MAX_FIGURE_WIDTH, MAX_FIGURE_WIDTH * 3 / 4),
+        "subplots": {"nrows": 1, "ncols": 1},
+        "subplots_adjust": {},
+        "logo": (0, "top left"),
+    },
+    "grid": {
+        "figsize": (MAX_FIGURE_WIDTH, MAX_FIGURE_WIDTH * 3 / 4),
+        "subplots": {"nrows": 2, "ncols": 2},
+        "subplots_adjust": {},
+        "logo": None,
+    },
+}
+"""Layouts of the figures handed out by ``bsic_figure``.
+
+* ``trade``: the PnL (top) and underlying (bottom) subplots of ``plot_trade``,
+  with the logo on the top left of the PnL.
+* ``single``: a single subplot, as wide as a Word document
+  (see ``check_figsize``), with the logo on the top left.
+* ``grid``: 2x2 subplots, as wide as a Word document.
+"""
+
+_SUBPLOTPARS = ("left", "bottom", "right", "top", "wspace", "hspace")
+
+
+def _build_template(layout: Layout) -> Figure:
+    """Creates the BSIC styled skeleton of the layout, without data."""
+    if layout not in FIGURE_TEMPLATES:
+        raise Exception(
+            f"Layout {layout} is not supported. "
+            f"Use one of {list(FIGURE_TEMPLATES)}."
+        )
+    template = FIGURE_TEMPLATES[layout]
+
+    # not managed by pyplot, so it can be kept for as long as needed
+    fig = Figure(figsize=template["figsize"])
+    axs = fig.subplots(**template["subplots"])
+    fig.subplots_adjust(**template["subplots_adjust"])
+
+    axes = [axs] if isinstance(axs, Axes) else list(np.ravel(axs))
+
+    apply_bsic_style(fig, axs, scoped=True)
+    # the texts are styled now, so the deferred style is armed on acquire
+    clear_animations(fig)
+
+    # the logo is created once, and only moved to the corner of each chart
+    logo = None
+    if template["logo"] is not None:
+        index, location = template["logo"]
+        imagebox = _logo_imagebox("formal", scale=0.03, alpha=1)
+        logo = _logo_annotation_box(imagebox, (0, 0), location)
+        axes[index].add_artist(logo)
+
+    fig._bsic_template = {
+        "layout": layout,
+        "axs": axs,
+        "axes": axes,
+        "logo": logo,
+        "sources": fig.texts[-1],
+        "figsize": tuple(fig.get_size_inches()),
+        "subplotpars": {name: getattr(fig.subplotpars, name) for name in _SUBPLOTPARS},
+    }
+
+    return fig
+
+
+def _style_template(fig: Figure):
+    """Styles the titles (and texts) set on a figure of the pool,
+    and moves the logo to the corner of the chart."""
+    template = fig._bsic_template
+    for ax in template["axes"]:
+        if ax.get_title() != "":
+            _style_title(ax)
+
+    logo = template["logo"]
+    if logo is not None and logo.get_visible():
+        index, location = FIGURE_TEMPLATES[template["layout"]]["logo"]
+        position = _get_annotation_position(template["axes"][index], location, 50)
+        logo.xy = logo.xybox = position
+
+    if fig.get_suptitle() != "":
+        fig.suptitle(fig.get_suptitle(), **DEFAULT_TITLE_STYLE)
+
+    _style_texts(fig)
+
+
+def _arm_template(fig: Figure, sources: Union[str, list[str]], logo: bool):
+    """Prepares a figure of the pool for a new chart."""
+    template = fig._bsic_template
+    template["sources"].set_text(_sources_text(sources))
+
+    if template["logo"] is not None:
+        template["logo"].set_visible(logo)
+
+    # the logo is placed in data coordinates, so only once the chart is drawn
+    insert_deferred(fig, lambda: _style_template(fig))
+
+
+def _reset_converter(axis: Axis):
+    """Forgets the units of the axis, so that the next data sets them again."""
+    if hasattr(axis, "_converter_is_explicit"):
+        # matplotlib >= 3.10: assigning axis.converter marks it as set by the user,
+        # and the units of the next chart could not replace it anymore
+        axis._converter = None
+        axis._converter_is_explicit = False
+    else:
+        axis.converter = None
+    axis.units = None
+
+
+def _reset_axes(ax: Axes, logo: Optional[AnnotationBbox]):
+    """Removes the data of the axes, and resets them to the template."""
+    for artists in (
+        ax.lines,
+        ax.patches,
+        ax.collections,
+        ax.images,
+        ax.texts,
+        ax.artists,
+        ax.tables,
+    ):
+        for artist in list(artists):
+            if artist is not logo:
+                artist.remove()
+    ax.containers.clear()
+
+    if ax.get_legend() is not None:
+        ax.get_legend().remove()
+
+    for loc in ("left", "center", "right"):
+        ax.set_title("", loc=loc)
+    ax.set_xlabel("")
+    ax.set_ylabel("")
+    ax.grid(False)
+
+    # forget the units (e.g. dates) and the scale, which also resets
+    # the locators and formatters (e.g. set by format_timeseries_axis)
+    for axis in (ax.xaxis, ax.yaxis):
+        _reset_converter(axis)
+    ax.set_xscale("linear")
+    ax.set_yscale("linear")
+
+    # auto=True, otherwise setting the limits of shared axes turns off
+    # the autoscaling of the axes already reset
+    ax.relim()
+    ax.set_xlim(0, 1, auto=True)
+    ax.set_ylim(0, 1, auto=True)
+    ax.set_prop_cycle(DEFAULT_COLOR_CYCLE)
+
+
+def _reset_template(fig: Figure):
+    """Removes everything added to the figure since it was acquired."""
+    template = fig._bsic_template
+    clear_animations(fig)
+
+    # e.g. twin axes and colorbars
+    for ax in fig.axes:
+        if ax not in template["axes"]:
+            fig.delaxes(ax)
+
+    for ax in template["axes"]:
+        _reset_axes(ax, template["logo"])
+
+    labels = [
+        label
+        for label in (fig._suptitle, fig._supxlabel, fig._supylabel)
+        if label is not None
+    ]
+    for label in labels:
+        label.set_text("")
+
+    keep = [template["sources"], *labels]
+    for artists in (fig.texts, fig.legends, fig.lines, fig.patches, fig.images):
+        for artist in list(artists):
+            if not any(artist is kept for kept in keep):
+                artist.remove()
+
+    fig.set_size_inches(template["figsize"])
+    fig.subplots_adjust(**template["subplotpars"])
+
+
+class FigurePool:
+    """Bounded pool of BSIC styled figures, reused across charts.
+
+    The skeleton of each layout (see ``FIGURE_TEMPLATES``) is created and styled
+    only once: the figures released are reset (their data, titles, labels,
+    limits, scales, units and layout are cleared) and handed out again,
+    instead of creating and styling new figures and axes for every chart.
+    At most ``max_size`` idle figures are kept for each layout.
+
+    The figures are styled with ``apply_bsic_style(..., scoped=True)``,
+    so they can be used from several threads at once.
+    They are not managed by pyplot: export them with ``export_figure``
+    (or ``fig.savefig``) before releasing them.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        The maximum number of idle figures kept for each layout, by default 4.
+
+    See Also
+    --------
+    mpl_bsic.bsic_figure :
+        Use a figure of the default pool within a context.
+    """
+
+    def __init__(self, max_size: int = 4):
+        self.max_size = max_size
+        self._idle: dict[str, list[Figure]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(
+        self,
+        layout: Layout = "single",
+        sources: Union[str, list[str]] = "BSIC",
+        logo: bool = True,
+    ) -> tuple[Figure, Union[Axes, np.ndarray]]:
+        """Get a styled figure of the layout, and its axes."""
+        with self._lock:
+            idle = self._idle.get(layout, [])
+            fig = idle.pop() if idle else None
+
+        if fig is None:
+            fig = _build_template(layout)
+
+        _arm_template(fig, sources, logo)
+
+        return fig, fig._bsic_template["axs"]
+
+    def release(self, fig: Figure):
+        """Reset the figure, and keep it for the next chart (if there is room)."""
+        if not hasattr(fig, "_bsic_template"):
+            raise Exception("The figure was not created by a FigurePool")
+
+        _reset_template(fig)
+
+        with self._lock:
+            idle = self._idle.setdefault(fig._bsic_template["layout"], [])
+            if len(idle) < self.max_size and not any(f is fig for f in idle):
+                idle.append(fig)
+
+    @contextmanager
+    def figure(
+        self,
+        layout: Layout = "single",
+        sources: Union[str, list[str]] = "BSIC",
+        logo: bool = True,
+    ) -> Iterator[tuple[Figure, Union[Axes, np.ndarray]]]:
+        """Use a styled figure of the layout within a context."""
+        fig, axs = self.acquire(layout, sources, logo)
+        try:
+            yield fig, axs
+        finally:
+            self.release(fig)
+
+
+_POOL = FigurePool()
+"""Pool used by ``bsic_figure``."""
+
+
+@contextmanager
+def bsic_figure(
+    layout: Layout = "single",
+    sources: Union[str, list[str]] = "BSIC",
+    logo: bool = True,
+) -> Iterator[tuple[Figure, Union[Axes, np.ndarray]]]:
+    """Use a pre-styled BSIC figure within a context.
+
+    The figure and its axes are taken from a pool of figures
+    already created and styled (see ``FigurePool``), and given back to it
+    (cleared) when the context exits, so that a process creating many charts
+    with the same layouts (e.g. daily reports) only creates
+    and styles each figure once.
+
+    The titles (and the suptitle) set on the figure are styled when it is
+    exported, as with ``apply_bsic_style``. Export the figure within
+    the context: once it exits, the figure is cleared and reused.
+
+    Parameters
+    ----------
+    layout : Literal['trade', 'single', 'grid'], optional
+        The layout of the figure, by default "single" (see ``FIGURE_TEMPLATES``).
+    sources : str | list[str], optional
+        List of sources, by default "BSIC". BSIC is always included.
+    logo : bool, optional
+        Whether to add the BSIC logo (if the layout has one), by default True.
+
+    Yields
+    ------
+    tuple[matplotlib.figure.Figure, matplotlib.axes.Axes | numpy.ndarray]
+        The figure and its axes (as returned by ``plt.subplots``).
+
+    Raises
+    ------
+    Exception
+        If the layout is not supported.
+
+    See Also
+    --------
+    mpl_bsic.apply_bsic_style :
+        Apply the BSIC style to an existing plot.
+    mpl_bsic.export_figure :
+        Export a figure according to BSIC Standards.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import bsic_figure, export_figure
+
+        for ticker, prices in data.items():
+            with bsic_figure("single", sources="Bloomberg") as (fig, ax):
+                ax.plot(prices)
+                ax.set_title(ticker)
+
+                export_figure(fig, ticker)
+    """
+    with _POOL.figure(layout, sources, logo) as (fig, axs):
+        yield fig, axs
@@ -0,0 +1,70 @@
+from contextlib import contextmanager
+
+import matplotlib as mpl
+from matplotlib import style
+
+from utils.add_fonts import add_fonts
+
+from .apply_bsic_style import BSIC_RC
+from .profiling import _phase
+
+
+def _register_style():
+    """Registers the BSIC style, so that ``plt.style.use("bsic")`` works."""
+    style.library["bsic"] = BSIC_RC
+    if "bsic" not in style.available:
+        style.available.append("bsic")
+        style.available.sort()
+
+
+_register_style()
+
+
+@contextmanager
+def bsic_style():
+    """Apply the BSIC rc settings within a context.
+
+    The font, the color cycle and the export settings of the BSIC style
+    (see ``BSIC_RC``) apply to the figures created and exported in the context,
+    and the previous settings are restored when it exits,
+    so they do not leak into other figures (e.g. the 1200 dpi export).
+    This is the same as ``plt.style.context("bsic")``
+    (the style is registered when importing ``mpl_bsic``),
+    but it also makes sure the BSIC fonts are available.
+
+    Figures created in the BSIC style are already colored, so that
+    ``apply_bsic_style`` does not need to recolor their lines and legends.
+
+    Texts created after the context exits (e.g. tick labels drawn later,
+    when calling ``plt.show()``) use the settings in place at that time:
+    create, draw and export the figure within the context,
+    or use ``apply_bsic_style(..., scoped=True)``, which applies the style
+    to the figure itself. The rc settings are global to the process,
+    so, to render figures from several threads at once,
+    use ``apply_bsic_style(..., scoped=True)`` instead.
+
+    See Also
+    --------
+    mpl_bsic.apply_bsic_style :
+        Apply the BSIC style to an existing plot.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import apply_bsic_style, bsic_style, export_figure
+
+        with bsic_style():
+            fig, ax = plt.subplots(1, 1)
+            ax.plot(x, y)
+            ax.set_title("Cos(x)")
+            # the rcParams written here are restored as well
+            apply_bsic_style(fig, ax)
+
+            export_figure(fig, "cos")
+    """
+    with _phase("add_fonts"):
+        add_fonts()
+
+    with mpl.rc_context(BSIC_RC):
+        yield
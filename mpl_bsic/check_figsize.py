@@ -4,6 +4,9 @@ from typing import Optional
 
 log = logging.getLogger("mpl_bsic")
 
+MAX_FIGURE_WIDTH = 7.32
+"""Width (in inches) of a Word document available for figures."""
+
 
 def check_figsize(
     width: Optional[float] = None,
@@ -89,12 +92,12 @@ def check_figsize(
                 "If you do not specify height, you must specify aspect_ratio and width"
             )
 
-        if width > 7.32:
+        if width > MAX_FIGURE_WIDTH:
             log.warning(
                 "Width is greater than 7.32 inches (the max length of a word document). Setting width to 7.32 inches."  # noqa: E501
             )
 
-            width = 7.32
+            width = MAX_FIGURE_WIDTH
 
         height = width / aspect_ratio
         return width, height
@@ -109,17 +112,17 @@ def check_figsize(
         width = height * aspect_ratio
 
         # if > 7.32, set to 7.32 and recompute height
-        if width > 7.32:
+        if width > MAX_FIGURE_WIDTH:
             log.warning(
                 "Width is greater than 7.32 inches (the max length of a word document). Setting width to 7.32 inches."  # noqa: E501
             )
 
-            width = 7.32
+            width = MAX_FIGURE_WIDTH
             height = width / aspect_ratio
 
         return width, height
 
-    if width > 7.32:
+    if width > MAX_FIGURE_WIDTH:
         log.warning(
             """Width is greater than 7.32 inches.
 This is the width of a word document available for figures.
@@ -129,7 +132,7 @@ the font sizes will not be consistent across the article and the graph"""
         log.info("Resizing to fit a word document")
 
         aspect_ratio = height / width
-        width = 7.32
+        width = MAX_FIGURE_WIDTH
         height = width * aspect_ratio
 
     return width, height
@@ -0,0 +1,64 @@
+from typing import Union
+
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+
+_NS_PER_DAY = 86_400 * 10**9
+
+
+def dates_to_num(dates: Union[pd.DatetimeIndex, np.ndarray, list]) -> np.ndarray:
+    """Convert dates to matplotlib date numbers.
+
+    Returns the same values as ``matplotlib.dates.date2num``
+    (days since the matplotlib epoch, as ``float64``),
+    computed in a single vectorised pass on the underlying ``int64`` nanoseconds.
+
+    Every time you pass a ``DatetimeIndex`` to ``ax.plot``, ``ax.fill_between``,
+    ``ax.scatter``, etc., matplotlib converts it to date numbers on its own.
+    When plotting several series sharing the same (long) index,
+    convert it once with this function and pass the result to all the calls
+    instead. The x-axis can then be formatted with ``format_timeseries_axis``.
+
+    Parameters
+    ----------
+    dates : pandas.DatetimeIndex | numpy.ndarray | list
+        The dates to convert. Timezone-aware dates are converted to UTC,
+        as in ``date2num``. Missing dates (``NaT``) are converted to NaN.
+
+    Returns
+    -------
+    numpy.ndarray
+        The matplotlib date numbers, as a ``float64`` array.
+
+    See Also
+    --------
+    mpl_bsic.format_timeseries_axis :
+        Formats the x-axis of a timeseries plot.
+    mpl_bsic.plot_trade :
+        Plots a trade, converting the dates once for all the subplots.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import dates_to_num, format_timeseries_axis
+
+        x = dates_to_num(df.index)  # convert once
+
+        fig, ax = plt.subplots(1, 1)
+        ax.plot(x, df["price"])
+        ax.fill_between(x, df["low"], df["high"], alpha=0.3)
+        format_timeseries_axis(ax)
+    """
+    index = dates if isinstance(dates, pd.DatetimeIndex) else pd.DatetimeIndex(dates)
+    if index.unit != "ns":
+        index = index.as_unit("ns")
+
+    epoch = np.datetime64(mdates.get_epoch(), "ns").astype(np.int64)
+    nums = (index.asi8 - epoch) / _NS_PER_DAY
+
+    if index.hasnans:
+        nums[index.isna()] = np.nan
+
+    return nums
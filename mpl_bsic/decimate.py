@@ -0,0 +1,220 @@
+import math
+from typing import Literal, Optional
+
+import numpy as np
+from matplotlib.axes import Axes
+
+from .check_figsize import MAX_FIGURE_WIDTH
+from .export_figure import EXPORT_DPI
+
+DecimationMethod = Literal["minmax", "lttb"]
+
+
+def _pixel_budget(width: float, dpi: float) -> int:
+    """Number of pixel columns available to a plot ``width`` inches wide."""
+    width = min(width, MAX_FIGURE_WIDTH)
+
+    return max(int(math.ceil(width * dpi)), 1)
+
+
+def _axis_pixel_budget(ax: Axes, dpi: float = EXPORT_DPI) -> int:
+    """Number of pixel columns the Axes will take once the figure is exported."""
+    # the root figure, also when the Axes belong to a subfigure
+    fig = ax.get_figure().figure  # type: ignore
+    width = ax.bbox.width / fig.dpi
+    scale = min(1, MAX_FIGURE_WIDTH / fig.get_figwidth())
+
+    return _pixel_budget(width * scale, dpi)
+
+
+def _as_float(x: np.ndarray) -> np.ndarray:
+    """Return x as float64, relative to its first value to keep precision."""
+    if x.dtype.kind in "mM":
+        x = x.view("i8")
+
+    return x.astype(np.float64) - float(x[0])
+
+
+def _first_per_bucket(mask: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Index of the first True value of ``mask`` in every bucket."""
+    idx = np.flatnonzero(mask)
+    buckets = np.searchsorted(starts, idx, side="right")
+    keep = np.empty(len(idx), dtype=bool)
+    keep[:1] = True
+    np.not_equal(buckets[1:], buckets[:-1], out=keep[1:])
+
+    return idx[keep]
+
+
+def _minmax_indices(x: np.ndarray, y: np.ndarray, n_pixels: int) -> np.ndarray:
+    """Indices kept by the min-max decimation.
+
+    The x range is split into ``n_pixels`` buckets of equal width, and for each
+    bucket the first, last, min and max points are kept (M4 aggregation),
+    which draws the same line as the full series at that resolution.
+    """
+    n = len(x)
+
+    # bucket edges are searched in the original dtype to avoid converting x
+    x_int = x.view("i8") if x.dtype.kind in "mM" else x
+    edges = np.linspace(float(x_int[0]), float(x_int[-1]), n_pixels + 1)[:-1]
+    if x_int.dtype.kind in "iu":
+        edges = np.ceil(edges).astype(x_int.dtype)
+    starts = np.searchsorted(x_int, edges, side="left")
+    # drop empty buckets, so that consecutive starts delimit non-empty segments
+    starts = starts[np.r_[True, starts[1:] != starts[:-1]]]
+    ends = np.r_[starts[1:], n]
+    counts = ends - starts
+
+    # fmin/fmax ignore NaNs, buckets with only NaNs keep just first and last
+    y_min = np.fmin.reduceat(y, starts)
+    y_max = np.fmax.reduceat(y, starts)
+    min_idx = _first_per_bucket(y == np.repeat(y_min, counts), starts)
+    max_idx = _first_per_bucket(y == np.repeat(y_max, counts), starts)
+
+    return np.unique(np.concatenate([starts, ends - 1, min_idx, max_idx]))
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices kept by the Largest-Triangle-Three-Buckets decimation.
+
+    The first and last points are always kept, and the interior points are
+    split in ``n_out - 2`` buckets of (almost) equal size.
+    From each bucket, the point forming the largest triangle with the
+    averages of the previous and of the next bucket is kept.
+    Using the average of the previous bucket (rather than the point selected
+    from it) makes every bucket independent, so the whole selection is vectorised.
+    """
+    n = len(x)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts = edges[:-1]
+    counts = np.diff(edges)
+
+    avg_x = np.add.reduceat(x[:-1], starts) / counts
+    avg_y = np.add.reduceat(y[:-1], starts) / counts
+
+    # the triangle vertices around each bucket
+    xa = np.r_[x[0], avg_x[:-1]]
+    ya = np.r_[y[0], avg_y[:-1]]
+    xc = np.r_[avg_x[1:], x[-1]]
+    yc = np.r_[avg_y[1:], y[-1]]
+
+    # twice the area of the triangle, written as |a * y + b * x + c|
+    a = np.repeat(xa - xc, counts)
+    b = np.repeat(yc - ya, counts)
+    c = np.repeat(-(xa - xc) * ya - xa * (yc - ya), counts)
+    area = np.abs(a * y[1:-1] + b * x[1:-1] + c)
+
+    local_starts = starts - 1
+    max_area = np.fmax.reduceat(area, local_starts)
+    best = _first_per_bucket(area == np.repeat(max_area, counts), local_starts) + 1
+
+    return np.r_[0, best, n - 1]
+
+
+def _decimation_indices(
+    x: np.ndarray, y: np.ndarray, method: DecimationMethod, n_pixels: int
+) -> Optional[np.ndarray]:
+    """Indices to keep, or None if the series already fits in the budget."""
+    if method == "minmax":
+        if len(x) <= 4 * n_pixels:
+            return None
+        return _minmax_indices(x, np.asarray(y, dtype=np.float64), n_pixels)
+
+    if method == "lttb":
+        if len(x) <= max(n_pixels, 3):
+            return None
+        return _lttb_indices(
+            _as_float(x), np.asarray(y, dtype=np.float64), max(n_pixels, 3)
+        )
+
+    raise Exception('decimation method not supported. Supported are "minmax", "lttb".')
+
+
+def decimate(
+    x: np.ndarray,
+    y: np.ndarray,
+    method: DecimationMethod = "minmax",
+    n_pixels: Optional[int] = None,
+    width: float = MAX_FIGURE_WIDTH,
+    dpi: float = EXPORT_DPI,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Reduce the number of points of a series before plotting it.
+
+    Drawing millions of points is the slowest step when plotting
+    tick-level data, while at most a few points per pixel are actually visible.
+    This function keeps only the points needed to draw the series
+    on the pixels available in the exported figure.
+    The number of pixels is computed from the width of the plot
+    (at most 7.32 inches, see ``check_figsize``) and the export DPI.
+
+    Two methods are available:
+
+    * ``"minmax"``: splits the x range in one bucket per pixel, and keeps the
+      first, last, min and max point of each bucket. The extremes are always kept,
+      so the plotted line is visually identical to the full series.
+    * ``"lttb"``: Largest-Triangle-Three-Buckets, keeps one point per pixel,
+      chosen to preserve the shape of the series. It returns fewer points
+      than ``"minmax"``, but does not guarantee that every extreme is kept.
+
+    If the series already fits in the pixel budget, it is returned unchanged.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        The x values of the series, sorted in ascending order.
+        Can be numeric or ``datetime64``.
+    y : numpy.ndarray
+        The y values of the series. NaNs are ignored when looking for the extremes.
+    method : Literal["minmax", "lttb"], optional
+        The decimation method, by default "minmax".
+    n_pixels : int | None, optional
+        The number of horizontal pixels the series will be drawn on, by default None.
+        If None, it is computed from ``width`` and ``dpi``.
+    width : float, optional
+        The width of the plot in inches, by default 7.32
+        (the maximum width of a figure in a Word document).
+    dpi : float, optional
+        The DPI used when exporting, by default 1200 (as in ``export_figure``).
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The decimated x and y values.
+
+    Raises
+    ------
+    Exception
+        If the decimation method is not supported.
+
+    See Also
+    --------
+    mpl_bsic.plot_timeseries :
+        Plots a timeseries, decimating it before drawing.
+    mpl_bsic.plot_trade :
+        Plots a trade, decimating the series before drawing.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import decimate
+
+        x = np.arange(10_000_000)
+        y = np.random.randn(10_000_000).cumsum()
+
+        x_dec, y_dec = decimate(x, y)  # ~35k points for a 7.32in wide plot
+        ax.plot(x_dec, y_dec)
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+
+    if n_pixels is None:
+        n_pixels = _pixel_budget(width, dpi)
+
+    idx = _decimation_indices(x, y, method, n_pixels)
+    if idx is None:
+        return x, y
+
+    return x[idx], y[idx]
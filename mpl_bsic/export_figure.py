@@ -1,9 +1,36 @@
+from typing import IO, Literal, Union
+
 from matplotlib.figure import Figure
 
 from utils.run_animations import run_animations
+from utils.set_animations import clear_animations
+
+from .headless import _is_headless
+from .profiling import _phase, _phase_method
+from .release_figure import release_figure
+
+EXPORT_DPI = 1200
+"""DPI used when exporting figures according to BSIC Standards."""
+
 
+def _save_figure(
+    fig: Figure,
+    fname: Union[str, IO[bytes]],
+    format: Literal["svg", "png"] = "svg",
+    dpi: float = EXPORT_DPI,
+):
+    """Runs the animations of the figure, and saves it (to a file or a buffer)."""
+    with _phase("run_animations"):
+        run_animations(fig)
+        # styled for good: nothing is left to run when it is drawn again
+        if _is_headless():
+            clear_animations(fig)
 
-def export_figure(fig: Figure, filename: str):
+    with _phase("savefig"), _phase_method(fig, "get_tightbbox", "tight_bbox"):
+        fig.savefig(fname, format=format, dpi=dpi, bbox_inches="tight")
+
+
+def export_figure(fig: Figure, filename: str, release: bool = False):
     """
     Export a figure according to BSIC Standards.
 
@@ -18,6 +45,10 @@ def export_figure(fig: Figure, filename: str):
         The ``matplotlib`` figure to export.
     filename : str
         The filename that should be used when exporting.
+    release : bool, optional
+        Whether to release the figure once exported (see ``release_figure``),
+        by default False. Use it when exporting many charts in a loop,
+        so that the memory of each figure is reclaimed promptly.
 
     See Also
     --------
@@ -27,6 +58,9 @@ def export_figure(fig: Figure, filename: str):
     mpl_bsic.apply_bsic_logo :
         Applies the BSIC Logo to plots.
 
+    mpl_bsic.release_figure :
+        Releases the memory of a figure.
+
     Examples
     --------
     .. code-block:: python
@@ -44,6 +78,7 @@ def export_figure(fig: Figure, filename: str):
         apply_bsic_style(fig, ax)
         export_figure(fig, 'output_filename')
     """
-    run_animations(fig)
+    _save_figure(fig, filename + ".svg")
 
-    fig.savefig(filename + ".svg", dpi=1200, bbox_inches="tight")
+    if release:
+        release_figure(fig)
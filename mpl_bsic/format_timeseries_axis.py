@@ -1,14 +1,267 @@
-from typing import Literal, Optional
+import math
+from typing import Literal, Optional, Union
 
 import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
 from matplotlib.axes import Axes
+from matplotlib.ticker import Formatter, Locator
+
+TimeUnit = Literal["Y", "M", "W", "D"]
+
+MAX_TICKS = 12
+"""Maximum number of ticks on the x-axis when the ticks are chosen automatically."""
+
+_TICK_WIDTH = 0.5  # inches of axis for each tick label
+
+_UNIT_DAYS = {"D": 1.0, "W": 7.0, "M": 30.44, "Y": 365.25}
+
+# candidate (unit, freq) pairs for the "auto" mode, from the finest to the coarsest
+_AUTO_STEPS: list[tuple[TimeUnit, int]] = [
+    ("D", 1),
+    ("D", 2),
+    ("D", 3),
+    ("D", 5),
+    ("W", 1),
+    ("W", 2),
+    ("M", 1),
+    ("M", 2),
+    ("M", 3),
+    ("M", 6),
+    ("Y", 1),
+    ("Y", 2),
+    ("Y", 5),
+    ("Y", 10),
+]
+
+_AUTO_FORMATS = {"Y": "%Y", "M": "%b-%y", "W": "%b %d", "D": "%b %d"}
+
+_PERIOD_FREQS = {"Y": "Y", "M": "M", "W": "W", "D": "D"}
+
+
+def _max_ticks(ax: Optional[Axes]) -> int:
+    """Number of ticks that fit on the width of the Axes, capped at MAX_TICKS."""
+    if ax is None:
+        return MAX_TICKS
+
+    # in inches, also when the Axes belong to a subfigure
+    width = ax.bbox.width / ax.get_figure().figure.dpi  # type: ignore
+
+    return int(min(max(width // _TICK_WIDTH, 2), MAX_TICKS))
+
+
+def _choose_ticks(
+    span_days: float, max_ticks: int, time_unit: Optional[TimeUnit] = None
+) -> tuple[TimeUnit, int]:
+    """Choose the unit and frequency of the ticks for a span of ``span_days``.
+
+    If ``time_unit`` is given, only the frequency is chosen.
+    """
+    if time_unit is None:
+        for unit, freq in _AUTO_STEPS:
+            if span_days <= _UNIT_DAYS[unit] * freq * max_ticks:
+                return unit, freq
+
+        time_unit = "Y"
+
+    freq = math.ceil(span_days / (_UNIT_DAYS[time_unit] * max_ticks))
+
+    return time_unit, max(freq, 1)
+
+
+def _cap_ticks(ticks: np.ndarray, max_ticks: int) -> np.ndarray:
+    """Thin out the ticks so that there are at most ``max_ticks`` of them."""
+    step = math.ceil(len(ticks) / max_ticks)
+
+    return ticks[::step] if step > 1 else ticks
+
+
+def _date_locator(time_unit: TimeUnit, freq: int) -> mdates.DateLocator:
+    if time_unit == "Y":
+        return mdates.YearLocator(freq)
+    elif time_unit == "M":
+        return mdates.MonthLocator(interval=freq)
+    elif time_unit == "W":
+        return mdates.WeekdayLocator(interval=freq)
+    elif time_unit == "D":
+        return mdates.DayLocator(interval=freq)
+    else:
+        raise Exception("this time frequency is not supported.")
+
+
+def _period_starts(index: pd.DatetimeIndex, time_unit: TimeUnit, freq: int):
+    """Positions of the first observation of every ``freq`` periods."""
+    if time_unit not in _PERIOD_FREQS:
+        raise Exception("this time frequency is not supported.")
+
+    naive = index.tz_localize(None) if index.tz is not None else index
+    keys = naive.to_period(_PERIOD_FREQS[time_unit]).asi8
+
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+    # filter on the period itself, so that ticks do not move when panning
+    return starts[keys[starts] % freq == 0]
+
+
+class _AutoDateLocator(Locator):
+    """Chooses the date locator from the span of the view and the axis width."""
+
+    def __init__(self, time_unit: Optional[TimeUnit] = None):
+        self._time_unit = time_unit
+        self.time_unit: TimeUnit = time_unit or "D"
+        self._locators: dict[tuple[TimeUnit, int], mdates.DateLocator] = {}
+
+    def __call__(self):
+        vmin, vmax = self.axis.get_view_interval()  # type: ignore
+        return self.tick_values(vmin, vmax)
+
+    def tick_values(self, vmin, vmax):
+        if vmin > vmax:
+            vmin, vmax = vmax, vmin
+
+        max_ticks = _max_ticks(self.axis.axes if self.axis is not None else None)
+        # date numbers are in days
+        key = _choose_ticks(vmax - vmin, max_ticks, self._time_unit)
+        self.time_unit = key[0]
+
+        if key not in self._locators:
+            self._locators[key] = _date_locator(*key)
+        locator = self._locators[key]
+
+        # date locators compute the ticks between datetimes
+        ticks = locator.tick_values(
+            mdates.num2date(vmin, locator.tz), mdates.num2date(vmax, locator.tz)
+        )
+
+        return _cap_ticks(ticks, max_ticks)
+
+
+class _AutoDateFormatter(Formatter):
+    """Date formatter whose format follows the unit chosen by the locator."""
+
+    def __init__(self, locator: _AutoDateLocator):
+        self._locator = locator
+        self._formatters: dict[str, mdates.DateFormatter] = {}
+
+    def _formatter(self) -> mdates.DateFormatter:
+        fmt = _AUTO_FORMATS[self._locator.time_unit]
+        if fmt not in self._formatters:
+            self._formatters[fmt] = mdates.DateFormatter(fmt)
+
+        return self._formatters[fmt]
+
+    def __call__(self, x, pos=None):
+        return self._formatter()(x, pos)
+
+
+class _BusinessTimeLocator(Locator):
+    """Ticks at the start of each period, on an axis of integer positions.
+
+    If the unit or the frequency are None, they are chosen from the
+    span of the view, as in the "auto" mode.
+    """
+
+    def __init__(
+        self,
+        index: pd.DatetimeIndex,
+        time_unit: Optional[TimeUnit],
+        freq: Optional[int],
+    ):
+        self._index = index
+        self._time_unit = time_unit
+        self._freq = freq
+        self.time_unit: TimeUnit = time_unit or "D"
+        self._starts: dict[tuple[TimeUnit, int], np.ndarray] = {}
+
+    def _period_starts(self, time_unit: TimeUnit, freq: int) -> np.ndarray:
+        key = (time_unit, freq)
+        if key not in self._starts:
+            self._starts[key] = _period_starts(self._index, time_unit, freq)
+
+        return self._starts[key]
+
+    def __call__(self):
+        vmin, vmax = self.axis.get_view_interval()  # type: ignore
+        return self.tick_values(vmin, vmax)
+
+    def tick_values(self, vmin, vmax):
+        if vmin > vmax:
+            vmin, vmax = vmax, vmin
+
+        if self._time_unit is not None and self._freq is not None:
+            starts = self._period_starts(self._time_unit, self._freq)
+            lo = np.searchsorted(starts, vmin, side="left")
+            hi = np.searchsorted(starts, vmax, side="right")
+
+            return starts[lo:hi]
+
+        # calendar span of the positions in view
+        last = len(self._index) - 1
+        first_pos = min(max(int(math.floor(vmin)), 0), last)
+        last_pos = min(max(int(math.ceil(vmax)), 0), last)
+        span_days = (self._index[last_pos] - self._index[first_pos]).total_seconds()
+        span_days /= 86400
+
+        max_ticks = _max_ticks(self.axis.axes if self.axis is not None else None)
+        unit, freq = _choose_ticks(span_days, max_ticks, self._time_unit)
+        self.time_unit = unit
+
+        starts = self._period_starts(unit, freq)
+        lo = np.searchsorted(starts, vmin, side="left")
+        hi = np.searchsorted(starts, vmax, side="right")
+
+        return _cap_ticks(starts[lo:hi], max_ticks)
+
+
+class _BusinessTimeFormatter(Formatter):
+    """Labels integer positions with the date at that position of the index.
+
+    If ``fmt`` is None, the format follows the unit chosen by the locator.
+    """
+
+    def __init__(
+        self,
+        index: pd.DatetimeIndex,
+        locator: _BusinessTimeLocator,
+        fmt: Optional[str],
+    ):
+        self._index = index
+        self._locator = locator
+        self._fmt = fmt
+        self._labels: dict[str, dict[int, str]] = {}
+
+    def _lookup(self, values) -> list[str]:
+        fmt = self._fmt or _AUTO_FORMATS[self._locator.time_unit]
+        cache = self._labels.setdefault(fmt, {})
+
+        positions = np.rint(np.asarray(values, dtype=np.float64)).astype(np.int64)
+        valid = (positions >= 0) & (positions < len(self._index))
+
+        # format all the missing labels with a single strftime call
+        missing = np.unique(positions[valid])
+        missing = missing[[pos not in cache for pos in missing.tolist()]]
+        if len(missing) > 0:
+            labels = self._index[missing].strftime(fmt)
+            cache.update(zip(missing.tolist(), labels))
+
+        return [
+            cache[pos] if ok else ""
+            for pos, ok in zip(positions.tolist(), valid.tolist())
+        ]
+
+    def __call__(self, x, pos=None):
+        return self._lookup([x])[0]
+
+    def format_ticks(self, values):
+        return self._lookup(values)
 
 
 def format_timeseries_axis(
     ax: Axes,
-    time_unit: Literal["Y", "M", "W", "D"],
-    freq: int,
+    time_unit: Union[TimeUnit, Literal["auto"]] = "auto",
+    freq: Optional[int] = None,
     fmt: Optional[str] = None,  # for backwards compatibility
+    business_index: Optional[pd.DatetimeIndex] = None,
 ):
     """Format the x-axis of a timeseries plot.
 
@@ -16,19 +269,46 @@ def format_timeseries_axis(
     Note that this function does not take as an input the figure,
     but just the matplotlib Axes instance.
 
+    By default (``time_unit="auto"``), the unit and frequency of the ticks
+    are chosen automatically from the span of the dates plotted and the width
+    of the axis, and are updated when the view changes (e.g. when zooming).
+    There will never be more than 12 ticks (one every half inch of axis at most),
+    so you do not risk generating thousands of ticks by choosing
+    a unit too fine for the span of the data (e.g. "D" on a 10-year series).
+    If you specify the unit but not the frequency,
+    only the frequency is chosen automatically.
+
+    By default, the axis is in calendar time, so weekends,
+    holidays and overnight hours show up as gaps in the plot.
+    If you pass ``business_index``, the axis is in *business time* instead:
+    you plot the data against its position in the index
+    (``np.arange(len(index))``), so that only the dates in the index take space
+    on the axis, and the ticks are labelled with the corresponding dates.
+    The ticks are placed on the first observation of each period, and
+    drawing them only costs time proportional to the number of ticks.
+
     Parameters
     ----------
     ax : matplotlib.axes.Axes
         Matplotlib Axes instance.
-    time_unit : Literal['Y', 'M', 'W', 'D']
-        Time unit to use.
+    time_unit : Literal['auto', 'Y', 'M', 'W', 'D'], optional
+        Time unit to use, by default "auto".
         Can be "Y" for years, "M" for months, 'W' for weeks, or "D" for days.
-    freq : int
-        Time Frequency. For example, if time_unit is "M" and freq is 3,
-        then the x-axis will have a tick every 3 months.
+        If "auto", both the unit and the frequency are chosen automatically.
+    freq : int | None, optional
+        Time Frequency, by default None. For example, if time_unit is "M"
+        and freq is 3, then the x-axis will have a tick every 3 months.
+        If None, it is chosen automatically. Ignored if time_unit is "auto".
     fmt : str | None
         Date Format which will be fed to matplotlib.dates.DateFormatter.
-        If None, the default format will be used (`%b-%y`).
+        If None and both the unit and frequency are specified,
+        the default format will be used (`%b-%y`).
+        If None and the ticks are chosen automatically, the format depends on
+        the unit used (`%Y` for years, `%b-%y` for months, `%b %d` for weeks and days).
+    business_index : pandas.DatetimeIndex | None, optional
+        The (sorted) dates of the data plotted, by default None.
+        If specified, the x-axis is in business time, and the data must be
+        plotted against ``np.arange(len(business_index))``.
 
     Raises
     ------
@@ -42,20 +322,52 @@ def format_timeseries_axis(
 
     Examples
     --------
-    Examples will come soon.
+    Choosing the ticks automatically:
+
+    .. code-block:: python
+
+        from mpl_bsic import format_timeseries_axis
+
+        fig, ax = plt.subplots(1, 1)
+        ax.plot(prices.index, prices.values)
+        format_timeseries_axis(ax)
+
+    Plotting a daily series in business time, so that weekends
+    and holidays do not show up as gaps:
+
+    .. code-block:: python
+
+        from mpl_bsic import format_timeseries_axis
+
+        fig, ax = plt.subplots(1, 1)
+        ax.plot(np.arange(len(prices)), prices.values)
+        format_timeseries_axis(ax, "M", 1, business_index=prices.index)
     """
 
-    if time_unit == "Y":
-        ax.xaxis.set_major_locator(mdates.YearLocator(freq))
-    elif time_unit == "M":
-        ax.xaxis.set_major_locator(mdates.MonthLocator(interval=freq))
-    elif time_unit == "W":
-        ax.xaxis.set_major_locator(mdates.WeekdayLocator(interval=freq))
-    elif time_unit == "D":
-        ax.xaxis.set_major_locator(mdates.DayLocator(interval=freq))
-    else:
+    if time_unit != "auto" and time_unit not in _UNIT_DAYS:
         raise Exception("this time frequency is not supported.")
 
-    date_format = fmt if fmt else "%b-%y"
-    ax.xaxis.set_major_formatter(mdates.DateFormatter(date_format))
+    unit: Optional[TimeUnit] = None if time_unit == "auto" else time_unit
+    automatic = unit is None or freq is None
+
+    date_format = fmt if fmt or automatic else "%b-%y"
+
+    if business_index is not None:
+        locator = _BusinessTimeLocator(
+            business_index, unit, None if automatic else freq
+        )
+        formatter = _BusinessTimeFormatter(business_index, locator, date_format)
+    elif automatic:
+        locator = _AutoDateLocator(unit)
+        formatter = (
+            mdates.DateFormatter(date_format)
+            if date_format
+            else _AutoDateFormatter(locator)
+        )
+    else:
+        locator = _date_locator(unit, freq)  # type: ignore
+        formatter = mdates.DateFormatter(date_format)  # type: ignore
+
+    ax.xaxis.set_major_locator(locator)
+    ax.xaxis.set_major_formatter(formatter)
     ax.tick_params(axis="x", rotation=45)
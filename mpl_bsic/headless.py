@@ -0,0 +1,109 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+HEADLESS_ENV = "MPL_BSIC_HEADLESS"
+"""Environment variable enabling the headless mode for the whole process
+(e.g. ``MPL_BSIC_HEADLESS=1`` on a rendering server).
+It is inherited by the worker processes."""
+
+_HEADLESS = 0
+"""Depth of the ``headless`` contexts (or 1 for good, if enabled by the env)."""
+
+_HEADLESS_LOCK = threading.Lock()
+
+
+def _is_headless() -> bool:
+    return _HEADLESS > 0
+
+
+def _start_headless():
+    """Enables the headless mode for the rest of the process (e.g. in a worker)."""
+    global _HEADLESS
+    with _HEADLESS_LOCK:
+        _HEADLESS += 1
+
+
+def _stop_headless():
+    global _HEADLESS
+    with _HEADLESS_LOCK:
+        _HEADLESS -= 1
+
+
+def _figure(**kwargs) -> Figure:
+    """A new figure: drawn with Agg, and not managed by pyplot, if headless."""
+    if not _is_headless():
+        import matplotlib.pyplot as plt
+
+        return plt.figure(**kwargs)
+
+    fig = Figure(**kwargs)
+    FigureCanvasAgg(fig)
+
+    return fig
+
+
+def _subplots(nrows: int = 1, ncols: int = 1, figsize=None, **kwargs):
+    """Same as ``plt.subplots``, but with ``_figure``."""
+    fig = _figure(figsize=figsize)
+
+    return fig, fig.subplots(nrows, ncols, **kwargs)
+
+
+@contextmanager
+def headless() -> Iterator[None]:
+    """Render the figures headless (without GUI nor pyplot) within the context.
+
+    Within the context, the figures created by mpl_bsic (e.g. by ``plot_trade``
+    and ``plot_trades``) are plain ``Figure`` objects, drawn with the Agg
+    backend (and exported by the Agg or SVG backends). They are never
+    registered in pyplot, so no GUI backend nor event loop is started,
+    and they are freed as soon as they are no longer referenced,
+    instead of piling up in pyplot until they are closed.
+
+    The deferred styles (the titles and the logo) do not need ``plt.show()``:
+    ``export_figure`` applies them, and then removes the animations
+    that would apply them on the next draw.
+
+    Use it (or the ``MPL_BSIC_HEADLESS`` environment variable) in batch jobs
+    and on servers. The worker processes of ``plot_trades``,
+    ``render_charts`` and ``python -m mpl_bsic.serve`` are always headless.
+    The mode applies to the whole process (all its threads) while the
+    context is active.
+
+    Since the figures are not managed by pyplot, ``plt.show()``
+    and ``closing_figures`` ignore them: export them with ``export_figure``
+    (with ``release=True`` to free their memory at once).
+
+    See Also
+    --------
+    mpl_bsic.export_figure :
+        Export a figure according to BSIC Standards.
+    mpl_bsic.render_charts :
+        Render charts described by specs, headless.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import export_figure, headless, plot_trade
+
+        with headless():
+            for name, (underlying, pnl) in trades.items():
+                trade = plot_trade(underlying, pnl, "nominal", name, "Swap Spread")
+                export_figure(trade.fig, name, release=True)
+    """
+    _start_headless()
+
+    try:
+        yield
+    finally:
+        _stop_headless()
+
+
+if os.environ.get(HEADLESS_ENV, "").lower() not in ("", "0", "false", "no"):
+    _start_headless()
@@ -0,0 +1,189 @@
+import os
+from typing import Literal, Optional, Union
+
+import pandas as pd
+
+from .preprocess_dataframe import preprocess_dataframe
+
+_FILE_FORMATS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "ipc",
+    ".feather": "ipc",
+    ".ipc": "ipc",
+}
+"""File formats inferred from the extension of the files."""
+
+
+def _import_pyarrow():
+    """Imports pyarrow, an optional dependency."""
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        from pyarrow import fs
+    except ImportError as e:
+        raise Exception(
+            "load_dataframe requires pyarrow. "
+            'Install it with "pip install mpl_bsic[parquet]".'
+        ) from e
+
+    return pa, ds, fs
+
+
+def _infer_format(path: str) -> str:
+    # a directory (of partitioned files) is a parquet dataset by default
+    extension = os.path.splitext(path.rstrip("/\\"))[1].lower()
+
+    return _FILE_FORMATS.get(extension, "parquet")
+
+
+def _date_filter(pa, ds, dataset, date_name: str, start_date, end_date):
+    """Filter of the rows between the dates, or None if it cannot be pushed down.
+
+    Only dates stored as dates or timestamps can be compared in the file
+    (and their row groups skipped), not dates stored as strings.
+    """
+    date_type = dataset.schema.field(date_name).type
+    if not (pa.types.is_timestamp(date_type) or pa.types.is_date(date_type)):
+        return None
+
+    def scalar(date):
+        date = pd.Timestamp(date)
+        if pa.types.is_date(date_type):
+            return pa.scalar(date.date(), type=date_type)
+
+        if date_type.tz is not None and date.tzinfo is None:
+            date = date.tz_localize(date_type.tz)
+
+        return pa.scalar(date, type=date_type)
+
+    field = ds.field(date_name)
+    if start_date is None:
+        return field <= scalar(end_date)
+    if end_date is None:
+        return field >= scalar(start_date)
+
+    return (field >= scalar(start_date)) & (field <= scalar(end_date))
+
+
+def load_dataframe(
+    path: str,
+    columns: Optional[list[str]] = None,
+    start_date: Optional[Union[str, pd.Timestamp]] = None,
+    end_date: Optional[Union[str, pd.Timestamp]] = None,
+    file_format: Optional[Literal["parquet", "ipc"]] = None,
+    memory_map: bool = True,
+    **kwargs,
+) -> pd.DataFrame:
+    """Load a Parquet or Arrow file, ready for plotting.
+
+    Only the columns needed, and the rows between ``start_date`` and ``end_date``,
+    are read from the file: the row groups outside the dates are skipped
+    using their statistics, without reading them.
+    The DataFrame is then preprocessed as with ``preprocess_dataframe``
+    (lowercase columns, and the ``date`` column as a ``DatetimeIndex``),
+    so that it can be passed to ``plot_trade`` or ``plot_timeseries``.
+
+    This is much faster than loading a whole CSV or Excel file
+    to plot a couple of columns over the last few months.
+    It requires ``pyarrow`` (``pip install mpl_bsic[parquet]``).
+
+    Parameters
+    ----------
+    path : str
+        The path of the file, or of a directory of (partitioned) files.
+    columns : list[str] | None, optional
+        The columns to read (case insensitive), by default None (all columns).
+        The ``date`` column is always read.
+    start_date : str | pd.Timestamp | None, optional
+        The first date to read, by default None (from the first row).
+    end_date : str | pd.Timestamp | None, optional
+        The last date to read, by default None (until the last row).
+    file_format : Literal['parquet', 'ipc'] | None, optional
+        The format of the file, by default None.
+        If None, it is inferred from the extension (``.parquet``, ``.arrow``,
+        ``.feather``), and directories are read as Parquet.
+    memory_map : bool, optional
+        Whether to memory-map the files instead of reading them,
+        by default True.
+    **kwargs
+        Additional parameters of ``preprocess_dataframe``
+        (e.g. ``downcast``, ``categorical_threshold``).
+
+    Returns
+    -------
+    pd.DataFrame
+        The DataFrame, with lowercase columns and the dates as a sorted index.
+
+    Raises
+    ------
+    Exception
+        If pyarrow is not installed.
+    Exception
+        If the file has no ``date`` column and the dates are specified,
+        or if some of the columns are not in the file.
+
+    See Also
+    --------
+    mpl_bsic.preprocess_dataframe :
+        Preprocess a DataFrame before plotting.
+    mpl_bsic.plot_trade :
+        Plot a trade.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import load_dataframe, plot_trade
+
+        df = load_dataframe(
+            "trades.parquet",
+            columns=["underlying", "pnl"],
+            start_date="2023-09-01",
+        )
+
+        plot_trade(df["underlying"], df["pnl"], "nominal", "Trade", "Swap Spread")
+    """
+    pa, ds, fs = _import_pyarrow()
+
+    dataset = ds.dataset(
+        path,
+        format=file_format or _infer_format(path),
+        filesystem=fs.LocalFileSystem(use_mmap=memory_map),
+    )
+    names = {name.lower(): name for name in dataset.schema.names}
+    date_name = names.get("date")
+    filter_dates = start_date is not None or end_date is not None
+
+    if date_name is None and filter_dates:
+        raise Exception("The file must have a date column to filter by date")
+
+    # column projection: only the columns requested are read
+    projection = None
+    if columns is not None:
+        missing = [col for col in columns if col.lower() not in names]
+        if missing:
+            raise Exception(f"Columns {missing} are not in the file")
+
+        projection = [names[col.lower()] for col in columns if col.lower() != "date"]
+        if date_name is not None:
+            projection = [date_name] + projection
+
+    # row group filtering: only the row groups with the dates requested are read
+    date_filter = None
+    if filter_dates:
+        date_filter = _date_filter(pa, ds, dataset, date_name, start_date, end_date)
+
+    table = dataset.to_table(columns=projection, filter=date_filter)
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    del table
+
+    df = preprocess_dataframe(df, inplace=False, **kwargs)
+
+    if date_name is not None and not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+
+    if filter_dates and date_filter is None:
+        df = df.loc[start_date:end_date]
+
+    return df
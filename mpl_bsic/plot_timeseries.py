@@ -0,0 +1,87 @@
+from typing import Optional, Union
+
+import pandas as pd
+from matplotlib.axes import Axes
+from matplotlib.lines import Line2D
+
+from .decimate import DecimationMethod, _axis_pixel_budget, _decimation_indices
+from .export_figure import EXPORT_DPI
+
+
+def plot_timeseries(
+    ax: Axes,
+    data: Union[pd.Series, pd.DataFrame],
+    decimation: Optional[DecimationMethod] = "minmax",
+    dpi: float = EXPORT_DPI,
+    **kwargs,
+) -> list[Line2D]:
+    """Plot one or more timeseries, decimating them before drawing.
+
+    Works like ``ax.plot(data)``, but each series is first reduced to the points
+    that are visible once the figure is exported (see ``decimate``).
+    The pixel budget is computed from the width of the Axes
+    (capped at 7.32 inches, as in ``check_figsize``) and the export DPI.
+    Use this instead of ``ax.plot`` when plotting long, tick-level series.
+
+    Parameters
+    ----------
+    ax : matplotlib.axes.Axes
+        Matplotlib Axes instance.
+    data : pandas.Series | pandas.DataFrame
+        The series to plot, with a sorted index.
+        If a DataFrame, every column is plotted as a separate line,
+        labelled with the column name.
+    decimation : Literal["minmax", "lttb"] | None, optional
+        The decimation method, by default "minmax".
+        If None, all the points are plotted.
+    dpi : float, optional
+        The DPI used when exporting, by default 1200 (as in ``export_figure``).
+    **kwargs
+        Additional keyword arguments passed to ``ax.plot``.
+
+    Returns
+    -------
+    list[matplotlib.lines.Line2D]
+        The lines that were plotted.
+
+    See Also
+    --------
+    mpl_bsic.decimate :
+        Reduces the number of points of a series.
+    mpl_bsic.format_timeseries_axis :
+        Formats the x-axis of a timeseries plot.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import apply_bsic_style, plot_timeseries
+
+        fig, ax = plt.subplots(1, 1)
+        apply_bsic_style(fig, ax)
+        plot_timeseries(ax, ticks["price"])  # ticks has millions of rows
+    """
+    is_frame = isinstance(data, pd.DataFrame)
+    frame = data if is_frame else data.to_frame()
+    label = kwargs.pop("label", None)
+    n_pixels = _axis_pixel_budget(ax, dpi)
+
+    x = frame.index
+    x_values = x.asi8 if isinstance(x, pd.DatetimeIndex) else x.to_numpy()
+
+    lines = []
+    for col in frame.columns:
+        y = frame[col].to_numpy()
+
+        idx = None
+        if decimation is not None:
+            idx = _decimation_indices(x_values, y, decimation, n_pixels)
+
+        if idx is None:
+            line_x, line_y = x, y
+        else:
+            line_x, line_y = x[idx], y[idx]
+
+        lines += ax.plot(line_x, line_y, label=col if is_frame else label, **kwargs)
+
+    return lines
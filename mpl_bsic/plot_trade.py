@@ -1,45 +1,48 @@
-from typing import Literal, Union
+from typing import Literal, Optional, Sequence, Union
 
-import matplotlib.pyplot as plt
+import matplotlib as mpl
+import numpy as np
 import pandas as pd
 from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.path import Path
+from matplotlib.text import Annotation
+from matplotlib.transforms import Bbox
 
 from .apply_bsic_logo import apply_bsic_logo
 from .apply_bsic_style import apply_bsic_style
+from .dates_to_num import dates_to_num
+from .decimate import DecimationMethod, _axis_pixel_budget, _decimation_indices
 from .format_timeseries_axis import format_timeseries_axis
+from .headless import _subplots
+from .trade_stats import _format_stats, trade_stats
 
+TRADE_GRIDSPEC = {"hspace": 0.1, "height_ratios": [1.25, 2]}
+"""Layout of the PnL (top) and underlying (bottom) subplots of a trade."""
 
-def _plot_xline(ax: Axes, y: float, trade_start: str, color: str):
-    bbox_props = dict(boxstyle="round", fc="w", ec="k", lw=1)
-    y_min, y_max = ax.get_ylim()
+_EMPTY_PATH = Path(np.empty((0, 2)), np.empty(0, dtype=Path.code_type))
 
-    ax.hlines(
-        y=[y],
-        xmin=trade_start,
-        xmax=ax.get_xbound()[1],
-        color=color,
-        linewidth=1,
-        linestyle="-",
-        alpha=0.75,
-    )
-    ax.annotate(
-        str(round(y, 2)),
-        xycoords="axes fraction",
-        xy=(1.02, (y - y_min) / (y_max - y_min)),
-        size=8,
-        bbox=bbox_props,
-        verticalalignment="center",
-    )
+_BREACH_CHUNK = 1 << 22
+"""Number of (level, tick) comparisons done at once to find the breaches."""
 
+_LEVEL_COLORS = {"stop_loss": "r", "take_profit": "g"}
+"""Colors of the stop loss and take profit levels."""
 
-def _plot_last_price(ax: Axes, data: pd.Series):
+_LIVE_HEADROOM = 0.05
+"""Room left on the right of a live plot (as a fraction of the x span),
+so that the next ticks fit without rescaling the axes."""
+
+
+def _plot_last_price(ax: Axes, data: pd.Series) -> Annotation:
     """Plots the last price of the series on the right side of the plot."""
     # plot last price
     last_price = float(data.iloc[-1])
     y_min, y_max = ax.get_ylim()
 
     bbox_props = dict(boxstyle="round", fc="w", ec="k", lw=0.75)
-    ax.annotate(
+    return ax.annotate(
         str(int(last_price)),
         xycoords="axes fraction",
         xy=(1.02, (last_price - y_min) / (y_max - y_min)),
@@ -49,28 +52,127 @@ def _plot_last_price(ax: Axes, data: pd.Series):
     )
 
 
+def _move_last_price(annotation: Annotation, ax: Axes, last_price: float):
+    """Moves the last price annotation to a new price (or new y limits)."""
+    if np.isnan(last_price):
+        return
+
+    y_min, y_max = ax.get_ylim()
+
+    annotation.set_text(str(int(last_price)))
+    annotation.xy = (1.02, (last_price - y_min) / (y_max - y_min))
+
+
+def _first_valid_position(values: np.ndarray, chunk_size: int = 65_536):
+    """Position of the first non-NaN value, scanning only until it is found."""
+    for start in range(0, len(values), chunk_size):
+        valid = np.flatnonzero(~np.isnan(values[start : start + chunk_size]))
+        if len(valid) > 0:
+            return start + int(valid[0])
+
+    return None
+
+
+def _nansum(values: np.ndarray, start: int, end: int, chunk_size: int = 65_536):
+    """Sum of the non-NaN values between two positions, reading a chunk at a time."""
+    total = 0.0
+    for chunk_start in range(start, end, chunk_size):
+        chunk = values[chunk_start : min(chunk_start + chunk_size, end)]
+        total += float(np.nansum(chunk, dtype=np.float64))
+
+    return total
+
+
+def _timeseries_arrays(
+    data: tuple[np.ndarray, np.ndarray], name: str
+) -> tuple[np.ndarray, np.ndarray]:
+    """Timestamps (as int64 nanoseconds) and values of a pair of arrays.
+
+    The arrays are not copied, so memory-mapped arrays are never read whole.
+    """
+    if len(data) != 2:
+        raise Exception(f"{name} must be a Series or a (timestamps, values) pair")
+
+    times, values = data
+    if times.dtype == np.dtype("datetime64[ns]"):
+        times = times.view(np.int64)
+
+    if times.dtype != np.int64:
+        raise Exception(f"Timestamps of {name} must be int64 nanoseconds")
+
+    if times.ndim != 1 or values.shape != times.shape:
+        raise Exception(
+            f"Timestamps and values of {name} must be 1D arrays of the same length"
+        )
+
+    if len(times) == 0:
+        raise Exception(f"{name} must not be empty")
+
+    return times, values
+
+
+def _window_series(
+    times: np.ndarray, values: np.ndarray, start: int, end: int, name: str
+) -> pd.Series:
+    """Series of the window of a pair of arrays, the only part read in memory."""
+    window_times = times[start:end]
+
+    # the window is sliced with searchsorted, which needs sorted timestamps
+    if np.any(window_times[1:] < window_times[:-1]):
+        raise Exception(f"Timestamps of {name} must be sorted")
+
+    return pd.Series(
+        np.array(values[start:end], dtype=np.float64),
+        index=pd.DatetimeIndex(window_times.astype("datetime64[ns]")),
+    )
+
+
 def _get_dates(
     underlying: pd.Series, pnl: pd.Series, months_offset: int
-) -> tuple[pd.DatetimeIndex, pd.Timestamp]:
-    """Gets the dates for the trade."""
+) -> tuple[pd.Timestamp, pd.Timestamp, pd.Timestamp]:
+    """Gets the start, end and entry dates for the trade."""
     if not isinstance(underlying.index, pd.DatetimeIndex):
         raise Exception("Index of underlying must be a DatetimeIndex")
 
     if not isinstance(pnl.index, pd.DatetimeIndex):
         raise Exception("Index of PnL must be a DatetimeIndex")
 
-    dates = underlying.index
+    # the windows are sliced with searchsorted, which needs sorted indexes
+    if not underlying.index.is_monotonic_increasing:
+        raise Exception("Index of underlying must be sorted")
+
+    if not pnl.index.is_monotonic_increasing:
+        raise Exception("Index of PnL must be sorted")
 
-    end_date = dates[-1]
+    end_date = underlying.index[-1]
     start_date = end_date - pd.DateOffset(months=months_offset)
-    entry_date = pnl.dropna().index[0]
 
-    dates = dates[(dates >= start_date) & (dates <= end_date)]
+    entry_pos = _first_valid_position(pnl.to_numpy(np.float64))
+    if entry_pos is None:
+        raise Exception("There was an issue pulling the entry date for the trade.")
+
+    entry_date = pnl.index[entry_pos]
+
+    return start_date, end_date, entry_date
+
+
+def _get_array_dates(
+    underlying_times: np.ndarray,
+    pnl_times: np.ndarray,
+    pnl_values: np.ndarray,
+    months_offset: int,
+) -> tuple[pd.Timestamp, pd.Timestamp, pd.Timestamp]:
+    """Gets the start, end and entry dates for a trade given as arrays."""
+    end_date = pd.Timestamp(int(underlying_times[-1]))
+    start_date = end_date - pd.DateOffset(months=months_offset)
 
-    if not isinstance(entry_date, pd.Timestamp):
+    entry_pos = _first_valid_position(pnl_values)
+    if entry_pos is None:
         raise Exception("There was an issue pulling the entry date for the trade.")
 
-    return dates, entry_date
+    entry_date = pd.Timestamp(int(pnl_times[entry_pos]))
+
+    return start_date, end_date, entry_date
 
 
 def _plot_entry_point(
@@ -80,16 +182,26 @@ def _plot_entry_point(
     marker_location: Literal["top", "bottom"],
     marker_size: int,
 ):
-    """Plots the entry point of the trade."""
+    """Plots the entry point of the trade.
+
+    The marker is at the last price of the underlying at the entry date,
+    which may not be on its index (e.g. a trade entered on a Saturday).
+    If the trade was entered outside of the plotted window (e.g. before it),
+    there is no marker.
+    """
 
     offset = 0.075 if marker_location == "top" else -0.075
     marker = "v" if marker_location == "top" else "^"
 
-    price_at_entry = underlying.loc[entry_date]
+    pos = underlying.index.searchsorted(entry_date, side="right") - 1
+    if pos < 0 or entry_date > underlying.index[-1]:
+        return
+
+    price_at_entry = underlying.iloc[pos]
     marker_loc = price_at_entry * (1 + offset)
 
     ax.scatter(
-        [entry_date.strftime("%Y-%m-%d")],
+        dates_to_num([entry_date]),
         [marker_loc],
         color="g",
         marker=marker,
@@ -97,30 +209,907 @@ def _plot_entry_point(
     )
 
 
+Timeseries = Union[pd.Series, tuple[np.ndarray, np.ndarray]]
+"""Underlying or PnL accepted by ``plot_trade``: a Series,
+or a pair of (timestamps, values) arrays."""
+
+Levels = Union[float, Sequence[float], np.ndarray, pd.Series, pd.DataFrame]
+"""Stop loss or take profit levels accepted by ``plot_trade``."""
+
+
+def _levels_frame(
+    levels: Optional[Levels], index: pd.DatetimeIndex
+) -> Optional[Levels]:
+    """Indexes 2D arrays of (time-varying) levels by the dates of the underlying."""
+    if not isinstance(levels, np.ndarray) or levels.ndim != 2:
+        return levels
+
+    if levels.shape[1] != len(index):
+        raise Exception(
+            "2D arrays of levels must have shape (n_levels, len(underlying))"
+        )
+
+    return pd.DataFrame(levels.T, index=index)
+
+
+def _levels_window(levels: Optional[Levels], n: int, window: slice):
+    """Clips 2D arrays of levels, aligned with the whole underlying, to its window."""
+    if not isinstance(levels, np.ndarray) or levels.ndim != 2:
+        return levels
+
+    if levels.shape[1] != n:
+        raise Exception(
+            "2D arrays of levels must have shape (n_levels, len(underlying))"
+        )
+
+    return levels[:, window]
+
+
+def _level_matrix(levels: Levels, index: pd.DatetimeIndex) -> np.ndarray:
+    """Values of the levels at each date, with shape (n_levels, len(index)).
+
+    Constant levels are broadcast (without copying), while time-varying levels
+    (Series or DataFrame, one column per level) take their last value
+    at each date, and are NaN before their first date.
+    """
+    if isinstance(levels, (pd.Series, pd.DataFrame)):
+        frame = levels.to_frame() if isinstance(levels, pd.Series) else levels
+
+        if not isinstance(frame.index, pd.DatetimeIndex):
+            raise Exception("Index of time-varying levels must be a DatetimeIndex")
+
+        if not frame.index.is_monotonic_increasing:
+            raise Exception("Index of time-varying levels must be sorted")
+
+        values = frame.to_numpy(np.float64)
+        pos = frame.index.searchsorted(index, side="right") - 1
+
+        # levels on the same dates as the underlying are sliced, not copied
+        start = pos[0]
+        if start >= 0 and frame.index[start : start + len(index)].equals(index):
+            return values[start : start + len(index)].T
+
+        values = values[pos.clip(0)]
+        values[pos < 0] = np.nan
+
+        return values.T
+
+    values = np.atleast_1d(np.asarray(levels, dtype=np.float64))
+    if values.ndim != 1:
+        raise Exception("Constant levels must be a number or a 1D array")
+
+    return np.broadcast_to(values[:, None], (len(values), len(index)))
+
+
+def _first_breaches(
+    prices: np.ndarray, levels: np.ndarray, constant: bool
+) -> np.ndarray:
+    """Position of the first breach of each level, or -1 if never breached.
+
+    A level is breached when the price reaches it from the side it was
+    at its first value (so it works for both long and short trades):
+    at the start for constant levels, or at the first date it is set
+    (not NaN) for time-varying levels.
+
+    Constant levels are breached when the running min (or max) of the price
+    reaches them, so they are all found at once with ``searchsorted``.
+    Time-varying levels are all compared at once, on chunks of ticks,
+    and the scan stops as soon as every level is breached.
+    """
+    n_levels, n_ticks = levels.shape
+    first = np.full(n_levels, -1)
+    if n_ticks == 0:
+        return first
+
+    if constant:
+        below = levels[:, 0] <= prices[0]  # e.g. the stop loss of a long trade
+
+        for side, running in ((below, np.fmin), (~below, np.fmax)):
+            # the running min is decreasing, so its opposite is sorted
+            sign = 1 if running is np.fmax else -1
+            extreme = sign * running.accumulate(prices)
+            extreme[np.isnan(extreme)] = -np.inf
+
+            pos = np.searchsorted(extreme, sign * levels[side, 0], side="left")
+            first[side] = np.where(pos < n_ticks, pos, -1)
+
+        return first
+
+    # the side of each level is known from its first value, in some chunk
+    below = np.zeros(n_levels, dtype=bool)
+    started = np.zeros(n_levels, dtype=bool)
+
+    pending = np.arange(n_levels)
+    step = max(_BREACH_CHUNK // max(n_levels, 1), 1)
+    for start in range(0, n_ticks, step):
+        chunk = slice(start, start + step)
+        block = levels[pending, chunk]
+        chunk_prices = prices[chunk]
+
+        new = np.flatnonzero(~started[pending])
+        if len(new) > 0:
+            valid = ~np.isnan(block[new])
+            has_value = valid.any(axis=1)
+            new, pos = new[has_value], valid[has_value].argmax(axis=1)
+
+            below[pending[new]] = block[new, pos] <= chunk_prices[pos]
+            started[pending[new]] = True
+
+        # before its first value, a level is NaN, so it is never breached
+        breached = np.where(
+            below[pending, None], block >= chunk_prices, block <= chunk_prices
+        )
+
+        hit = breached.any(axis=1)
+        first[pending[hit]] = start + breached[hit].argmax(axis=1)
+        pending = pending[~hit]
+
+        if len(pending) == 0:
+            break
+
+    return first
+
+
+def _level_segments(
+    x: np.ndarray, levels: np.ndarray, first: np.ndarray, cols: np.ndarray
+) -> np.ndarray:
+    """Paths of the levels, with shape (n_levels, n_points, 2).
+
+    The paths are sampled at ``cols`` (and at the breaches),
+    and are NaN (not drawn) after the breach of each level.
+    """
+    cols = np.union1d(cols, first[first >= 0])
+    values = levels[:, cols]
+
+    end = np.where(first >= 0, first, len(x) - 1)
+    values = np.where(cols[None, :] <= end[:, None], values, np.nan)
+
+    return np.stack(np.broadcast_arrays(x[cols][None, :], values), axis=-1)
+
+
+def _no_breaches(kind: str, levels: Levels) -> pd.DataFrame:
+    """Breaches of levels which are never checked (nor drawn)."""
+    if isinstance(levels, (pd.Series, pd.DataFrame)):
+        n_levels = 1 if isinstance(levels, pd.Series) else levels.shape[1]
+    else:
+        n_levels = len(np.atleast_1d(np.asarray(levels, dtype=np.float64)))
+
+    return pd.DataFrame(
+        {
+            "type": kind,
+            "level": np.full(n_levels, np.nan),
+            "breach_date": pd.DatetimeIndex([pd.NaT] * n_levels),
+            "breach_level": np.full(n_levels, np.nan),
+        }
+    )
+
+
+def _plot_levels(
+    ax: Axes,
+    underlying: pd.Series,
+    entry_date: pd.Timestamp,
+    stop_loss: Optional[Levels],
+    take_profit: Optional[Levels],
+    decimation: Optional[DecimationMethod],
+) -> pd.DataFrame:
+    """Plots the stop loss and take profit levels, from the entry of the trade.
+
+    All the levels are drawn as a single collection of lines,
+    ending at their first breach, and all the breaches as a single scatter.
+
+    Returns the breaches of the levels.
+    """
+    entry = underlying.index.searchsorted(entry_date, side="left")
+    index = underlying.index[entry:]
+    prices = underlying.to_numpy(np.float64)[entry:]
+    x = dates_to_num(index)
+
+    # the time-varying levels are sampled once per pixel, if decimated
+    cols = np.arange(len(x))
+    if decimation is not None:
+        n_pixels = _axis_pixel_budget(ax)
+        if len(x) > n_pixels:
+            cols = np.unique(np.linspace(0, len(x) - 1, n_pixels).astype(np.int64))
+
+    segments, colors, breaches = [], [], []
+    for kind, levels in (("stop_loss", stop_loss), ("take_profit", take_profit)):
+        if levels is None:
+            continue
+
+        constant = not isinstance(levels, (pd.Series, pd.DataFrame))
+        if len(index) == 0:
+            # entered after the last price: no level to draw, nor breach
+            breaches.append(_no_breaches(kind, levels))
+            continue
+
+        values = _level_matrix(levels, index)
+        first = _first_breaches(prices, values, constant)
+
+        # constant levels are straight lines
+        segments.append(
+            _level_segments(x, values, first, cols[[0, -1]] if constant else cols)
+        )
+        colors += [_LEVEL_COLORS[kind]] * len(values)
+
+        hit = first >= 0
+        breaches.append(
+            pd.DataFrame(
+                {
+                    "type": kind,
+                    "level": values[:, 0],
+                    "breach_date": index[first.clip(0)].where(hit, pd.NaT),
+                    "breach_level": np.where(
+                        hit, values[np.arange(len(values)), first.clip(0)], np.nan
+                    ),
+                }
+            )
+        )
+
+    if len(segments) == 0:
+        if len(breaches) > 0:
+            return pd.concat(breaches, ignore_index=True)
+
+        return pd.DataFrame(columns=["type", "level", "breach_date", "breach_level"])
+
+    # the paths of all the levels, padded to the same number of points
+    n_points = max(segment.shape[1] for segment in segments)
+    segments = np.concatenate(
+        [
+            np.pad(
+                segment,
+                ((0, 0), (0, n_points - segment.shape[1]), (0, 0)),
+                constant_values=np.nan,
+            )
+            for segment in segments
+        ]
+    )
+
+    ax.add_collection(
+        LineCollection(
+            segments,
+            colors=colors,
+            linewidth=1,
+            linestyle="-",
+            alpha=0.75,
+        )
+    )
+
+    breaches = pd.concat(breaches, ignore_index=True)
+    hit = breaches["breach_date"].notna().to_numpy()
+    ax.scatter(
+        dates_to_num(pd.DatetimeIndex(breaches["breach_date"][hit])),
+        breaches["breach_level"][hit],
+        color=np.array(colors)[hit],
+        marker="x",
+        s=20,
+        zorder=3,
+    )
+
+    return breaches
+
+
+def _plot_stats(
+    ax: Axes,
+    pnl: pd.Series,
+    entry_date: pd.Timestamp,
+    pnl_type: Literal["nominal", "cumulative"],
+) -> Optional[dict]:
+    """Plots the statistics of the trade in a box, on the top left of the plot.
+
+    The statistics are computed by ``trade_stats`` on the plotted window
+    (with its missing values), from the entry.
+    If there are less than two PnL values to compute them from,
+    no box is plotted, and None is returned.
+    """
+    pnl = pnl.iloc[pnl.index.searchsorted(entry_date, side="left") :]
+    valid = pnl.notna().to_numpy()
+    if not valid.any() or len(pnl) - valid.argmax() < 2:
+        return None
+
+    # the cumulative PnL of the window is already cumulated
+    stats = trade_stats(pnl, pnl_type)
+
+    bbox_props = dict(boxstyle="round", fc="w", ec="k", lw=0.75)
+    ax.text(
+        0.02,
+        0.95,
+        _format_stats(stats),
+        transform=ax.transAxes,
+        size=8,
+        bbox=bbox_props,
+        verticalalignment="top",
+    )
+
+    return stats
+
+
 def _preprocess_data(
-    underlying: pd.Series, pnl: pd.Series, dates: pd.DatetimeIndex, pnl_type: str
+    underlying: pd.Series,
+    pnl: pd.Series,
+    start_date: pd.Timestamp,
+    end_date: pd.Timestamp,
+    entry_date: pd.Timestamp,
+    pnl_type: str,
 ):
-    """Preprocesses the data."""
-    underlying = underlying.copy().loc[dates]
-    pnl = pnl.copy()
+    """Preprocesses the data.
+
+    Both series are clipped to the window of the trade with ``searchsorted``,
+    so only the window (not the whole history) is ever copied.
+    The missing PnL values are kept (see ``_draw_trade``).
+    """
+    start = underlying.index.searchsorted(start_date, side="left")
+    end = underlying.index.searchsorted(end_date, side="right")
+    underlying = underlying.iloc[start:end]
+
+    pnl_start = pnl.index.searchsorted(start_date, side="left")
+    pnl_end = pnl.index.searchsorted(end_date, side="right")
+
+    if pnl_type == "nominal":
+        pnl = pnl.iloc[pnl_start:pnl_end]
+    elif pnl_type == "cumulative":
+        # if the trade started before the window, its PnL is included as well
+        first = min(pnl_start, pnl.index.searchsorted(entry_date, side="left"))
+        pnl = pnl.iloc[first:pnl_end].cumsum().iloc[pnl_start - first :]
+    else:
+        raise Exception(
+            'pnl type is not supported. Supported are "nominal" and "cumulative".'
+        )
+
+    return underlying, pnl
+
+
+def _preprocess_arrays(
+    underlying: tuple[np.ndarray, np.ndarray],
+    pnl: tuple[np.ndarray, np.ndarray],
+    start_date: pd.Timestamp,
+    end_date: pd.Timestamp,
+    entry_date: pd.Timestamp,
+    pnl_type: str,
+) -> tuple[pd.Series, pd.Series, slice]:
+    """Preprocesses the data given as (timestamps, values) arrays.
+
+    Same as ``_preprocess_data``, but only the window is read in memory
+    (and indexed by its dates): the cumulative PnL before the window
+    is summed a chunk at a time.
+    Also returns the slice of the window in the underlying's arrays.
+    """
+    underlying_times, underlying_values = underlying
+    pnl_times, pnl_values = pnl
+
+    start = np.searchsorted(underlying_times, start_date.value, side="left")
+    end = np.searchsorted(underlying_times, end_date.value, side="right")
+    window = slice(start, end)
+
+    pnl_start = np.searchsorted(pnl_times, start_date.value, side="left")
+    pnl_end = np.searchsorted(pnl_times, end_date.value, side="right")
+    pnl_window = _window_series(pnl_times, pnl_values, pnl_start, pnl_end, "PnL")
 
     if pnl_type == "nominal":
         pass
     elif pnl_type == "cumulative":
-        pnl = pnl.cumsum()
+        # if the trade started before the window, its PnL is included as well
+        entry = np.searchsorted(pnl_times, entry_date.value, side="left")
+        offset = _nansum(pnl_values, entry, pnl_start)
+        pnl_window = pnl_window.cumsum() + offset
     else:
         raise Exception(
             'pnl type is not supported. Supported are "nominal" and "cumulative".'
         )
 
-    pnl.fillna(0, inplace=True)
+    underlying_window = _window_series(
+        underlying_times, underlying_values, start, end, "underlying"
+    )
 
-    return underlying, pnl
+    return underlying_window, pnl_window, window
 
 
-def plot_trade(
+def _decimate(
+    x: np.ndarray, y: np.ndarray, ax: Axes, method: Optional[DecimationMethod]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Keeps only the points of the series visible once the figure is exported."""
+    if method is None:
+        return x, y
+
+    idx = _decimation_indices(x, y, method, _axis_pixel_budget(ax))
+
+    return (x, y) if idx is None else (x[idx], y[idx])
+
+
+def _pnl_paths(x: np.ndarray, y: np.ndarray) -> tuple[Path, Path]:
+    """Splits the area between the PnL and zero in profit and loss polygons.
+
+    The zero crossings are found (and interpolated) in a single pass,
+    and all the polygons of the same sign are returned as one compound path.
+    """
+    y = np.nan_to_num(y)
+    if len(x) < 2:
+        return _EMPTY_PATH, _EMPTY_PATH
+
+    # crossings between i and i + 1, where the PnL changes sign
+    profit = y >= 0
+    cross = np.flatnonzero(profit[1:] != profit[:-1])
+    x0, x1, y0, y1 = x[cross], x[cross + 1], y[cross], y[cross + 1]
+    x_cross = x0 + (x1 - x0) * y0 / (y0 - y1)
+
+    # each crossing is inserted twice, as it closes a polygon and opens the next,
+    # and the curve starts and ends on zero, so every polygon is bounded by zero
+    at = np.repeat(cross + 1, 2)
+    xs = np.insert(x.astype(np.float64), at, np.repeat(x_cross, 2))
+    ys = np.insert(y.astype(np.float64), at, 0.0)
+    xs = np.concatenate([xs[:1], xs, xs[-1:]])
+    ys = np.concatenate([[0.0], ys, [0.0]])
+
+    n_polygons = len(cross) + 1
+    starts = np.concatenate([[0], cross + 3 + 2 * np.arange(len(cross))])
+    ends = np.concatenate([starts[1:], [len(xs)]])
+    polygon = np.arange(n_polygons)
+
+    # each polygon is then closed, with one more vertex
+    vertices = np.empty((len(xs) + n_polygons, 2))
+    codes = np.full(len(vertices), Path.LINETO, dtype=Path.code_type)
+
+    vertices[np.arange(len(xs)) + np.repeat(polygon, ends - starts)] = np.column_stack(
+        [xs, ys]
+    )
+    vertices[ends + polygon] = np.column_stack([xs[starts], ys[starts]])
+    codes[starts + polygon] = Path.MOVETO
+    codes[ends + polygon] = Path.CLOSEPOLY
+
+    # the sign alternates at each crossing
+    is_profit = np.repeat(profit[0] != (polygon % 2 == 1), ends - starts + 1)
+
+    return (
+        Path(vertices[is_profit], codes[is_profit]),
+        Path(vertices[~is_profit], codes[~is_profit]),
+    )
+
+
+def _fill_pnl(ax: Axes, x: np.ndarray, y: np.ndarray) -> PathCollection:
+    """Shades the areas of profit (green) and loss (red) of the PnL.
+
+    Both are drawn by a single collection, with one path per color.
+    """
+    profit, loss = _pnl_paths(x, y)
+
+    areas = PathCollection(
+        [profit, loss],
+        facecolors=["g", "r"],
+        edgecolors=["g", "r"],
+        linewidths=[0, mpl.rcParams["patch.linewidth"]],
+        alpha=0.3,
+    )
+    ax.add_collection(areas, autolim=False)
+    ax.update_datalim(np.concatenate([profit.vertices, loss.vertices]))
+    ax.autoscale_view()
+
+    return areas
+
+
+def _draw_trade(
+    fig: Figure,
+    pnl_ax: Axes,
+    underlying_ax: Axes,
+    underlying: pd.Series,
+    pnl: pd.Series,
+    entry_date: pd.Timestamp,
+    underlying_name: str,
+    pnl_type: Literal["nominal", "cumulative"],
+    entry_point_marker_loc: Literal["top", "bottom"] = "top",
+    entry_point_marker_size: int = 10,
+    date_ticks_unit: Literal["auto", "Y", "M", "W", "D"] = "auto",
+    date_ticks_freq: Optional[int] = None,
+    date_ticks_format: str = "%b %d, %Y",
+    decimation: Optional[DecimationMethod] = "minmax",
+    stop_loss: Optional[Levels] = None,
+    take_profit: Optional[Levels] = None,
+    stats: bool = False,
+) -> tuple[dict, pd.DataFrame, Optional[dict]]:
+    """Draws the (already preprocessed) trade on the two axes.
+
+    The missing values of the PnL are plotted as 0, but the statistics
+    are computed with them (as ``trade_stats`` would).
+
+    Returns the artists updated by ``TradePlot.update``,
+    the breaches of the stop loss and take profit levels,
+    and the statistics of the trade (if ``stats`` is True).
+    """
+    raw_pnl, pnl = pnl, pnl.fillna(0)
+
+    # convert the dates once, and share them across all the plots
+    underlying_x = dates_to_num(underlying.index)
+    if pnl.index.equals(underlying.index):
+        pnl_x = underlying_x
+    else:
+        pnl_x = dates_to_num(pnl.index)
+
+    # plot the data, keeping only the points visible once exported
+    underlying_x, underlying_y = _decimate(
+        underlying_x, underlying.to_numpy(np.float64), underlying_ax, decimation
+    )
+    pnl_x, pnl_y = _decimate(pnl_x, pnl.to_numpy(np.float64), pnl_ax, decimation)
+
+    (underlying_line,) = underlying_ax.plot(underlying_x, underlying_y)
+    (pnl_line,) = pnl_ax.plot(pnl_x, pnl_y)
+    pnl_ax.axhline(0, color="black", linewidth=1, alpha=0.75)
+
+    # set labels
+    underlying_ax.set_ylabel(underlying_name)
+    pnl_ax.set_ylabel("PnL")
+
+    # formats dates
+    format_timeseries_axis(
+        underlying_ax, date_ticks_unit, date_ticks_freq, date_ticks_format
+    )
+
+    # apply logo
+    apply_bsic_logo(fig, pnl_ax, location="top left")
+
+    # plot last price
+    underlying_price = _plot_last_price(underlying_ax, underlying)
+    pnl_price = _plot_last_price(pnl_ax, pnl)
+
+    # plot entry point
+    _plot_entry_point(
+        underlying_ax,
+        entry_date,
+        underlying,
+        entry_point_marker_loc,
+        entry_point_marker_size,
+    )
+
+    # plot stop loss and take profit
+    breaches = _plot_levels(
+        underlying_ax, underlying, entry_date, stop_loss, take_profit, decimation
+    )
+
+    # plot areas of profit and loss
+    pnl_areas = _fill_pnl(pnl_ax, pnl_x, pnl_y)
+
+    # plot statistics of the trade
+    statistics = None
+    if stats:
+        statistics = _plot_stats(underlying_ax, raw_pnl, entry_date, pnl_type)
+
+    artists = {
+        "underlying_line": underlying_line,
+        "pnl_line": pnl_line,
+        "underlying_price": underlying_price,
+        "pnl_price": pnl_price,
+        "pnl_areas": pnl_areas,
+    }
+
+    return artists, breaches, statistics
+
+
+def _new_ticks(ticks: pd.Series, last_x: float) -> tuple[np.ndarray, np.ndarray]:
+    """Date numbers and values of the ticks after the last plotted date."""
+    if not isinstance(ticks.index, pd.DatetimeIndex):
+        raise Exception("Index of the new ticks must be a DatetimeIndex")
+
+    if not ticks.index.is_monotonic_increasing:
+        raise Exception("Index of the new ticks must be sorted")
+
+    x = dates_to_num(ticks.index)
+    start = np.searchsorted(x, last_x, side="right")
+
+    return x[start:], ticks.to_numpy(np.float64)[start:]
+
+
+def _fits_view(view: Bbox, x: np.ndarray, y: np.ndarray) -> bool:
+    """Whether all the (non-NaN) points are within the view limits."""
+    valid = ~np.isnan(y)
+    x, y = x[valid], y[valid]
+    if len(x) == 0:
+        return True
+
+    (x0, y0), (x1, y1) = view.get_points()
+
+    return x.min() >= x0 and x.max() <= x1 and y.min() >= y0 and y.max() <= y1
+
+
+def _rescale(ax: Axes):
+    """Autoscales the Axes to the data, leaving some room on the right."""
+    ax.autoscale_view()
+    x0, x1 = ax.get_xlim()
+    ax.set_xlim(x0, x1 + _LIVE_HEADROOM * (x1 - x0), auto=None)
+
+
+class TradePlot(tuple):
+    """Live handle on a trade plotted by ``plot_trade``.
+
+    It behaves exactly like the ``(fig, axs)`` tuple returned by previous
+    versions (``fig, axs = plot_trade(...)`` keeps working),
+    and adds the ``update`` method to append new ticks to the figure.
+
+    Instead of rebuilding the figure, ``update`` appends the new points
+    to the existing lines, shades only the new segment of the PnL,
+    and moves the last price annotations. The figure is redrawn with
+    blitting: only the new segments and the annotations are drawn,
+    on top of the previous frame. If the new points fall outside of the axes,
+    the figure is redrawn entirely; some room is left on the right
+    of the x-axis, so that this is rare.
+
+    The breaches of the stop loss and take profit levels are available
+    in ``breaches``, a DataFrame with one row per level, and the columns
+    ``type`` ("stop_loss" or "take_profit"), ``level`` (at the entry),
+    ``breach_date`` (NaT if never breached) and ``breach_level``.
+    If the trade was plotted with ``stats=True``, its statistics
+    (see ``trade_stats``) are available in ``stats``.
+    """
+
+    def __new__(
+        cls,
+        fig: Figure,
+        axs: np.ndarray,
+        artists: dict,
+        pnl_type: Literal["nominal", "cumulative"],
+        decimation: Optional[DecimationMethod] = "minmax",
+        breaches: Optional[pd.DataFrame] = None,
+        stats: Optional[dict] = None,
+    ):
+        self = super().__new__(cls, (fig, axs))
+        self.breaches = breaches
+        self.stats = stats
+        self._artists = artists
+        self._pnl_type = pnl_type
+        self._decimation = decimation
+        self._background = None
+        self._draw_cid = None
+
+        return self
+
+    @property
+    def fig(self) -> Figure:
+        """The figure of the trade."""
+        return self[0]
+
+    @property
+    def axs(self) -> np.ndarray:
+        """The PnL (top) and underlying (bottom) axes."""
+        return self[1]
+
+    def update(
+        self,
+        new_underlying_ticks: Optional[pd.Series] = None,
+        new_pnl_ticks: Optional[pd.Series] = None,
+    ):
+        """Append new ticks to the plot, and redraw it.
+
+        Parameters
+        ----------
+        new_underlying_ticks : pd.Series | None, optional
+            New prices of the underlying, with a sorted ``DatetimeIndex``,
+            by default None. Ticks not after the last plotted date are ignored.
+        new_pnl_ticks : pd.Series | None, optional
+            New PnL of the trade, with a sorted ``DatetimeIndex``,
+            by default None. Ticks not after the last plotted date are ignored.
+            As in ``plot_trade``, it is the PnL of each period:
+            if the trade was plotted with ``pnl_type="cumulative"``,
+            it is added to the last cumulative PnL plotted.
+
+        The stop loss and take profit levels, and their breaches,
+        are not updated.
+        """
+        pnl_ax, underlying_ax = self.axs
+        artists = self._artists
+        views = [ax.viewLim.frozen() for ax in self.axs]
+        segments = []  # the new parts of the plot, drawn over the previous frame
+        points = []  # the new points, with their Axes
+
+        if new_underlying_ticks is not None:
+            line = artists["underlying_line"]
+            x, y = _new_ticks(new_underlying_ticks, line.get_xdata()[-1])
+
+            if len(x) > 0:
+                segments.append(self._extend_line(line, underlying_ax, x, y))
+                points.append((underlying_ax, x, y))
+
+        if new_pnl_ticks is not None:
+            line = artists["pnl_line"]
+            x, y = _new_ticks(new_pnl_ticks, line.get_xdata()[-1])
+
+            if len(x) > 0:
+                missing = np.isnan(y)
+                if self._pnl_type == "cumulative":
+                    y = line.get_ydata()[-1] + np.cumsum(np.where(missing, 0, y))
+                y[missing] = 0
+
+                # the areas are drawn below the line
+                n_points = len(line.get_xdata()) + len(x)
+                segment = self._extend_line(line, pnl_ax, x, y)
+                decimated = len(line.get_xdata()) < n_points
+                segments += self._extend_fills(*segment.get_data(), decimated)
+                segments.append(segment)
+                points.append((pnl_ax, x, y))
+
+        for ax, x, y in points:
+            valid = ~np.isnan(y)
+            ax.update_datalim(np.column_stack([x[valid], y[valid]]))
+
+        redraw = not all(
+            _fits_view(view, x, y)
+            for view, ax in zip(views, self.axs)
+            for points_ax, x, y in points
+            if points_ax is ax
+        )
+        for ax, view in zip(self.axs, views):
+            if redraw:
+                _rescale(ax)
+            else:
+                # adding the areas requested an autoscale, the view is kept as is
+                ax.set_xlim(view.intervalx, auto=None)
+                ax.set_ylim(view.intervaly, auto=None)
+
+        _move_last_price(
+            artists["underlying_price"],
+            underlying_ax,
+            artists["underlying_line"].get_ydata()[-1],
+        )
+        _move_last_price(
+            artists["pnl_price"], pnl_ax, artists["pnl_line"].get_ydata()[-1]
+        )
+
+        self._redraw(segments, full=redraw)
+
+    def _extend_line(self, line: Line2D, ax: Axes, x: np.ndarray, y: np.ndarray):
+        """Appends the points to the line, decimating it once it grows too long.
+
+        Returns the new segment of the line (from its previous last point),
+        as a line with the same style.
+        """
+        old_x, old_y = line.get_xdata(), line.get_ydata()
+        segment = Line2D(
+            np.concatenate([old_x[-1:], x]), np.concatenate([old_y[-1:], y])
+        )
+        segment.update_from(line)
+
+        x, y = np.concatenate([old_x, x]), np.concatenate([old_y, y])
+        if self._decimation is not None:
+            n_pixels = _axis_pixel_budget(ax)
+
+            # decimating the whole line is only worth it once it doubled
+            if len(x) > 8 * n_pixels:
+                idx = _decimation_indices(x, y, self._decimation, n_pixels)
+                if idx is not None:
+                    x, y = x[idx], y[idx]
+
+        line.set_data(x, y)
+
+        return segment
+
+    def _extend_fills(
+        self, x: np.ndarray, y: np.ndarray, decimated: bool
+    ) -> list[PathCollection]:
+        """Shades the new segment, and merges it in the existing areas.
+
+        If the line was just decimated, the areas are shaded again from it,
+        so they are decimated as well. So are they if they hold more than
+        the (at most) 4 vertices per point of the line of areas shaded at once,
+        as each segment adds a few vertices, closing its polygons.
+
+        Returns the areas of the new segment only.
+        """
+        areas = self._artists["pnl_areas"]
+        new_paths = _pnl_paths(x, y)
+        line_x, line_y = self._artists["pnl_line"].get_data()
+
+        n_vertices = sum(
+            len(path.vertices) for path in (*areas.get_paths(), *new_paths)
+        )
+        if decimated or n_vertices > 4 * len(line_x) + 8:
+            areas.set_paths(list(_pnl_paths(line_x, line_y)))
+        else:
+            areas.set_paths(
+                [
+                    Path(
+                        np.concatenate([old.vertices, new.vertices]),
+                        np.concatenate([old.codes, new.codes]),
+                    )
+                    for old, new in zip(areas.get_paths(), new_paths)
+                ]
+            )
+
+        segment = PathCollection(new_paths)
+        segment.update_from(areas)
+
+        return [segment]
+
+    def _last_prices(self) -> list[Annotation]:
+        return [self._artists["underlying_price"], self._artists["pnl_price"]]
+
+    def _on_draw(self, event):
+        """Saves the background after each full draw of the figure."""
+        canvas = event.canvas
+        if not canvas.supports_blit or canvas.is_saving():
+            return
+
+        self._background = canvas.copy_from_bbox(self.fig.bbox)
+        for annotation in self._last_prices():
+            self.fig.draw_artist(annotation)
+
+    def _redraw(self, segments: list, full: bool):
+        canvas = self.fig.canvas
+
+        if self._draw_cid is None:
+            # from now on, the last prices are drawn on top of the background
+            for annotation in self._last_prices():
+                annotation.set_animated(True)
+
+            self._draw_cid = canvas.mpl_connect("draw_event", self._on_draw)
+            full = True
+
+        if full or self._background is None or not canvas.supports_blit:
+            # the background is saved again once the figure is drawn
+            self._background = None
+            canvas.draw_idle()
+            return
+
+        # the new segments become part of the background
+        canvas.restore_region(self._background)
+        for segment in segments:
+            segment.set_figure(self.fig)  # they are not part of the figure
+            self.fig.draw_artist(segment)
+        self._background = canvas.copy_from_bbox(self.fig.bbox)
+
+        for annotation in self._last_prices():
+            self.fig.draw_artist(annotation)
+
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+
+
+def _build_trade_figure(
     underlying: pd.Series,
     pnl: pd.Series,
+    entry_date: pd.Timestamp,
+    title: Optional[str],
+    underlying_name: str,
+    sources: Union[str, list[str]],
+    pnl_type: Literal["nominal", "cumulative"],
+    **kwargs,
+) -> TradePlot:
+    """Creates the figure of a (preprocessed) trade, styled and drawn."""
+    # creates plots
+    fig, axs = _subplots(2, 1, sharex=True, gridspec_kw=TRADE_GRIDSPEC)
+    pnl_ax, underlying_ax = axs
+    pnl_ax: Axes
+    underlying_ax: Axes
+
+    # sets title and applies style
+    if title is not None:
+        fig.suptitle(title)
+
+    apply_bsic_style(fig, axs, sources)
+
+    artists, breaches, stats = _draw_trade(
+        fig,
+        pnl_ax,
+        underlying_ax,
+        underlying,
+        pnl,
+        entry_date,
+        underlying_name,
+        pnl_type,
+        **kwargs,
+    )
+
+    # underlying_ax.set_xlim(xlims)
+    fig.subplots_adjust(bottom=0.2)  # leave space for the sources
+
+    return TradePlot(
+        fig,
+        axs,
+        artists,
+        pnl_type,
+        kwargs.get("decimation", "minmax"),
+        breaches,
+        stats,
+    )
+
+
+def plot_trade(
+    underlying: Timeseries,
+    pnl: Timeseries,
     pnl_type: Literal["nominal", "cumulative"],
     title: str,
     underlying_name: str,
@@ -128,9 +1117,13 @@ def plot_trade(
     sources: Union[str, list[str]] = "BSIC",
     entry_point_marker_loc: Literal["top", "bottom"] = "top",
     entry_point_marker_size: int = 10,
-    date_ticks_unit: Literal["Y", "M", "W", "D"] = "W",
-    date_ticks_freq: int = 1,
+    date_ticks_unit: Literal["auto", "Y", "M", "W", "D"] = "auto",
+    date_ticks_freq: Optional[int] = None,
     date_ticks_format: str = "%b %d, %Y",
+    decimation: Optional[DecimationMethod] = "minmax",
+    stop_loss: Optional[Levels] = None,
+    take_profit: Optional[Levels] = None,
+    stats: bool = False,
 ):
     """Plot a trade performance vs the underlying.
 
@@ -142,13 +1135,24 @@ def plot_trade(
 
     Parameters
     ----------
-    underlying : pd.Series
-        Pandas series of the underlying's prices.
-    pnl : pd.Series
+    underlying : pd.Series | tuple[numpy.ndarray, numpy.ndarray]
+        Pandas series of the underlying's prices, with a sorted ``DatetimeIndex``.
+
+        It can also be a ``(timestamps, values)`` pair of 1D arrays, with the
+        sorted timestamps as ``int64`` nanoseconds (or ``datetime64[ns]``).
+        The arrays can be memory-mapped (``np.memmap``): only the window
+        plotted is read in memory, so you can plot series much larger
+        than the RAM straight from disk.
+    pnl : pd.Series | tuple[numpy.ndarray, numpy.ndarray]
         Pandas series of the pnl of the trade. This must be in nominal terms
         or in percentage terms,
         if you want to plot the percentages. You can also plot the cumulative PnL,
         the function will calculate it for you.
+        It must have a sorted ``DatetimeIndex``, and it is clipped to the same
+        window as the underlying. The trade is entered at the first non-NaN value.
+
+        It can also be a ``(timestamps, values)`` pair of arrays,
+        as the underlying (both must be Series, or both pairs of arrays).
     pnl_type : Literal['Nominal', 'Cumulative']
         The type of PnL you want to plot. Can be "Nominal" or "Cumulative".
         If "nominal", the function will plot the PnL as is.
@@ -189,30 +1193,76 @@ def plot_trade(
         depend on the final size of the plot.
         Choose so that the marker is clearly visible and does not overlap with the
         underlying's plot.
-    date_ticks_unit : Literal['Y', 'M', 'W', 'D'], optional
+    date_ticks_unit : Literal['auto', 'Y', 'M', 'W', 'D'], optional
         The unit used to segment the datetime index (which is displayed
-        on the bottom axis), by default "W". Since you
-        are probably going to plot a short timespan, it is recommended to use either
+        on the bottom axis), by default "auto".
+        If "auto", the unit and the frequency are chosen from the span
+        of the dates plotted and the width of the axis,
+        so that the axis is never cluttered (see ``format_timeseries_axis``).
+        Since you are probably going to plot a short timespan,
+        if you want to choose it yourself it is recommended to use either
         "W" (weeks) or "D" (days). There should
         be no reason to use "Y" (years), and you should really question the timeframe
         you are using if you are choosing "M".
-    date_ticks_freq : int, optional
-        The frequency for the ticks in the unit specified, by default 1. For example,
-        if you chose "W" as the unit, and 1 as the
+    date_ticks_freq : int | None, optional
+        The frequency for the ticks in the unit specified, by default None.
+        For example, if you chose "W" as the unit, and 1 as the
         frequency, there will be 1 tick every week.
-        Choose so that the axis is not cluttered.
+        If None, it is chosen automatically so that the axis is not cluttered.
     date_ticks_format : str, optional
         The format used for the date ticks, by default ``"%b %d, %Y"``. I recommend
         using the default, but you can change it to whatever
         you find more suitable.
+    decimation : Literal['minmax', 'lttb'] | None, optional
+        The method used to reduce the number of points plotted, by default "minmax".
+        Long (e.g. tick-level) series are decimated to the points visible
+        once the figure is exported, which is much faster to draw.
+        See ``mpl_bsic.decimate`` for the available methods.
+        If None, all the points are plotted.
+    stop_loss : float | list[float] | numpy.ndarray | pd.Series | pd.DataFrame | None
+        The stop loss levels of the trade, by default None.
+        They are plotted (in red) on the underlying, from the entry of the trade
+        until they are first breached, and the breaches are marked with a cross.
+        You can specify a single level, or many (e.g. to compare candidates
+        in a backtest), either constant or time-varying (e.g. trailing stops):
+
+        * a number, or a 1D array of numbers, for constant levels;
+        * a Series, or a DataFrame with one column per level, with a sorted
+          ``DatetimeIndex``, for time-varying levels (the last value
+          at each date is used);
+        * a 2D array of shape ``(n_levels, len(underlying))``, for time-varying
+          levels aligned with the underlying.
+
+        A level is breached when the underlying reaches it from the side
+        it was at the entry (or when the level is first set, for time-varying
+        levels starting after the entry), so it works for both long and
+        short trades.
+        The breaches are available in the ``breaches`` attribute
+        of the object returned.
+    take_profit : float | list[float] | numpy.ndarray | pd.Series | pd.DataFrame | None
+        The take profit levels of the trade (plotted in green),
+        by default None. Same as ``stop_loss``.
+    stats : bool, optional
+        Whether to show the statistics of the trade (max drawdown,
+        time under water, hit rate, Sharpe and volatility of the PnL)
+        in a box on the underlying's plot, by default False.
+        They are computed on the plotted window, from the entry of the trade,
+        and are also available in the ``stats`` attribute of the object returned.
+        See ``trade_stats`` for their definitions (and the missing values).
+        If the window has less than two PnL values from the entry,
+        the box is not shown (and ``stats`` is None).
 
     Returns
     -------
-    tuple[matplotlib.figure.Figure, matplotlib.axes.Axes]
+    TradePlot
         A tuple containing the figure and the tuple of two axis just created.
         You can later use this to save the fig for export, do ``fig.show()``,
         or further customize the plot.
 
+        For live monitoring, call its ``update`` method with the new ticks
+        of the underlying and of the PnL: they are appended to the plot,
+        which is redrawn much faster than by calling ``plot_trade`` again.
+
     See Also
     --------
     mpl_bsic.apply_bsic_style :
@@ -221,89 +1271,84 @@ def plot_trade(
         Apply the BSIC logo to a plot.
     mpl_bsic.check_figsize :
         Check if the figsize is valid.
+    mpl_bsic.trade_stats :
+        Compute the statistics of a trade.
 
     Examples
     --------
-    Examples will come soon.
-    """
-    dates, entry_date = _get_dates(underlying, pnl, months_offset)
+    .. code-block:: python
 
-    underlying, pnl = _preprocess_data(underlying, pnl, dates, pnl_type)
+        from mpl_bsic import plot_trade
 
-    # creates plots
-    fig, axs = plt.subplots(
-        2, 1, sharex=True, gridspec_kw={"hspace": 0.1, "height_ratios": [1.25, 2]}
-    )
-    pnl_ax, underlying_ax = axs
-    pnl_ax: Axes
-    underlying_ax: Axes
+        fig, axs = plot_trade(underlying, pnl, "cumulative", "Trade", "EURUSD")
 
-    # sets title and applies style
-    if title is not None:
-        fig.suptitle(title)
+        # live monitoring: append the new ticks instead of plotting again
+        trade = plot_trade(underlying, pnl, "cumulative", "Trade", "EURUSD")
+        plt.show(block=False)
 
-    apply_bsic_style(fig, axs, sources)
+        while True:
+            new_underlying, new_pnl = fetch_ticks()
+            trade.update(new_underlying, new_pnl)
+            plt.pause(5)
 
-    # plot the data
-    underlying_ax.plot(underlying.index, underlying)
-    pnl_ax.plot(pnl.index, pnl)
-    pnl_ax.axhline(0, color="black", linewidth=1, alpha=0.75)
+        # tick archives on disk, with int64 nanosecond timestamps
+        times = np.memmap("eurusd_times.bin", dtype=np.int64, mode="r")
+        prices = np.memmap("eurusd_prices.bin", dtype=np.float64, mode="r")
+        pnl_times = np.memmap("pnl_times.bin", dtype=np.int64, mode="r")
+        pnl = np.memmap("pnl.bin", dtype=np.float64, mode="r")
 
-    # set labels
-    underlying_ax.set_ylabel(underlying_name)
-    pnl_ax.set_ylabel("PnL")
+        trade = plot_trade(
+            (times, prices), (pnl_times, pnl), "nominal", "Trade", "EURUSD"
+        )
+    """
+    is_series = [isinstance(data, pd.Series) for data in (underlying, pnl)]
 
-    # formats dates
-    format_timeseries_axis(
-        underlying_ax, date_ticks_unit, date_ticks_freq, date_ticks_format
-    )
+    if all(is_series):
+        start_date, end_date, entry_date = _get_dates(underlying, pnl, months_offset)
+        stop_loss = _levels_frame(stop_loss, underlying.index)
+        take_profit = _levels_frame(take_profit, underlying.index)
 
-    # apply logo
-    apply_bsic_logo(fig, pnl_ax, location="top left")
+        underlying, pnl = _preprocess_data(
+            underlying, pnl, start_date, end_date, entry_date, pnl_type
+        )
+    elif any(is_series):
+        raise Exception(
+            "underlying and pnl must be both Series, or both (timestamps, values) pairs"
+        )
+    else:
+        underlying = _timeseries_arrays(underlying, "underlying")
+        pnl = _timeseries_arrays(pnl, "PnL")
+        n = len(underlying[0])
 
-    # plot last price
-    _plot_last_price(underlying_ax, underlying)
-    _plot_last_price(pnl_ax, pnl)
+        start_date, end_date, entry_date = _get_array_dates(
+            underlying[0], *pnl, months_offset
+        )
+        underlying, pnl, window = _preprocess_arrays(
+            underlying, pnl, start_date, end_date, entry_date, pnl_type
+        )
 
-    # plot entry point
-    _plot_entry_point(
-        underlying_ax,
-        entry_date,
-        underlying,
-        entry_point_marker_loc,
-        entry_point_marker_size,
-    )
+        stop_loss = _levels_frame(
+            _levels_window(stop_loss, n, window), underlying.index
+        )
+        take_profit = _levels_frame(
+            _levels_window(take_profit, n, window), underlying.index
+        )
 
-    # plot areas of profit and loss
-    pnl_ax.fill_between(
-        pnl.index,
-        0,
-        pnl,
-        where=(pnl >= 0),  # type: ignore
-        color="g",
-        alpha=0.3,
-        interpolate=True,
-        lw=0,
-    )
-    pnl_ax.fill_between(
-        pnl.index,
-        0,
+    return _build_trade_figure(
+        underlying,
         pnl,
-        where=(pnl < 0),  # type: ignore
-        color="r",
-        alpha=0.3,
-        interpolate=True,
+        entry_date,
+        title,
+        underlying_name,
+        sources,
+        pnl_type,
+        entry_point_marker_loc=entry_point_marker_loc,
+        entry_point_marker_size=entry_point_marker_size,
+        date_ticks_unit=date_ticks_unit,
+        date_ticks_freq=date_ticks_freq,
+        date_ticks_format=date_ticks_format,
+        decimation=decimation,
+        stop_loss=stop_loss,
+        take_profit=take_profit,
+        stats=stats,
     )
-
-    # # plot stop loss and take profit
-    # trade_start = pnl[pnl["pnl"] > 0].index[-1]
-    # print(trade_start, pnl, pnl[pnl > 0])
-    # if stop_loss is not None:
-    #     _plot_xline(underlying_ax, stop_loss, trade_start=trade_start, color="r")
-    # if take_profit is not None:
-    #     _plot_xline(underlying_ax, take_profit, trade_start=trade_start, color="g")
-
-    # underlying_ax.set_xlim(xlims)
-    fig.subplots_adjust(bottom=0.2)  # leave space for the sources
-
-    return fig, axs
@@ -0,0 +1,357 @@
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Literal, Optional, Union
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+from utils.add_fonts import add_fonts
+
+from .apply_bsic_style import DEFAULT_TITLE_STYLE, apply_bsic_style
+from .check_figsize import MAX_FIGURE_WIDTH
+from .export_figure import export_figure
+from .headless import _figure, _start_headless
+from .plot_trade import TRADE_GRIDSPEC, _build_trade_figure, _draw_trade
+from .profiling import _phase
+
+MAX_GRID_HEIGHT = 9.5
+"""Maximum height (in inches) of a page of the grid of trades,
+so that each page fits in a page of a Word document."""
+
+
+def _check_index(df: pd.DataFrame, name: str):
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise Exception(f"Index of {name} must be a DatetimeIndex")
+
+    if not df.index.is_monotonic_increasing:
+        raise Exception(f"Index of {name} must be sorted")
+
+
+def _prepare_trades(
+    underlyings: pd.DataFrame, pnls: pd.DataFrame, pnl_type: str, months_offset: int
+) -> list[tuple[pd.Series, pd.Series, pd.Timestamp]]:
+    """Computes the windows of all the trades at once.
+
+    Returns, for each trade, the underlying and the PnL clipped to the window,
+    and the entry date, as ``plot_trade`` would for each pair of columns.
+    """
+    _check_index(underlyings, "underlyings")
+    _check_index(pnls, "pnls")
+
+    if underlyings.shape[1] != pnls.shape[1]:
+        raise Exception(
+            "underlyings and pnls must have the same number of columns (one per trade)"
+        )
+
+    # the window ends at the last valid price of each underlying
+    underlying_valid = underlyings.notna().to_numpy()
+    if not underlying_valid.any(axis=0).all():
+        raise Exception("Every underlying must have at least one valid price")
+
+    end_pos = len(underlyings) - 1 - underlying_valid[::-1].argmax(axis=0)
+    end_dates = underlyings.index[end_pos]
+    start_dates = end_dates - pd.DateOffset(months=months_offset)
+    start_pos = underlyings.index.searchsorted(start_dates, side="left")
+
+    # the trade is entered at the first valid PnL
+    pnl_valid = pnls.notna().to_numpy()
+    if not pnl_valid.any(axis=0).all():
+        raise Exception("There was an issue pulling the entry date for the trade.")
+
+    entry_dates = pnls.index[pnl_valid.argmax(axis=0)]
+
+    if pnl_type == "nominal":
+        pass
+    elif pnl_type == "cumulative":
+        pnls = pnls.cumsum()
+    else:
+        raise Exception(
+            'pnl type is not supported. Supported are "nominal" and "cumulative".'
+        )
+
+    pnl_start = pnls.index.searchsorted(start_dates, side="left")
+    pnl_end = pnls.index.searchsorted(end_dates, side="right")
+
+    return [
+        (
+            underlyings.iloc[start_pos[i] : end_pos[i] + 1, i],
+            pnls.iloc[pnl_start[i] : pnl_end[i], i],
+            entry_dates[i],
+        )
+        for i in range(underlyings.shape[1])
+    ]
+
+
+def _init_worker():
+    """Sets up a worker process once, before it renders any trade."""
+    matplotlib.use("Agg")
+    # the figures of a worker are only exported, never shown
+    _start_headless()
+    with _phase("add_fonts"):
+        add_fonts()
+
+
+def _export_trade(
+    underlying: pd.Series,
+    pnl: pd.Series,
+    entry_date: pd.Timestamp,
+    title: str,
+    underlying_name: str,
+    sources: Union[str, list[str]],
+    pnl_type: Literal["nominal", "cumulative"],
+    filename: str,
+    kwargs: dict,
+) -> str:
+    """Renders and exports a single trade, in a worker process."""
+    fig, _ = _build_trade_figure(
+        underlying, pnl, entry_date, title, underlying_name, sources, pnl_type, **kwargs
+    )
+    export_figure(fig, filename, release=True)
+
+    return filename + ".svg"
+
+
+def _filename(output_dir: str, i: int, title: str) -> str:
+    slug = re.sub(r"[^\w\-]+", "_", title).strip("_")
+
+    return os.path.join(output_dir, f"{i:03d}_{slug}")
+
+
+def _grid_page(
+    trades: list[tuple[pd.Series, pd.Series, pd.Timestamp]],
+    titles: list[str],
+    underlying_names: list[str],
+    ncols: int,
+    row_height: float,
+    sources: Union[str, list[str]],
+    pnl_type: Literal["nominal", "cumulative"],
+    kwargs: dict,
+):
+    """Plots a page of the grid: a figure with a subfigure per trade."""
+    nrows = math.ceil(len(trades) / ncols)
+    fig = _figure(figsize=(MAX_FIGURE_WIDTH, nrows * row_height))
+    subfigs = np.ravel(fig.subfigures(nrows, ncols, squeeze=False))
+
+    axes = [
+        subfig.subplots(2, 1, sharex=True, gridspec_kw=TRADE_GRIDSPEC)
+        for subfig in subfigs[: len(trades)]
+    ]
+
+    # the style is applied once, to all the axes of the figure
+    apply_bsic_style(fig, np.concatenate(axes), sources)
+
+    for (underlying, pnl, entry_date), subfig, axs, title, name in zip(
+        trades, subfigs, axes, titles, underlying_names
+    ):
+        subfig.suptitle(title, **DEFAULT_TITLE_STYLE)
+        subfig.subplots_adjust(bottom=0.25)
+        _draw_trade(
+            fig,
+            axs[0],
+            axs[1],
+            underlying,
+            pnl,
+            entry_date,
+            name,
+            pnl_type,
+            **kwargs,
+        )
+
+    return fig, axes
+
+
+def plot_trades(
+    underlyings: pd.DataFrame,
+    pnls: pd.DataFrame,
+    pnl_type: Literal["nominal", "cumulative"],
+    titles: Optional[list[str]] = None,
+    underlying_names: Optional[list[str]] = None,
+    layout: Literal["separate", "grid"] = "separate",
+    output_dir: Optional[str] = None,
+    n_jobs: Optional[int] = None,
+    ncols: int = 2,
+    rows_per_page: Optional[int] = None,
+    months_offset: int = 3,
+    sources: Union[str, list[str]] = "BSIC",
+    **kwargs,
+):
+    """Plot many trades at once.
+
+    Works like calling ``plot_trade`` on each trade, but much faster when
+    plotting many trades (e.g. for a weekly review of the whole book).
+    The windows of all the trades are computed at once, with vectorised
+    operations on the whole DataFrames, and the style is set up only once.
+
+    The trades can be plotted either as a grid (``layout="grid"``),
+    paged in figures that fit in a page of a Word document,
+    or in one figure per trade (``layout="separate"``).
+    In the latter case, if you specify ``output_dir``, the figures are
+    rendered and exported in parallel, by a pool of worker processes.
+
+    Parameters
+    ----------
+    underlyings : pandas.DataFrame
+        The prices of the underlyings, one column per trade,
+        with a sorted ``DatetimeIndex``.
+        The window of each trade ends at the last valid price of its underlying.
+    pnls : pandas.DataFrame
+        The PnLs of the trades, one column per trade (in the same order as
+        ``underlyings``), with a sorted ``DatetimeIndex``.
+        Each trade is entered at the first non-NaN value of its column.
+    pnl_type : Literal['nominal', 'cumulative']
+        The type of PnL you want to plot, as in ``plot_trade``.
+    titles : list[str] | None, optional
+        The titles of the trades, by default None.
+        If None, the column names of ``pnls`` are used.
+    underlying_names : list[str] | None, optional
+        The names of the underlyings, by default None.
+        If None, the column names of ``underlyings`` are used.
+    layout : Literal['separate', 'grid'], optional
+        Whether to plot one figure per trade ("separate"),
+        or the trades in a grid, paged in as few figures as possible ("grid"),
+        by default "separate".
+    output_dir : str | None, optional
+        The directory where the figures are exported (in ``svg`` format,
+        as with ``export_figure``), by default None.
+        Only used if layout is "separate". If None, the figures are returned
+        instead of being exported.
+    n_jobs : int | None, optional
+        The number of worker processes used to export the figures,
+        by default None (as many as the CPUs).
+        Only used if layout is "separate" and ``output_dir`` is specified.
+        If 1, the figures are exported in the current process.
+    ncols : int, optional
+        The number of columns of the grid, by default 2.
+        Only used if layout is "grid".
+    rows_per_page : int | None, optional
+        The maximum number of rows of each page (figure) of the grid,
+        by default None (as many as fit in ``MAX_GRID_HEIGHT`` inches,
+        9.5, i.e. 2 rows with 2 columns). Only used if layout is "grid".
+    months_offset : int, optional
+        The months offset used to calculate the first date plotted,
+        by default 3, as in ``plot_trade``.
+    sources : str | list[str], optional
+        List of sources, by default "BSIC", as in ``plot_trade``.
+    **kwargs
+        Additional formatting parameters of ``plot_trade``
+        (e.g. ``entry_point_marker_loc``, ``date_ticks_unit``, ``decimation``),
+        applied to all the trades.
+
+    Returns
+    -------
+    list
+        If layout is "grid", the ``(fig, axes)`` of each page: the figure
+        and the list of the axes of each of its trades
+        (PnL on top, underlying at the bottom).
+        If layout is "separate", the list of ``(fig, axs)`` of each trade,
+        as returned by ``plot_trade`` (which can be updated with new ticks),
+        or the list of exported files if ``output_dir`` is specified.
+
+    Raises
+    ------
+    Exception
+        If the DataFrames do not have a sorted ``DatetimeIndex``,
+        if they do not have the same number of columns,
+        or if a trade has no valid price or PnL.
+    Exception
+        If the layout is not supported, or ``rows_per_page`` is less than 1.
+
+    See Also
+    --------
+    mpl_bsic.plot_trade :
+        Plot a single trade.
+    mpl_bsic.export_figure :
+        Export a figure according to BSIC standards.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import plot_trades
+
+        # one column per trade
+        underlyings = pd.read_parquet("underlyings.parquet")
+        pnls = pd.read_parquet("pnls.parquet")
+
+        # export one svg per trade, in parallel
+        files = plot_trades(
+            underlyings, pnls, "cumulative", output_dir="weekly_review"
+        )
+
+        # or a grid, one page of 4 trades per figure
+        for page, (fig, axes) in enumerate(
+            plot_trades(underlyings, pnls, "cumulative", layout="grid")
+        ):
+            export_figure(fig, f"weekly_review_{page}", release=True)
+    """
+    trades = _prepare_trades(underlyings, pnls, pnl_type, months_offset)
+
+    if titles is None:
+        titles = [str(col) for col in pnls.columns]
+    if underlying_names is None:
+        underlying_names = [str(col) for col in underlyings.columns]
+
+    if len(titles) != len(trades) or len(underlying_names) != len(trades):
+        raise Exception("You must provide a title and an underlying name per trade")
+
+    if layout == "grid":
+        row_height = 1.1 * MAX_FIGURE_WIDTH / ncols
+        if rows_per_page is None:
+            rows_per_page = max(int(MAX_GRID_HEIGHT // row_height), 1)
+        elif rows_per_page < 1:
+            raise Exception("rows_per_page must be at least 1")
+
+        per_page = rows_per_page * ncols
+        return [
+            _grid_page(
+                trades[i : i + per_page],
+                titles[i : i + per_page],
+                underlying_names[i : i + per_page],
+                ncols,
+                row_height,
+                sources,
+                pnl_type,
+                kwargs,
+            )
+            for i in range(0, len(trades), per_page)
+        ]
+
+    if layout != "separate":
+        raise Exception('layout is not supported. Supported are "separate" and "grid".')
+
+    if output_dir is None:
+        return [
+            _build_trade_figure(
+                underlying, pnl, entry_date, title, name, sources, pnl_type, **kwargs
+            )
+            for (underlying, pnl, entry_date), title, name in zip(
+                trades, titles, underlying_names
+            )
+        ]
+
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [
+        (
+            underlying,
+            pnl,
+            entry_date,
+            title,
+            name,
+            sources,
+            pnl_type,
+            _filename(output_dir, i, title),
+            kwargs,
+        )
+        for i, ((underlying, pnl, entry_date), title, name) in enumerate(
+            zip(trades, titles, underlying_names)
+        )
+    ]
+
+    if n_jobs == 1:
+        return [_export_trade(*job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker) as pool:
+        return list(pool.map(_export_trade, *zip(*jobs)))
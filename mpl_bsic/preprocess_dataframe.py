@@ -1,17 +1,148 @@
+from typing import Iterable, Optional, Union
+
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_object_dtype, is_string_dtype, union_categoricals
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+
+def _guess_date_format(dates: pd.Series) -> Optional[str]:
+    """Guesses the format of the dates once, from the first valid date."""
+    first = dates.first_valid_index()
+    if first is None or not isinstance(dates[first], str):
+        return None
+
+    return guess_datetime_format(dates[first])
+
+
+def _preprocess_options(
+    df: pd.DataFrame, date_format: Optional[str], categorical_threshold: Optional[float]
+) -> tuple[Optional[str], list[str]]:
+    """Chooses the date format and the (lowercase) categorical columns once.
+
+    For chunks, they are chosen from the first chunk, and used for all of them.
+    """
+    columns = {str(col).lower(): col for col in df.columns}
+
+    if date_format is None and "date" in columns:
+        date_format = _guess_date_format(df[columns["date"]])
+
+    categorical = []
+    if categorical_threshold is not None:
+        max_unique = categorical_threshold * len(df)
+        categorical = [
+            lower
+            for lower, col in columns.items()
+            if lower != "date"
+            and (is_object_dtype(df[col]) or is_string_dtype(df[col]))
+            and df[col].nunique() <= max_unique
+        ]
+
+    return date_format, categorical
+
+
+def _convert_column(
+    column: pd.Series, downcast: bool, categorical: bool
+) -> Union[np.ndarray, pd.api.extensions.ExtensionArray]:
+    """Values of the column, downcast or converted to categorical if needed."""
+    if categorical:
+        return pd.Categorical(column)
+
+    if downcast and column.dtype == np.float64:
+        return column.to_numpy(np.float32)
+
+    return column.array
+
+
+def _preprocess(
+    df: pd.DataFrame,
+    date_format: Optional[str],
+    downcast: bool,
+    categorical: list[str],
+) -> pd.DataFrame:
+    """Preprocesses a DataFrame into a new one, without copying unchanged columns."""
+    columns = {str(col).lower(): df[col] for col in df.columns}
+
+    index = df.index
+    if "date" in columns:
+        index = pd.DatetimeIndex(
+            pd.to_datetime(columns.pop("date"), format=date_format), name="date"
+        )
 
+    data = {
+        col: _convert_column(column, downcast, col in categorical)
+        for col, column in columns.items()
+    }
 
-def preprocess_dataframe(df: pd.DataFrame):
+    return pd.DataFrame(data, index=index, copy=False)
+
+
+def _concat_chunks(chunks: list[pd.DataFrame], categorical: list[str]) -> pd.DataFrame:
+    """Concatenates the chunks, keeping the categorical columns categorical."""
+    # with different categories, concat would turn the columns back into strings
+    for col in categorical:
+        categories = union_categoricals([chunk[col].array for chunk in chunks])
+        for chunk in chunks:
+            chunk[col] = chunk[col].cat.set_categories(categories.categories)
+
+    return pd.concat(chunks, copy=False)
+
+
+def preprocess_dataframe(
+    df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    date_format: Optional[str] = None,
+    downcast: bool = False,
+    categorical_threshold: Optional[float] = None,
+    inplace: bool = True,
+) -> Optional[pd.DataFrame]:
     """Handle and preprocess the DataFrame before plotting.
 
     Handle and preprocess the DataFrame before plotting.
     It sets all the columns to lowercase and
     sets the index as the dates (converting to datetime).
 
+    For large DataFrames (e.g. raw Bloomberg dumps), use ``inplace=False``:
+    a new DataFrame is returned, without copying the columns that are
+    not converted, and the memory used can be reduced by
+    downcasting the floats and converting the strings to categoricals.
+    DataFrames read in chunks (e.g. ``pd.read_csv(..., chunksize=...)``)
+    can also be preprocessed one chunk at a time.
+
     Parameters
     ----------
-    df : pd.DataFrame
-        The DataFrame to preprocess.
+    df : pd.DataFrame | Iterable[pd.DataFrame]
+        The DataFrame to preprocess, or an iterator of chunks of the DataFrame
+        (only with ``inplace=False``).
+    date_format : str | None, optional
+        The format of the dates (e.g. ``"%m/%d/%Y"``), by default None.
+        If None, it is guessed once from the first date,
+        instead of being inferred for every date.
+    downcast : bool, optional
+        Whether to convert the ``float64`` columns to ``float32``,
+        which halves their memory, by default False.
+        ``float32`` has ~7 significant digits, which is plenty for plotting.
+    categorical_threshold : float | None, optional
+        The columns of strings with at most ``categorical_threshold * len(df)``
+        unique values (e.g. tickers, currencies) are converted to categoricals,
+        by default None (no conversion).
+        With chunks, the columns are chosen from the first chunk.
+    inplace : bool, optional
+        Whether to modify the DataFrame in place, by default True.
+        If False, a new DataFrame is returned, and ``df`` is left unchanged.
+
+    Returns
+    -------
+    pd.DataFrame | None
+        The preprocessed DataFrame, or None if ``inplace`` is True.
+
+    Raises
+    ------
+    Exception
+        If an iterator of chunks is preprocessed in place, or if it is empty.
 
     See Also
     --------
@@ -20,11 +151,57 @@ def preprocess_dataframe(df: pd.DataFrame):
 
     Examples
     --------
-    This is the examples section. WIP.
+    .. code-block:: python
+
+        from mpl_bsic import preprocess_dataframe
+
+        df = pd.read_csv("yields.csv")
+        preprocess_dataframe(df)
+
+        # large export, read in chunks
+        chunks = pd.read_csv("bloomberg_dump.csv", chunksize=1_000_000)
+        df = preprocess_dataframe(
+            chunks,
+            date_format="%m/%d/%Y",
+            downcast=True,
+            categorical_threshold=0.01,
+            inplace=False,
+        )
     """
+    if not isinstance(df, pd.DataFrame):
+        if inplace:
+            raise Exception("Chunks can only be preprocessed with inplace=False")
+
+        chunks, categorical = [], []
+        for i, chunk in enumerate(df):
+            if i == 0:
+                date_format, categorical = _preprocess_options(
+                    chunk, date_format, categorical_threshold
+                )
+
+            chunks.append(_preprocess(chunk, date_format, downcast, categorical))
+
+        if len(chunks) == 0:
+            raise Exception("There are no chunks to preprocess")
+
+        return _concat_chunks(chunks, categorical)
+
+    date_format, categorical = _preprocess_options(
+        df, date_format, categorical_threshold
+    )
+
+    if not inplace:
+        return _preprocess(df, date_format, downcast, categorical)
 
     df.columns = [col.lower() for col in df.columns]
 
     if "date" in df.columns:
         df.set_index("date", inplace=True, drop=True)
-        df.index = pd.to_datetime(df.index)
+        df.index = pd.to_datetime(df.index, format=date_format)
+
+    for col in categorical:
+        df[col] = pd.Categorical(df[col])
+
+    if downcast:
+        for col in df.columns[(df.dtypes == np.float64).to_numpy()]:
+            df[col] = df[col].astype(np.float32)
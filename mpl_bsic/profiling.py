@@ -0,0 +1,222 @@
+import atexit
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+log = logging.getLogger("mpl_bsic")
+
+PROFILE_ENV = "MPL_BSIC_PROFILE"
+"""Environment variable enabling the profiling of the whole process.
+
+* ``MPL_BSIC_PROFILE=1``: the summary of the phases is printed
+  (to ``stderr``) when the process exits.
+* ``MPL_BSIC_PROFILE=path/to/events.jsonl``: the phases are appended to the file,
+  one JSON event per line, as they end.
+
+As it is inherited by the worker processes (e.g. of ``plot_trades``),
+their phases are profiled as well.
+"""
+
+_PROFILES: list["Profile"] = []
+"""Profiles recording the phases (empty if the profiling is disabled)."""
+
+_PROFILES_LOCK = threading.Lock()
+
+
+class Profile:
+    """Phases of mpl_bsic recorded by ``profiling``.
+
+    Each event is a dict with the ``phase``, its ``wall`` and ``cpu`` time
+    (in seconds, the CPU time of the thread running it), the net number of
+    memory blocks it allocated (``allocated_blocks``, in the whole process),
+    and the ``thread`` and ``pid`` running it.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.events: list[dict] = []
+        self._path = path
+        self._lock = threading.Lock()
+
+    def _record(self, event: dict):
+        with self._lock:
+            self.events.append(event)
+
+            if self._path is not None:
+                with open(self._path, "a") as f:
+                    f.write(json.dumps(event) + "\n")
+
+    def totals(self) -> dict[str, dict]:
+        """Calls, wall time, CPU time and allocated blocks of each phase."""
+        totals: dict[str, dict] = {}
+        for event in self.events:
+            total = totals.setdefault(
+                event["phase"],
+                {"calls": 0, "wall": 0.0, "cpu": 0.0, "allocated_blocks": 0},
+            )
+            total["calls"] += 1
+            total["wall"] += event["wall"]
+            total["cpu"] += event["cpu"]
+            total["allocated_blocks"] += event["allocated_blocks"]
+
+        return totals
+
+    def summary(self) -> str:
+        """Table of the totals of the phases, the slowest first.
+
+        Phases can be nested (e.g. ``tight_bbox`` within ``savefig``),
+        so their times do not add up.
+        """
+        totals = sorted(self.totals().items(), key=lambda item: -item[1]["wall"])
+
+        lines = [
+            f"{'phase':<16} {'calls':>7} {'wall (ms)':>11} {'cpu (ms)':>11} "
+            f"{'blocks':>10}"
+        ]
+        for phase, total in totals:
+            lines.append(
+                f"{phase:<16} {total['calls']:>7} {total['wall'] * 1e3:>11.2f} "
+                f"{total['cpu'] * 1e3:>11.2f} {total['allocated_blocks']:>10}"
+            )
+
+        return "\n".join(lines)
+
+
+@contextmanager
+def _phase(name: str) -> Iterator[None]:
+    """Records the time spent in the context as a phase, if profiling."""
+    if not _PROFILES:
+        yield
+        return
+
+    wall, cpu = time.perf_counter(), time.thread_time()
+    blocks = sys.getallocatedblocks()
+    try:
+        yield
+    finally:
+        event = {
+            "phase": name,
+            "wall": time.perf_counter() - wall,
+            "cpu": time.thread_time() - cpu,
+            "allocated_blocks": sys.getallocatedblocks() - blocks,
+            "thread": threading.current_thread().name,
+            "pid": os.getpid(),
+        }
+        log.debug("mpl_bsic phase %s: %.2f ms", name, event["wall"] * 1e3)
+
+        for profile in list(_PROFILES):
+            profile._record(event)
+
+
+@contextmanager
+def _phase_method(obj: object, method: str, name: str) -> Iterator[None]:
+    """Records the calls to a method of ``obj`` within the context as a phase,
+    e.g. the tight bounding box computed by ``savefig``, if profiling."""
+    if not _PROFILES:
+        yield
+        return
+
+    func = getattr(obj, method)
+
+    def timed(*args, **kwargs):
+        with _phase(name):
+            return func(*args, **kwargs)
+
+    setattr(obj, method, timed)
+    try:
+        yield
+    finally:
+        delattr(obj, method)
+
+
+def _start_env_profile(value: str) -> Profile:
+    """Profiles the whole process, as set by the ``MPL_BSIC_PROFILE`` variable."""
+    path = None if value.lower() in ("1", "true", "yes") else value
+    profile = Profile(path)
+
+    with _PROFILES_LOCK:
+        _PROFILES.append(profile)
+
+    if path is None:
+        atexit.register(
+            lambda: print(
+                f"mpl_bsic profile (pid {os.getpid()}):\n{profile.summary()}",
+                file=sys.stderr,
+            )
+        )
+
+    return profile
+
+
+@contextmanager
+def profiling() -> Iterator[Profile]:
+    """Profile the phases of mpl_bsic run within the context.
+
+    Records the wall time, the CPU time and the memory blocks allocated
+    by each internal phase of mpl_bsic, to find out where the time goes
+    when rendering (or exporting) charts is slow:
+
+    * ``add_fonts``: adding the BSIC fonts to matplotlib (once per process).
+    * ``logo_imread``: reading the logo image (once per logo type).
+    * ``_style_axis`` and ``_add_sources``: styling each axis of a figure,
+      and adding the sources (``apply_bsic_style``).
+    * ``run_animations``: applying the deferred styles (and the logo)
+      before exporting.
+    * ``savefig`` and ``tight_bbox``: saving the figure (``export_figure``),
+      and computing its tight bounding box within it.
+    * ``_write_index`` and ``_write_data``: writing an Excel table
+      (``df_to_excel``, ``style_excel_file``).
+
+    The phases run by all the threads are recorded. When the profiling is off
+    (outside the context, and without ``MPL_BSIC_PROFILE``), the phases
+    are not timed at all. To profile a whole process (e.g. a batch of
+    charts in production, including the worker processes of ``plot_trades``),
+    set the ``MPL_BSIC_PROFILE`` environment variable instead.
+
+    Yields
+    ------
+    Profile
+        The profile, with the ``events`` recorded (one dict per phase run),
+        their ``totals()`` per phase and a ``summary()`` table.
+
+    See Also
+    --------
+    mpl_bsic.export_figure :
+        Export a figure according to BSIC Standards.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import apply_bsic_style, export_figure, profiling
+
+        with profiling() as profile:
+            fig, ax = plt.subplots(1, 1)
+            ax.plot(x, y)
+            apply_bsic_style(fig, ax)
+            export_figure(fig, "chart")
+
+        print(profile.summary())
+
+    .. code-block:: bash
+
+        # profile a whole batch, one JSON event per line
+        MPL_BSIC_PROFILE=events.jsonl python make_chart_pack.py
+    """
+    profile = Profile()
+    with _PROFILES_LOCK:
+        _PROFILES.append(profile)
+
+    try:
+        yield profile
+    finally:
+        with _PROFILES_LOCK:
+            _PROFILES.remove(profile)
+
+
+if os.environ.get(PROFILE_ENV, "").lower() not in ("", "0", "false", "no"):
+    _start_env_profile(os.environ[PROFILE_ENV])
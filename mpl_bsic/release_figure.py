@@ -0,0 +1,111 @@
+import gc
+from contextlib import contextmanager
+from typing import Iterator
+
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+from utils.set_animations import clear_animations
+
+
+def release_figure(fig: Figure, collect: bool = True):
+    """Close a figure, and drop the references keeping its memory alive.
+
+    ``plt.close`` only removes the figure from pyplot: the figure is still
+    referenced by its BSIC animations (and their closures), by its axes
+    and artists, so it is only freed by the (infrequent) full collections
+    of the garbage collector. A process creating many charts in a loop
+    (e.g. with ``plot_trade``) then grows steadily.
+
+    This closes the figure, stops and drops its animations, clears it
+    (breaking the references between the figure, its axes and its artists)
+    and drops the renderer cached by its canvas. The references left
+    (e.g. between the artists and their transforms) are then collected,
+    so that its memory (including the copy of the logo image,
+    44 MB with the formal logo) is reclaimed at once.
+    The figure cannot be used afterwards.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        The figure to release, once exported.
+    collect : bool, optional
+        Whether to run the garbage collector, by default True.
+        It takes a few tens of milliseconds: to release many figures at once,
+        collect only after the last one (as ``closing_figures`` does).
+
+    See Also
+    --------
+    mpl_bsic.closing_figures :
+        Release the figures created within a context.
+    mpl_bsic.export_figure :
+        Export a figure, and release it with ``release=True``.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import export_figure, plot_trade, release_figure
+
+        for name, (underlying, pnl) in trades.items():
+            trade = plot_trade(underlying, pnl, "nominal", name, "Swap Spread")
+            export_figure(trade.fig, name)
+            release_figure(trade.fig)
+    """
+    clear_animations(fig)
+    # headless figures are not managed by pyplot
+    if fig.canvas.manager is not None:
+        plt.close(fig)
+    fig.clear()
+
+    # e.g. the buffer of the Agg renderer, 177 MB for a 1200 dpi figure
+    for cache in ("renderer", "_lastKey"):
+        vars(fig.canvas).pop(cache, None)
+
+    if collect:
+        gc.collect()
+
+
+@contextmanager
+def closing_figures(collect: bool = True) -> Iterator[None]:
+    """Release the pyplot figures created within the context.
+
+    The figures created in the context (e.g. by ``plot_trade``) and still open
+    when it exits are released with ``release_figure``, so that a long-running
+    process exporting charts in a loop keeps a flat memory footprint.
+    Export the figures within the context.
+
+    Parameters
+    ----------
+    collect : bool, optional
+        Whether to run the garbage collector when the context exits,
+        by default True, to reclaim the memory of the figures at once
+        (instead of at the next full collection).
+
+    See Also
+    --------
+    mpl_bsic.release_figure :
+        Release a single figure.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import closing_figures, export_figure, plot_trade
+
+        for name, (underlying, pnl) in trades.items():
+            with closing_figures():
+                trade = plot_trade(underlying, pnl, "nominal", name, "Swap Spread")
+                export_figure(trade.fig, name)
+    """
+    open_before = set(plt.get_fignums())
+
+    try:
+        yield
+    finally:
+        for num in plt.get_fignums():
+            if num not in open_before:
+                release_figure(plt.figure(num), collect=False)
+
+        if collect:
+            gc.collect()
@@ -0,0 +1,556 @@
+import hashlib
+import importlib.metadata
+import io
+import json
+import math
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, Optional
+
+import matplotlib
+import numpy as np
+import pandas as pd
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+
+from .apply_bsic_logo import _load_logo, apply_bsic_logo
+from .apply_bsic_style import apply_bsic_style
+from .bsic_figure import FIGURE_TEMPLATES, bsic_figure
+from .check_figsize import check_figsize
+from .export_figure import EXPORT_DPI, _save_figure
+from .format_timeseries_axis import format_timeseries_axis
+from .headless import headless
+from .plot_timeseries import plot_timeseries
+from .plot_trade import plot_trade
+from .plot_trades import _init_worker
+from .release_figure import release_figure
+
+CHART_KINDS = ("trade", "line", "bar")
+"""Kinds of charts described by a chart spec."""
+
+_FORMATS = ("svg", "png")
+
+_DEFAULT_LOGO = {"location": "top left", "type": "formal", "scale": 0.03, "alpha": 1}
+"""Logo of the line and bar charts, as on the figures of ``bsic_figure``."""
+
+_TRADE_OPTIONS = {
+    "pnl_type": "nominal",
+    "underlying_name": "",
+    "months_offset": 3,
+    "entry_point_marker_loc": "top",
+    "entry_point_marker_size": 10,
+    "date_ticks_unit": "auto",
+    "date_ticks_freq": None,
+    "date_ticks_format": "%b %d, %Y",
+    "decimation": "minmax",
+    "stats": False,
+}
+"""Parameters of ``plot_trade`` set in the spec of a trade, with their defaults."""
+
+_CHART_OPTIONS = {
+    "trade": _TRADE_OPTIONS,
+    "line": {"xlabel": "", "ylabel": "", "decimation": "minmax"},
+    "bar": {"xlabel": "", "ylabel": ""},
+}
+"""Options of each kind of chart, with their defaults."""
+
+_MAX_DPI = 2 * EXPORT_DPI
+"""Highest resolution of the images rendered from specs, in dots per inch."""
+
+_NOT_HASHED = ("filename",)
+"""Keys of the spec which do not change the image rendered."""
+
+
+def _to_index(values) -> np.ndarray:
+    """Index of a line chart: dates (as strings, or datetime64) or numbers."""
+    values = np.asarray(values)
+
+    if values.dtype.kind in "USOM":
+        return pd.to_datetime(values).to_numpy(dtype="datetime64[ns]")
+
+    return values
+
+
+def _to_times(values) -> np.ndarray:
+    """Timestamps of a trade series, as int64 nanoseconds."""
+    values = np.asarray(values)
+
+    if values.dtype == np.int64:
+        return values
+
+    return pd.to_datetime(values).to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+
+def _to_values(values) -> np.ndarray:
+    # missing values (None) are NaN
+    return np.asarray(values, dtype=np.float64)
+
+
+def _timeseries(data, name: str) -> dict:
+    """Timestamps and values of a trade series (a Series, or index and values)."""
+    if isinstance(data, pd.Series):
+        data = {"index": data.index, "values": data.to_numpy()}
+
+    try:
+        return {"index": _to_times(data["index"]), "values": _to_values(data["values"])}
+    except (KeyError, TypeError, IndexError) as e:
+        raise Exception(f'{name} must be a Series or {{"index", "values"}}') from e
+
+
+def _series(series) -> dict:
+    """Values of each series of a line or bar chart, by label."""
+    if isinstance(series, pd.DataFrame):
+        return {str(col): _to_values(series[col]) for col in series.columns}
+
+    if not isinstance(series, dict) or len(series) == 0:
+        raise Exception("series must be a non-empty mapping of labels to values")
+
+    return {str(label): _to_values(values) for label, values in series.items()}
+
+
+def _figsize(figsize) -> Optional[tuple[float, float]]:
+    if figsize is None:
+        return None
+
+    if isinstance(figsize, dict):
+        return check_figsize(**figsize)
+
+    return check_figsize(*figsize)
+
+
+def _logo(logo) -> Optional[dict]:
+    if logo is True:
+        return dict(_DEFAULT_LOGO)
+
+    if logo is False or logo is None:
+        return None
+
+    unknown = set(logo) - set(_DEFAULT_LOGO)
+    if unknown:
+        raise Exception(f"Unknown logo options: {sorted(unknown)}")
+
+    return {**_DEFAULT_LOGO, **logo}
+
+
+def _dpi(dpi) -> float:
+    # a bool is an int, and NaN fails the bounds
+    if (
+        isinstance(dpi, bool)
+        or not isinstance(dpi, (int, float, np.number))
+        or not 0 < dpi <= _MAX_DPI
+    ):
+        raise Exception(f"dpi must be a number greater than 0, at most {_MAX_DPI}")
+
+    return dpi
+
+
+def _normalize_spec(spec: dict) -> dict:
+    """Validates a chart spec, and fills in its defaults.
+
+    The data is converted to NumPy arrays (the dates to int64 nanoseconds
+    for trades, to ``datetime64[ns]`` for line charts), so that equal
+    charts have equal specs, whatever the form of their data.
+    """
+    kind = spec.get("kind")
+    if kind not in CHART_KINDS:
+        raise Exception(
+            f"Chart kind {kind} is not supported. Use one of {list(CHART_KINDS)}."
+        )
+
+    options = _CHART_OPTIONS[kind]
+    common = ("kind", "title", "sources", "logo", "figsize", "format", "dpi")
+    data_keys = {
+        "trade": ("underlying", "pnl"),
+        "line": ("index", "series"),
+        "bar": ("categories", "series"),
+    }[kind]
+
+    unknown = set(spec) - set(common) - set(options) - set(data_keys) - {"filename"}
+    if unknown:
+        raise Exception(f"Unknown options for a {kind} chart: {sorted(unknown)}")
+
+    missing = [key for key in data_keys if key not in spec]
+    if missing:
+        raise Exception(f"Missing data for a {kind} chart: {missing}")
+
+    fmt = spec.get("format", "svg")
+    if fmt not in _FORMATS:
+        raise Exception(f"Format {fmt} is not supported. Use one of {list(_FORMATS)}.")
+
+    normalized = {
+        "kind": kind,
+        "title": spec.get("title", ""),
+        "sources": spec.get("sources", "BSIC"),
+        "logo": _logo(spec.get("logo", True)),
+        "figsize": _figsize(spec.get("figsize")),
+        "format": fmt,
+        "dpi": _dpi(spec.get("dpi", EXPORT_DPI)),
+        **{key: spec.get(key, default) for key, default in options.items()},
+    }
+
+    if kind == "trade":
+        normalized["underlying"] = _timeseries(spec["underlying"], "underlying")
+        normalized["pnl"] = _timeseries(spec["pnl"], "pnl")
+    else:
+        series = _series(spec["series"])
+        if kind == "line":
+            normalized["index"] = _to_index(spec["index"])
+        else:
+            normalized["categories"] = [str(c) for c in spec["categories"]]
+
+        n = len(normalized[data_keys[0]])
+        if any(len(values) != n for values in series.values()):
+            raise Exception(
+                f"All the series must have the same length as {data_keys[0]}"
+            )
+        normalized["series"] = series
+
+    if "filename" in spec:
+        normalized["filename"] = spec["filename"]
+
+    return normalized
+
+
+def _canonical(value):
+    """JSON-serializable form of a (normalized) spec, with the arrays digested."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        return {
+            "dtype": array.dtype.str,
+            "shape": array.shape,
+            "sha256": hashlib.sha256(array.reshape(-1).view(np.uint8)).hexdigest(),
+        }
+
+    if isinstance(value, np.generic):
+        return value.item()
+
+    return value
+
+
+@lru_cache(maxsize=1)
+def _versions() -> dict:
+    """Versions of the packages drawing the charts, hashed with the specs,
+    so that the images cached by other versions are rendered again."""
+    try:
+        version = importlib.metadata.version("mpl_bsic")
+    except importlib.metadata.PackageNotFoundError:
+        # not installed (e.g. run from a checkout of the sources)
+        version = "unknown"
+
+    return {"mpl_bsic": version, "matplotlib": matplotlib.__version__}
+
+
+def _hash_normalized(spec: dict) -> str:
+    hashed = {k: v for k, v in spec.items() if k not in _NOT_HASHED}
+    hashed["versions"] = _versions()
+    if "series" in hashed:
+        # the order of the series changes the colors (and the legend)
+        hashed["series"] = list(hashed["series"].items())
+    payload = json.dumps(_canonical(hashed), sort_keys=True, separators=(",", ":"))
+
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def hash_chart(spec: dict) -> str:
+    """Hash of a chart spec, equal for the specs rendering the same image.
+
+    The spec is normalized first (see ``render_charts``), so the defaults
+    can be omitted or set explicitly, and the data can be lists,
+    NumPy arrays or pandas objects. The ``filename`` is not hashed,
+    but the versions of mpl_bsic and matplotlib are: the hash changes
+    when they are upgraded, as the images may change.
+
+    Parameters
+    ----------
+    spec : dict
+        The chart spec.
+
+    Returns
+    -------
+    str
+        The SHA-256 of the spec, as a hexadecimal string.
+
+    Raises
+    ------
+    Exception
+        If the spec is not valid.
+
+    See Also
+    --------
+    mpl_bsic.render_charts :
+        Render a list of chart specs.
+    """
+    return _hash_normalized(_normalize_spec(spec))
+
+
+@contextmanager
+def _chart_figure(spec: dict) -> Iterator[tuple[Figure, Axes]]:
+    """Styled figure of a line or bar chart, with the logo of the spec."""
+    logo = spec["logo"]
+
+    # the figures of the pool have the default logo, already decoded and scaled
+    if logo is None or logo == _DEFAULT_LOGO:
+        with bsic_figure("single", spec["sources"], logo is not None) as (fig, ax):
+            if spec["figsize"] is not None:
+                fig.set_size_inches(spec["figsize"])
+            yield fig, ax
+        return
+
+    fig = Figure(figsize=spec["figsize"] or FIGURE_TEMPLATES["single"]["figsize"])
+    ax = fig.subplots()
+    apply_bsic_style(fig, ax, spec["sources"], scoped=True)
+    apply_bsic_logo(
+        fig, ax, logo["scale"], logo["location"], logo["type"], logo["alpha"]
+    )
+
+    try:
+        yield fig, ax
+    finally:
+        release_figure(fig)
+
+
+def _draw_line(ax: Axes, spec: dict):
+    index = spec["index"]
+    is_dates = index.dtype.kind == "M"
+    frame = pd.DataFrame(
+        spec["series"],
+        index=pd.DatetimeIndex(index) if is_dates else pd.Index(index),
+    )
+
+    plot_timeseries(ax, frame, spec["decimation"], spec["dpi"])
+    if is_dates:
+        format_timeseries_axis(ax)
+
+
+def _draw_bar(ax: Axes, spec: dict):
+    series = spec["series"]
+    x = np.arange(len(spec["categories"]))
+    width = 0.8 / len(series)
+
+    # the bars of each category are grouped side by side
+    for i, (label, values) in enumerate(series.items()):
+        offset = (i - (len(series) - 1) / 2) * width
+        ax.bar(x + offset, values, width, label=label)
+
+    ax.set_xticks(x, spec["categories"])
+
+
+def _render_spec(spec: dict) -> bytes:
+    """Renders a normalized chart spec to the bytes of its image."""
+    buffer = io.BytesIO()
+
+    if spec["kind"] == "trade":
+        options = {k: spec[k] for k in _TRADE_OPTIONS}
+        pnl_type = options.pop("pnl_type")
+        underlying_name = options.pop("underlying_name")
+
+        trade = plot_trade(
+            (spec["underlying"]["index"], spec["underlying"]["values"]),
+            (spec["pnl"]["index"], spec["pnl"]["values"]),
+            pnl_type,
+            spec["title"],
+            underlying_name,
+            sources=spec["sources"],
+            **options,
+        )
+        try:
+            if spec["figsize"] is not None:
+                trade.fig.set_size_inches(spec["figsize"])
+            _save_figure(trade.fig, buffer, spec["format"], spec["dpi"])
+        finally:
+            release_figure(trade.fig)
+
+        return buffer.getvalue()
+
+    with _chart_figure(spec) as (fig, ax):
+        ax.set_title(spec["title"])
+        ax.set_xlabel(spec["xlabel"])
+        ax.set_ylabel(spec["ylabel"])
+
+        if spec["kind"] == "line":
+            _draw_line(ax, spec)
+        else:
+            _draw_bar(ax, spec)
+
+        if len(spec["series"]) > 1:
+            ax.legend()
+
+        _save_figure(fig, buffer, spec["format"], spec["dpi"])
+
+    return buffer.getvalue()
+
+
+def _write_cached(cache_dir: str, name: str, image: bytes):
+    """Writes an image to the cache, atomically: the processes reading
+    (or writing) the same cache never see a partial image."""
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(image)
+        os.replace(tmp_path, os.path.join(cache_dir, name))
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _render_batch(specs: list[dict]) -> list[bytes]:
+    """Renders a batch of specs, in a worker process."""
+    return [_render_spec(spec) for spec in specs]
+
+
+def _warm_worker():
+    """Sets up a worker process once, so that it renders its first chart fast.
+
+    Besides the fonts, it decodes the logos and renders a tiny chart,
+    which fills the font caches of matplotlib, imports its lazy modules,
+    and creates the figure of the pool reused by the line and bar charts.
+    """
+    _init_worker()
+
+    for logo_type in ("formal", "square"):
+        _load_logo(logo_type)
+
+    spec = {"kind": "line", "index": [0, 1], "series": {"warm-up": [0, 1]}}
+    _render_spec(_normalize_spec({**spec, "format": "png", "dpi": 10}))
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def render_charts(
+    specs: list[dict],
+    n_jobs: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+) -> list[bytes]:
+    """Render charts described by specs (plain data), in batches.
+
+    A chart spec is a dict describing a whole chart: its kind, data,
+    title, sources, logo, figsize and export format. Since specs are plain
+    data (instead of figures or functions drawing them), they are hashed
+    (see ``hash_chart``) to skip the charts already rendered,
+    deduplicated, and shipped cheaply to worker processes,
+    which render them in parallel, in batches.
+
+    The keys of a spec are:
+
+    - ``kind``: "trade" (as ``plot_trade``), "line" (one or more
+      timeseries, as ``plot_timeseries``) or "bar" (grouped bars).
+    - ``title`` and ``sources`` (by default "BSIC").
+    - ``logo`` (line and bar charts): True (the default, on the top left),
+      False, or the options ``location``, ``type``, ``scale`` and ``alpha``
+      of ``apply_bsic_logo``.
+    - ``figsize``: ``[width, height]`` or the parameters of ``check_figsize``
+      (e.g. ``{"width": 7.32, "aspect_ratio": 16 / 9}``), checked with it.
+    - ``format`` ("svg", the default, or "png") and ``dpi`` (by default 1200,
+      at most 2400).
+    - ``filename`` (optional): also export the image to
+      ``filename + "." + format``, as ``export_figure``.
+    - For a trade: ``underlying`` and ``pnl``, each a Series or
+      ``{"index": dates, "values": values}``, and the parameters of
+      ``plot_trade`` (``pnl_type``, ``underlying_name``, ``months_offset``,
+      ``stats``, ...).
+    - For a line chart: ``index`` (dates or numbers) and ``series``
+      (a mapping of labels to values, or a DataFrame),
+      ``xlabel``, ``ylabel`` and ``decimation``.
+    - For a bar chart: ``categories`` and ``series``, ``xlabel`` and ``ylabel``.
+
+    Parameters
+    ----------
+    specs : list[dict]
+        The chart specs.
+    n_jobs : int | None, optional
+        The number of worker processes, by default None (as many as the CPUs,
+        at most one per chart). If 1, the charts are rendered
+        in the current process.
+    cache_dir : str | None, optional
+        A directory where the images are cached by the hash of their spec,
+        by default None (no cache). The charts already in the cache
+        are not rendered again.
+
+    Returns
+    -------
+    list[bytes]
+        The image of each spec, in the same order.
+
+    Raises
+    ------
+    Exception
+        If a spec is not valid (before any chart is rendered).
+
+    See Also
+    --------
+    mpl_bsic.hash_chart :
+        Hash of a chart spec.
+    mpl_bsic.plot_trade :
+        Plot a single trade.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import render_charts
+
+        specs = [
+            {
+                "kind": "line",
+                "title": ticker,
+                "index": prices.index,
+                "series": {ticker: prices[ticker]},
+                "sources": "Bloomberg",
+                "filename": f"charts/{ticker}",
+            }
+            for ticker in prices.columns
+        ]
+        render_charts(specs, cache_dir=".chart_cache")
+    """
+    normalized = [_normalize_spec(spec) for spec in specs]
+    keys = [_hash_normalized(spec) for spec in normalized]
+
+    images: dict[str, bytes] = {}
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        for key, spec in zip(keys, normalized):
+            path = os.path.join(cache_dir, f"{key}.{spec['format']}")
+            if key not in images and os.path.exists(path):
+                with open(path, "rb") as f:
+                    images[key] = f.read()
+
+    # each distinct chart is rendered once
+    todo = {key: spec for key, spec in zip(keys, normalized) if key not in images}
+
+    n_workers = min(n_jobs or os.cpu_count() or 1, len(todo))
+    if n_workers <= 1:
+        with headless():
+            rendered = [_render_spec(spec) for spec in todo.values()]
+    else:
+        # a few batches per worker, to balance the load with little overhead
+        specs_todo = list(todo.values())
+        size = math.ceil(len(specs_todo) / (4 * n_workers))
+        batches = [specs_todo[i : i + size] for i in range(0, len(specs_todo), size)]
+
+        with ProcessPoolExecutor(n_workers, initializer=_init_worker) as pool:
+            rendered = [
+                image for batch in pool.map(_render_batch, batches) for image in batch
+            ]
+
+    for key, spec, image in zip(todo, todo.values(), rendered):
+        images[key] = image
+        if cache_dir is not None:
+            _write_cached(cache_dir, f"{key}.{spec['format']}", image)
+
+    for key, spec in zip(keys, normalized):
+        if "filename" in spec:
+            with open(f"{spec['filename']}.{spec['format']}", "wb") as f:
+                f.write(images[key])
+
+    return [images[key] for key in keys]
@@ -0,0 +1,417 @@
+"""Local chart-rendering service: ``python -m mpl_bsic.serve``.
+
+See ``serve`` for the protocol.
+"""
+
+import argparse
+import io
+import json
+import os
+import socketserver
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import numpy as np
+
+from .render_charts import (
+    CHART_KINDS,
+    _normalize_spec,
+    _ping,
+    _render_spec,
+    _warm_worker,
+)
+
+SPEC_HEADER = "X-Chart-Spec"
+"""Header holding the JSON spec of a chart sent with binary data."""
+
+_CONTENT_TYPES = {"svg": "image/svg+xml", "png": "image/png"}
+"""Content types of the formats the charts are rendered in."""
+
+_NPZ_TYPE = "application/x-npz"
+_ARROW_TYPE = "application/vnd.apache.arrow.stream"
+
+
+class _Busy(Exception):
+    """Raised when too many charts are already waiting for a worker."""
+
+
+def _import_pyarrow():
+    """Imports pyarrow, an optional dependency (only for Arrow payloads)."""
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise Exception(
+            "Arrow payloads require pyarrow. "
+            'Install it with "pip install mpl_bsic[parquet]", or send NumPy data.'
+        ) from e
+
+    return pa
+
+
+def _labelled(spec: dict, values: np.ndarray) -> dict:
+    """Series of a line or bar chart, from the columns of a 2D array."""
+    if values.ndim == 1:
+        values = values[:, None]
+    labels = spec.get("labels", [str(i) for i in range(values.shape[1])])
+
+    if len(labels) != values.shape[1]:
+        raise Exception("labels must have one label per column of values")
+
+    return dict(zip(labels, values.T))
+
+
+def _npz_data(kind: str, spec: dict, body: bytes) -> dict:
+    """Data of a chart sent as a NumPy ``.npz`` archive."""
+    with np.load(io.BytesIO(body), allow_pickle=False) as npz:
+        arrays = dict(npz)
+
+    try:
+        if kind == "trade":
+            return {
+                name: {
+                    "index": arrays[f"{name}_index"],
+                    "values": arrays[f"{name}_values"],
+                }
+                for name in ("underlying", "pnl")
+            }
+
+        data = {"series": _labelled(spec, arrays["values"])}
+        if kind == "line":
+            data["index"] = arrays["index"]
+    except KeyError as e:
+        raise Exception(f"Missing array in the archive: {e}") from e
+
+    return data
+
+
+def _arrow_data(kind: str, spec: dict, body: bytes) -> dict:
+    """Data of a chart sent as an Arrow IPC stream (a table with an ``index``)."""
+    pa = _import_pyarrow()
+    table = pa.ipc.open_stream(body).read_all()
+
+    if "index" not in table.column_names:
+        raise Exception('The Arrow table must have an "index" column')
+
+    frame = table.to_pandas()
+    index = frame.pop("index").to_numpy()
+
+    if kind == "trade":
+        return {
+            name: {"index": index, "values": frame[name].to_numpy()}
+            for name in ("underlying", "pnl")
+        }
+
+    # the index of a bar chart holds its categories
+    return {"index" if kind == "line" else "categories": index, "series": frame}
+
+
+def _parse_request(kind: str, content_type: str, headers, body: bytes) -> dict:
+    """Chart spec of a request, validated before it reaches a worker."""
+    if kind not in CHART_KINDS:
+        raise Exception(f"Unknown chart kind. Supported are {', '.join(CHART_KINDS)}.")
+
+    try:
+        if content_type == "application/json":
+            spec = json.loads(body)
+        else:
+            spec = json.loads(headers.get(SPEC_HEADER, "{}"))
+    except json.JSONDecodeError as e:
+        raise Exception(f"Invalid JSON spec: {e}") from e
+
+    if not isinstance(spec, dict):
+        raise Exception("The spec must be a JSON object")
+
+    if "filename" in spec:
+        raise Exception("filename is not supported: the image is the response")
+
+    if content_type == _NPZ_TYPE:
+        spec = {**spec, **_npz_data(kind, spec, body)}
+    elif content_type == _ARROW_TYPE:
+        spec = {**spec, **_arrow_data(kind, spec, body)}
+    elif content_type != "application/json":
+        raise Exception(
+            f"Content type is not supported. "
+            f"Supported are application/json, {_NPZ_TYPE} and {_ARROW_TYPE}."
+        )
+    spec.pop("labels", None)
+
+    return _normalize_spec({**spec, "kind": kind})
+
+
+class _Renderer:
+    """Pool of warm worker processes, with a bounded number of pending charts."""
+
+    def __init__(
+        self, workers: Optional[int] = None, max_pending: Optional[int] = None
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 4 * self.workers
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._pool = self._start_pool()
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+
+        # the workers are started (and warmed up) now, not on the first requests
+        for future in [pool.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+
+        return pool
+
+    def render(self, spec: dict) -> bytes:
+        if not self._slots.acquire(blocking=False):
+            raise _Busy()
+
+        try:
+            pool = self._pool
+            try:
+                return pool.submit(_render_spec, spec).result()
+            except BrokenProcessPool:
+                # a worker died (e.g. out of memory): the next charts get a new pool
+                with self._lock:
+                    if self._pool is pool:
+                        self._pool = self._start_pool()
+                raise
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        self._pool.shutdown(cancel_futures=True)
+
+
+class _ChartHandler(BaseHTTPRequestHandler):
+    server_version = "mpl_bsic"
+
+    def address_string(self) -> str:
+        # the clients of a Unix socket have no address
+        if isinstance(self.client_address, tuple):
+            return super().address_string()
+
+        return "unix"
+
+    def _reply(self, status: int, body: bytes, content_type: str, headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _reply_json(self, status: int, payload: dict, headers=()):
+        body = json.dumps(payload).encode()
+        self._reply(status, body, "application/json", headers)
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._reply_json(404, {"error": "Not found"})
+
+        renderer: _Renderer = self.server.renderer
+        self._reply_json(
+            200,
+            {
+                "status": "ok",
+                "workers": renderer.workers,
+                "max_pending": renderer.max_pending,
+            },
+        )
+
+    def do_POST(self):
+        length = self.headers.get("Content-Length")
+        if length is None:
+            return self._reply_json(411, {"error": "Content-Length is required"})
+
+        try:
+            length = int(length)
+        except ValueError:
+            length = -1
+        if length < 0:
+            return self._reply_json(400, {"error": "Invalid Content-Length"})
+
+        body = self.rfile.read(length)
+        content_type = self.headers.get("Content-Type", "application/json")
+        kind = self.path.strip("/")
+
+        # the errors of the request are the client's, those of the rendering ours
+        try:
+            spec = _parse_request(
+                kind, content_type.split(";")[0].strip(), self.headers, body
+            )
+        except Exception as e:
+            return self._reply_json(400, {"error": str(e)})
+
+        try:
+            image = self.server.renderer.render(spec)
+        except _Busy:
+            return self._reply_json(
+                503, {"error": "Too many pending charts"}, [("Retry-After", "1")]
+            )
+        except BrokenProcessPool:
+            return self._reply_json(500, {"error": "The worker rendering it died"})
+        except Exception as e:
+            return self._reply_json(500, {"error": f"The chart failed to render: {e}"})
+
+        self._reply(200, image, _CONTENT_TYPES[spec["format"]])
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _make_server(
+    host: str = "127.0.0.1",
+    port: int = 8050,
+    socket_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+):
+    """Creates the server (and starts its workers), without serving yet."""
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = _UnixHTTPServer(socket_path, _ChartHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), _ChartHandler)
+
+    try:
+        server.renderer = _Renderer(workers, max_pending)
+    except BaseException:
+        server.server_close()
+        raise
+
+    return server
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8050,
+    socket_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+):
+    """Serve BSIC charts over HTTP (or a Unix socket), from warm workers.
+
+    Starting Python, importing matplotlib, registering the BSIC fonts
+    and decoding the logos takes seconds, more than drawing most charts.
+    This runs a local service whose worker processes do it once, when it
+    starts, so that notebooks and dashboards get each chart in milliseconds
+    instead of spawning a new Python per chart.
+    It only uses the standard library (and the dependencies of mpl_bsic).
+
+    Charts are requested with ``POST /trade``, ``POST /line`` or ``POST /bar``,
+    and the response is the SVG (or PNG) image. The body is the chart spec
+    (as in ``render_charts``, without ``kind``, given by the path,
+    and ``filename``), with the data either inline or in a binary body:
+
+    - ``application/json``: the body is the spec, with the data inline
+      (the dates as ISO strings, or int64 nanoseconds).
+    - ``application/x-npz``: the body is a NumPy ``.npz`` archive
+      (``np.savez``), and the spec is in the ``X-Chart-Spec`` header.
+      A trade has the arrays ``underlying_index``, ``underlying_values``,
+      ``pnl_index`` and ``pnl_values`` (the indexes as ``datetime64[ns]``
+      or int64 nanoseconds). A line or bar chart has ``values``
+      (one column per series, labelled by ``labels`` in the spec),
+      and a line chart also ``index``.
+    - ``application/vnd.apache.arrow.stream``: the body is an Arrow IPC
+      stream of a table with an ``index`` column, and the spec is in the
+      ``X-Chart-Spec`` header. A trade has the ``underlying`` and ``pnl``
+      columns, a line or bar chart one column per series (and the categories
+      of a bar chart in ``index``). Requires pyarrow.
+
+    Invalid requests get a 400 response, with the error in a JSON body
+    (and the charts failing to render a 500 response),
+    and ``GET /health`` returns the number of workers. If more than
+    ``max_pending`` charts are waiting, new requests are refused at once
+    (503, with ``Retry-After``) instead of queueing without bound.
+
+    It can also be started from the command line, e.g.
+    ``python -m mpl_bsic.serve --port 8050 --workers 4``
+    or ``python -m mpl_bsic.serve --socket /tmp/mpl_bsic.sock``.
+
+    Parameters
+    ----------
+    host : str, optional
+        The host to listen on, by default "127.0.0.1" (local requests only).
+    port : int, optional
+        The port to listen on, by default 8050.
+    socket_path : str | None, optional
+        The path of a Unix socket to listen on instead of a TCP port,
+        by default None. An existing file at the path is replaced.
+    workers : int | None, optional
+        The number of worker processes, by default None (as many as the CPUs).
+    max_pending : int | None, optional
+        The maximum number of charts rendering or waiting for a worker,
+        by default None (4 per worker).
+
+    See Also
+    --------
+    mpl_bsic.render_charts :
+        Render a list of chart specs, in batches.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        import io
+        import urllib.request
+
+        import numpy as np
+
+        buffer = io.BytesIO()
+        np.savez(buffer, index=prices.index.to_numpy(), values=prices.to_numpy())
+
+        request = urllib.request.Request(
+            "http://127.0.0.1:8050/line",
+            data=buffer.getvalue(),
+            headers={
+                "Content-Type": "application/x-npz",
+                "X-Chart-Spec": '{"title": "EURUSD", "labels": ["EURUSD"]}',
+            },
+        )
+        svg = urllib.request.urlopen(request).read()
+    """
+    server = _make_server(host, port, socket_path, workers, max_pending)
+    address = socket_path or f"http://{host}:{server.server_address[1]}"
+    print(
+        f"Serving BSIC charts on {address} ({server.renderer.workers} workers)",
+        file=sys.stderr,
+    )
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.renderer.shutdown()
+        if socket_path is not None and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m mpl_bsic.serve",
+        description="Serve BSIC charts over HTTP (or a Unix socket), "
+        "from warm worker processes.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8050)
+    parser.add_argument("--socket", help="Path of a Unix socket to listen on.")
+    parser.add_argument("--workers", type=int, help="By default, one per CPU.")
+    parser.add_argument(
+        "--max-pending", type=int, help="By default, 4 charts per worker."
+    )
+    args = parser.parse_args(argv)
+
+    serve(args.host, args.port, args.socket, args.workers, args.max_pending)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,8 @@ from typing import Optional, Union
 import pandas as pd
 import xlsxwriter
 
+from .profiling import _phase
+
 TITLE_FMT = {
     "bold": True,
     "italic": True,
@@ -132,8 +134,10 @@ def _format_worksheet(
         title_format = wb.add_format(TITLE_FMT)
         ws.merge_range(start_row, start_col, start_row, end_col, title, title_format)
 
-    _write_index(df)
-    _write_data(df, "BSIC")
+    with _phase("_write_index"):
+        _write_index(df)
+    with _phase("_write_data"):
+        _write_data(df, "BSIC")
 
     ws.hide_gridlines(2)
 
@@ -0,0 +1,180 @@
+from typing import Literal, Optional
+
+import numpy as np
+import pandas as pd
+
+_NS_PER_YEAR = 365.25 * 86_400 * 10**9
+
+STATS_LABELS = {
+    "max_drawdown": "Max drawdown",
+    "time_under_water": "Time under water",
+    "hit_rate": "Hit rate",
+    "sharpe": "Sharpe",
+    "volatility": "Volatility",
+}
+"""Names of the statistics computed by ``trade_stats``, as displayed in the plots."""
+
+
+def _trade_stats(
+    times: np.ndarray,
+    pnl: np.ndarray,
+    cumulative: bool,
+    periods_per_year: Optional[float] = None,
+) -> dict:
+    """Statistics of a PnL, from the entry of the trade.
+
+    ``times`` are the dates as ``int64`` nanoseconds, and ``pnl`` contains
+    no NaN. Each statistic is computed with a single vectorised pass.
+    """
+    if len(pnl) < 2:
+        raise Exception("At least two PnL values are needed to compute the stats")
+
+    if cumulative:
+        equity = pnl
+        returns = np.diff(pnl)
+    else:
+        equity = np.cumsum(pnl)
+        returns = pnl
+
+    # drawdown from the running peak of the cumulative PnL
+    drawdown = equity - np.maximum.accumulate(equity)
+
+    # time since the last peak (the first value is always a peak)
+    last_peak = np.maximum.accumulate(np.where(drawdown == 0, times, times[0]))
+    time_under_water = int((times - last_peak).max())
+
+    if periods_per_year is None:
+        span = times[-1] - times[0]
+        # no time elapsed (all the values at the same date): nothing to annualise
+        periods_per_year = (len(times) - 1) / (span / _NS_PER_YEAR) if span else np.nan
+
+    mean, std = returns.mean(), returns.std(ddof=1)
+    traded = returns[returns != 0]
+
+    # a constant PnL has no risk, and no Sharpe ratio
+    sharpe = mean / std * np.sqrt(periods_per_year) if std > 0 else np.nan
+
+    return {
+        "max_drawdown": float(drawdown.min()),
+        "time_under_water": pd.Timedelta(time_under_water, unit="ns"),
+        "hit_rate": float((traded > 0).mean()) if len(traded) > 0 else np.nan,
+        "sharpe": float(sharpe),
+        "volatility": float(std * np.sqrt(periods_per_year)),
+    }
+
+
+def _format_stats(stats: dict) -> str:
+    """Formats the statistics, one per line."""
+    values = {
+        "max_drawdown": f"{stats['max_drawdown']:,.2f}",
+        "time_under_water": f"{stats['time_under_water'].days} days",
+        "hit_rate": f"{stats['hit_rate']:.0%}",
+        "sharpe": f"{stats['sharpe']:.2f}",
+        "volatility": f"{stats['volatility']:,.2f}",
+    }
+    # the statistics which cannot be computed (e.g. the Sharpe of a constant PnL)
+    values = {
+        key: "n/a" if key != "time_under_water" and np.isnan(stats[key]) else value
+        for key, value in values.items()
+    }
+
+    return "\n".join(f"{STATS_LABELS[key]}: {value}" for key, value in values.items())
+
+
+def trade_stats(
+    pnl: pd.Series,
+    pnl_type: Literal["nominal", "cumulative"],
+    periods_per_year: Optional[float] = None,
+) -> dict:
+    """Compute the statistics of a trade.
+
+    The statistics are computed from the entry of the trade
+    (the first non-NaN value of the PnL), with a single vectorised pass
+    over the values of the series (no copies of the series are made).
+    These are the same statistics displayed by ``plot_trade(..., stats=True)``.
+
+    Parameters
+    ----------
+    pnl : pd.Series
+        Pandas series of the pnl of the trade, with a sorted ``DatetimeIndex``.
+        Missing values after the entry are considered as no PnL
+        (i.e. 0 if nominal, or the previous value if cumulative).
+    pnl_type : Literal['nominal', 'cumulative']
+        Whether the PnL is nominal (the PnL of each period)
+        or cumulative, as in ``plot_trade``.
+    periods_per_year : float | None, optional
+        The number of periods per year, used to annualise the Sharpe ratio
+        and the volatility, by default None.
+        If None, it is inferred from the dates (e.g. ~252 for daily data).
+
+    Returns
+    -------
+    dict
+        The statistics of the trade:
+
+        * ``max_drawdown``: the maximum drawdown of the cumulative PnL
+          (a negative number, in the units of the PnL);
+        * ``time_under_water``: the longest time spent below
+          the previous peak of the cumulative PnL, as a ``pd.Timedelta``;
+        * ``hit_rate``: the fraction of periods with a positive PnL,
+          among the periods with a non-zero PnL;
+        * ``sharpe``: the annualised Sharpe ratio of the PnL of each period;
+        * ``volatility``: the annualised volatility of the PnL of each period.
+
+        The statistics which are not defined are NaN: the hit rate
+        if the PnL never changes, the Sharpe ratio if its volatility is 0,
+        and both the Sharpe ratio and the volatility if all the values
+        are at the same date (and ``periods_per_year`` is not given).
+
+    Raises
+    ------
+    Exception
+        If the index of the PnL is not a sorted ``DatetimeIndex``,
+        or if there are less than two PnL values from the entry.
+    Exception
+        If the pnl type is not supported.
+
+    See Also
+    --------
+    mpl_bsic.plot_trade :
+        Plot a trade, with its statistics.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from mpl_bsic import trade_stats
+
+        stats = trade_stats(pnl, "nominal")
+        print(stats["sharpe"], stats["max_drawdown"])
+    """
+    if not isinstance(pnl.index, pd.DatetimeIndex):
+        raise Exception("Index of PnL must be a DatetimeIndex")
+
+    if not pnl.index.is_monotonic_increasing:
+        raise Exception("Index of PnL must be sorted")
+
+    if pnl_type not in ("nominal", "cumulative"):
+        raise Exception(
+            'pnl type is not supported. Supported are "nominal" and "cumulative".'
+        )
+
+    values = pnl.to_numpy(np.float64)
+    missing = np.isnan(values)
+    entry = int(np.argmin(missing)) if not missing.all() else len(values)
+
+    values, missing = values[entry:], missing[entry:]
+    if missing.any():
+        if pnl_type == "cumulative":
+            # the cumulative PnL does not change when missing
+            last_valid = np.where(missing, 0, np.arange(len(values)))
+            values = values[np.maximum.accumulate(last_valid)]
+        else:
+            values = np.where(missing, 0.0, values)
+
+    return _trade_stats(
+        pnl.index.as_unit("ns").asi8[entry:],
+        values,
+        pnl_type == "cumulative",
+        periods_per_year,
+    )
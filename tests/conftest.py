@@ -1,6 +1,35 @@
 """Path hack to make tests work."""
 
+import json
 import os
 import sys
 
 sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../")
+
+from tools import RENDER_TIMES  # noqa: E402
+
+
+def pytest_sessionstart(session):
+    # the render times are recorded anew by each run (not by each parallel worker)
+    if not hasattr(session.config, "workerinput") and os.path.exists(RENDER_TIMES):
+        os.remove(RENDER_TIMES)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not os.path.exists(RENDER_TIMES):
+        return
+
+    with open(RENDER_TIMES) as f:
+        events = [json.loads(line) for line in f]
+
+    slowest = sorted(events, key=lambda e: -e["render"])[:5]
+    terminalreporter.section("image comparisons")
+    terminalreporter.write_line(
+        f"{len(events)} images, {sum(e['render'] for e in events):.2f}s rendering, "
+        f"{sum(e['compare'] for e in events):.2f}s comparing "
+        f"({sum(e['stage'] == 'exact' for e in events)} identical to the baseline)"
+    )
+    for event in slowest:
+        terminalreporter.write_line(
+            f"{event['render'] * 1000:8.1f}ms  {event['test']} ({event['stage']})"
+        )
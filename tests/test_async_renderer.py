@@ -0,0 +1,222 @@
+import asyncio
+import threading
+import time
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from mpl_bsic import (
+    AsyncRenderer,
+    df_to_excel_async,
+    export_figure_async,
+    headless,
+    plot_trade,
+)
+
+
+def _gen_trade():
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range("2022-01-03", periods=300)
+
+    underlying = pd.Series(100 + rng.standard_normal(300).cumsum(), index)
+    pnl = pd.Series(rng.standard_normal(300), index)
+    pnl.iloc[:250] = np.nan
+
+    return underlying, pnl
+
+
+def _line_spec():
+    return {
+        "kind": "line",
+        "title": "Prices",
+        "index": [1, 2, 3],
+        "series": {"a": [1, 3, 2]},
+        "format": "png",
+        "dpi": 50,
+    }
+
+
+class TestAsyncRenderer:
+    def test_processes(self, tmp_path):
+        async def main():
+            async with AsyncRenderer(processes=2) as renderer:
+                ticks = 0
+
+                async def heartbeat():
+                    nonlocal ticks
+                    while True:
+                        ticks += 1
+                        await asyncio.sleep(0.01)
+
+                beating = asyncio.create_task(heartbeat())
+                images = await asyncio.gather(
+                    renderer.plot_trade(
+                        *_gen_trade(),
+                        "cumulative",
+                        "Trade",
+                        "Underlying",
+                        dpi=50,
+                        filename=str(tmp_path / "trade"),
+                    ),
+                    renderer.render(_line_spec()),
+                )
+                beating.cancel()
+
+                with pytest.raises(Exception, match="Unknown options"):
+                    await renderer.render({**_line_spec(), "colour": "red"})
+
+            return images, ticks
+
+        (trade, line), ticks = asyncio.run(main())
+
+        assert trade.startswith(b"<?xml")
+        assert (tmp_path / "trade.svg").read_bytes() == trade
+        assert line.startswith(b"\x89PNG")
+        # the loop kept running while the charts were rendered
+        assert ticks > 10
+
+    def test_threads(self, tmp_path):
+        df = pd.DataFrame({"a": [1.0, 2.0], "b": [3.0, 4.0]})
+
+        async def main():
+            with headless():
+                trade = plot_trade(*_gen_trade(), "nominal", "Trade", "Underlying")
+
+            await asyncio.gather(
+                export_figure_async(trade.fig, str(tmp_path / "trade"), release=True),
+                df_to_excel_async(df, str(tmp_path / "table.xlsx"), "Table"),
+            )
+
+        asyncio.run(main())
+
+        assert (tmp_path / "trade.svg").exists()
+        assert (tmp_path / "table.xlsx").exists()
+
+    def test_headless_only(self, tmp_path):
+        trade = plot_trade(*_gen_trade(), "nominal", "Trade", "Underlying")
+
+        # managed by pyplot, which is not thread-safe
+        with pytest.raises(Exception, match="Only headless figures"):
+            asyncio.run(export_figure_async(trade.fig, str(tmp_path / "trade")))
+
+        assert not (tmp_path / "trade.svg").exists()
+        plt.close(trade.fig)
+
+    def test_back_pressure(self):
+        renderer = AsyncRenderer(threads=1, max_pending=1, max_waiting=1)
+        lane = renderer._threads
+        blocked = threading.Event()
+        done = []
+
+        def job(name):
+            blocked.wait(5)
+            done.append(name)
+
+        async def main():
+            first = asyncio.create_task(lane.run(job, "first"))
+            await asyncio.sleep(0)
+            second = asyncio.create_task(lane.run(job, "second"))
+            await asyncio.sleep(0)
+
+            # one job submitted, one task waiting: the next one is refused
+            assert lane._waiting[asyncio.get_running_loop()] == 1
+            with pytest.raises(Exception, match="Too many jobs are waiting"):
+                await lane.run(job, "third")
+
+            blocked.set()
+            await asyncio.gather(first, second)
+
+        try:
+            asyncio.run(main())
+        finally:
+            blocked.set()
+            renderer.shutdown()
+
+        assert done == ["first", "second"]
+
+    def test_waiting_per_loop(self):
+        renderer = AsyncRenderer(threads=2, max_pending=1, max_waiting=1)
+        lane = renderer._threads
+        blocked = threading.Event()
+        both_waiting = threading.Barrier(2, timeout=5)
+        both_checked = threading.Barrier(3, timeout=5)  # and the main thread
+        errors = []
+
+        def job():
+            blocked.wait(5)
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            first = asyncio.create_task(lane.run(job))
+            await asyncio.sleep(0)
+            second = asyncio.create_task(lane.run(job))
+            await asyncio.sleep(0)
+
+            # each loop has one task waiting, within its own max_waiting
+            await loop.run_in_executor(None, both_waiting.wait)
+            assert lane._waiting[loop] == 1
+            await loop.run_in_executor(None, both_checked.wait)
+            await asyncio.gather(first, second)
+
+        def run_loop():
+            try:
+                asyncio.run(main())
+            except BaseException as e:
+                errors.append(e)
+                both_waiting.abort()
+                both_checked.abort()
+
+        threads = [threading.Thread(target=run_loop) for _ in range(2)]
+        try:
+            for thread in threads:
+                thread.start()
+            both_checked.wait()
+        finally:
+            blocked.set()
+            for thread in threads:
+                thread.join(10)
+            renderer.shutdown()
+
+        assert errors == []
+
+    def test_cancel(self):
+        renderer = AsyncRenderer(threads=1, max_pending=2)
+        lane = renderer._threads
+        blocked = threading.Event()
+        done = []
+
+        def job(name):
+            blocked.wait(5)
+            done.append(name)
+
+        async def main():
+            running = asyncio.create_task(lane.run(job, "running"))
+            queued = asyncio.create_task(lane.run(job, "queued"))
+            waiting = asyncio.create_task(lane.run(job, "waiting"))
+            await asyncio.sleep(0.05)
+
+            for task in (running, queued, waiting):
+                task.cancel()
+            await asyncio.gather(running, queued, waiting, return_exceptions=True)
+
+            # the running job keeps its slot until it is done
+            slots = lane._slots[asyncio.get_running_loop()]
+            assert slots._value == 1
+
+            blocked.set()
+            await lane.run(job, "next")
+            start = time.perf_counter()
+            while slots._value < 2 and time.perf_counter() - start < 5:
+                await asyncio.sleep(0.01)
+            assert slots._value == 2
+
+        try:
+            asyncio.run(main())
+        finally:
+            blocked.set()
+            renderer.shutdown()
+
+        # the queued and waiting jobs never ran
+        assert done == ["running", "next"]
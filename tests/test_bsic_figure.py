@@ -0,0 +1,117 @@
+import io
+
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+from mpl_bsic import FigurePool, bsic_figure
+from mpl_bsic.apply_bsic_style import BSIC_COLORS, DEFAULT_TITLE_STYLE
+from utils.run_animations import run_animations
+
+
+def _export(fig: Figure):
+    run_animations(fig)
+    fig.savefig(io.BytesIO(), format="png", dpi=50)
+
+
+class TestFigurePool:
+    def test_reuse(self):
+        pool = FigurePool()
+
+        with pool.figure("trade") as (fig, axs):
+            axs[0].plot(pd.date_range("2023-01-02", periods=10), np.arange(10))
+            axs[1].set_yscale("log")
+            axs[0].set_title("Trade")
+            axs[0].twinx()
+            fig.suptitle("Title")
+            _export(fig)
+
+        with pool.figure("trade") as (reused, reused_axs):
+            assert reused is fig
+            assert len(reused.axes) == 2
+            assert len(reused_axs[0].get_lines()) == 0
+            assert reused_axs[0].get_title() == ""
+            assert reused.get_suptitle() == ""
+            assert reused_axs[0].xaxis.converter is None
+            assert reused_axs[1].get_yscale() == "linear"
+
+            # autoscaling works again on the shared axes
+            line = reused_axs[0].plot([1, 2], [3, 4])[0]
+            assert reused_axs[1].get_xlim() == (0.95, 2.05)
+            assert line.get_color() == BSIC_COLORS[0]
+
+    def test_reuse_date_charts(self):
+        pool = FigurePool()
+        first = pd.date_range("2020-01-01", periods=10)
+        second = pd.date_range("2023-06-01", periods=30)
+
+        with pool.figure("single") as (fig, ax):
+            ax.plot(first, np.arange(10))
+            _export(fig)
+
+        with pool.figure("single") as (reused, ax):
+            assert reused is fig
+            # the units are not kept as if set by the user: the dates set them again
+            assert not getattr(ax.xaxis, "_converter_is_explicit", False)
+            ax.plot(second, np.arange(30))
+            _export(reused)
+
+            assert ax.xaxis.converter is not None
+            x0, x1 = mdates.num2date(ax.get_xlim())
+            assert x0.year == x1.year == 2023
+            labels = [t.get_text() for t in ax.get_xticklabels()]
+            assert labels and all(label.startswith("2023") for label in labels)
+
+    def test_styled(self):
+        pool = FigurePool()
+
+        with pool.figure("single", sources=["Bloomberg"]) as (fig, ax):
+            ax.plot([1, 2], [3, 4])
+            ax.set_title("Single")
+            fig.suptitle("Title")
+            _export(fig)
+
+            assert ax.title.get_fontname() == DEFAULT_TITLE_STYLE["fontname"]
+            assert ax.title.get_fontsize() == DEFAULT_TITLE_STYLE["fontsize"]
+            assert fig._suptitle.get_fontweight() == DEFAULT_TITLE_STYLE["fontweight"]
+            assert any(t.get_text() == "Sources: BSIC, Bloomberg" for t in fig.texts)
+            # the logo is moved to the top left corner of the chart
+            assert len(ax.artists) == 1
+            x0, x1 = ax.get_xbound()
+            assert ax.artists[0].xy[0] == x0 + (x1 - x0) / 50
+
+        with pool.figure("single", logo=False) as (reused, ax):
+            assert any(t.get_text() == "Source: BSIC" for t in reused.texts)
+            assert not ax.artists[0].get_visible()
+
+    def test_bounded(self):
+        pool = FigurePool(max_size=2)
+
+        acquired = [pool.acquire("grid") for _ in range(3)]
+        assert acquired[0][1].shape == (2, 2)
+        for fig, _ in acquired:
+            pool.release(fig)
+
+        assert len(pool._idle["grid"]) == 2
+
+    def test_invalid_layout(self):
+        try:
+            FigurePool().acquire("square")  # type: ignore
+        except Exception as e:
+            assert "Layout square is not supported" in str(e)
+
+    def test_release_other_figure(self):
+        try:
+            FigurePool().release(Figure())
+        except Exception as e:
+            assert "not created by a FigurePool" in str(e)
+
+
+class TestBsicFigure:
+    def test_default_pool(self):
+        with bsic_figure("trade") as (fig, axs):
+            axs[0].plot([1, 2], [3, 4])
+
+        with bsic_figure("trade") as (reused, _):
+            assert reused is fig
@@ -0,0 +1,93 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from mpl_bsic import decimate, plot_timeseries
+
+
+def _gen_data(n: int = 1_000_000):
+    rng = np.random.default_rng(0)
+    x = np.arange(n)
+    y = rng.standard_normal(n).cumsum()
+
+    return x, y
+
+
+class TestMinMax:
+    def test_keeps_extremes(self):
+        x, y = _gen_data()
+
+        x_dec, y_dec = decimate(x, y, n_pixels=1000)
+
+        assert len(x_dec) <= 4 * 1000
+        assert y_dec.max() == y.max() and y_dec.min() == y.min()
+        assert x_dec[0] == x[0] and x_dec[-1] == x[-1]
+        assert np.all(np.diff(x_dec) > 0)
+
+    def test_datetime_index(self):
+        x, y = _gen_data()
+        dates = pd.date_range("2000-01-01", periods=len(x), freq="s").to_numpy()
+
+        x_dec, y_dec = decimate(dates, y, n_pixels=1000)
+
+        assert x_dec.dtype == dates.dtype
+        assert y_dec.max() == y.max() and y_dec.min() == y.min()
+
+    def test_ignores_nans(self):
+        x, y = _gen_data()
+        y[1000:50_000] = np.nan
+
+        _, y_dec = decimate(x, y, n_pixels=1000)
+
+        assert np.nanmax(y_dec) == np.nanmax(y) and np.nanmin(y_dec) == np.nanmin(y)
+
+    def test_short_series_unchanged(self):
+        x, y = _gen_data(100)
+
+        x_dec, y_dec = decimate(x, y)
+
+        assert np.array_equal(x_dec, x) and np.array_equal(y_dec, y)
+
+
+class TestLTTB:
+    def test_number_of_points(self):
+        x, y = _gen_data()
+
+        x_dec, _ = decimate(x, y, method="lttb", n_pixels=1000)
+
+        assert len(x_dec) == 1000
+        assert x_dec[0] == x[0] and x_dec[-1] == x[-1]
+        assert np.all(np.diff(x_dec) > 0)
+
+    def test_keeps_spike(self):
+        x, y = _gen_data()
+        y[500_000] = 1e6
+
+        _, y_dec = decimate(x, y, method="lttb", n_pixels=1000)
+
+        assert y_dec.max() == 1e6
+
+    def test_invalid_method(self):
+        x, y = _gen_data()
+
+        try:
+            decimate(x, y, method="invalid")  # type: ignore
+        except Exception as e:
+            assert "decimation method not supported" in str(e)
+
+
+class TestPlotTimeseries:
+    def test_decimates_lines(self):
+        x, y = _gen_data()
+        data = pd.DataFrame(
+            {"a": y, "b": -y}, index=pd.date_range("2000", periods=len(x), freq="s")
+        )
+
+        fig, ax = plt.subplots(1, 1)
+        lines = plot_timeseries(ax, data)
+
+        assert len(lines) == 2
+        assert all(len(line.get_xdata()) < len(x) for line in lines)
+        assert [line.get_label() for line in lines] == ["a", "b"]
+
+        plt.close(fig)
@@ -0,0 +1,168 @@
+import matplotlib.dates as mdates
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib.axes import Axes
+
+from mpl_bsic import dates_to_num, format_timeseries_axis
+from mpl_bsic.format_timeseries_axis import MAX_TICKS
+
+
+def _gen_data():
+    dates = pd.bdate_range("2023-01-02", "2023-12-29")
+    prices = pd.Series(np.linspace(100, 110, len(dates)), index=dates)
+
+    return prices
+
+
+class TestBusinessTime:
+    def test_ticks_on_period_starts(self):
+        prices = _gen_data()
+
+        fig, ax = plt.subplots(1, 1)
+        ax: Axes
+        ax.plot(np.arange(len(prices)), prices.values)
+        format_timeseries_axis(ax, "M", 1, "%Y-%m-%d", business_index=prices.index)
+
+        ticks = ax.xaxis.get_major_locator()()
+        tick_dates = prices.index[ticks]
+
+        # a tick on the first business day of each month
+        assert len(ticks) == 12
+        assert list(tick_dates.month) == list(range(1, 13))
+        assert tick_dates[3] == pd.Timestamp("2023-04-03")  # 1st is a Saturday
+
+        plt.close(fig)
+
+    def test_tick_labels(self):
+        prices = _gen_data()
+
+        fig, ax = plt.subplots(1, 1)
+        ax: Axes
+        ax.plot(np.arange(len(prices)), prices.values)
+        format_timeseries_axis(ax, "M", 3, "%Y-%m-%d", business_index=prices.index)
+
+        formatter = ax.xaxis.get_major_formatter()
+        ticks = ax.xaxis.get_major_locator()()
+        labels = formatter.format_ticks(ticks)
+
+        assert labels == ["2023-01-02", "2023-04-03", "2023-07-03", "2023-10-02"]
+        assert formatter(-1) == "" and formatter(len(prices)) == ""
+
+        plt.close(fig)
+
+    def test_no_weekend_gaps(self):
+        prices = _gen_data()
+
+        fig, ax = plt.subplots(1, 1)
+        ax: Axes
+        ax.plot(np.arange(len(prices)), prices.values)
+        format_timeseries_axis(ax, "W", 1, "%Y-%m-%d", business_index=prices.index)
+
+        ticks = ax.xaxis.get_major_locator()()
+        labels = ax.xaxis.get_major_formatter().format_ticks(ticks)
+        tick_dates = prices.index[np.asarray(ticks, dtype=int)]
+
+        # ticks on business positions: a week is 5 positions, but 7 days apart
+        assert np.all(np.asarray(ticks) == np.round(ticks))
+        assert np.all(np.diff(ticks) == 5)
+        assert np.all(np.diff(tick_dates) == pd.Timedelta(days=7))
+        assert labels == [d.strftime("%Y-%m-%d") for d in tick_dates]
+        assert all(pd.Timestamp(label).dayofweek == 0 for label in labels)
+
+        # a Friday is followed by the Monday, with no weekend in between
+        friday = int(np.flatnonzero(prices.index.dayofweek == 4)[0])
+        formatter = ax.xaxis.get_major_formatter()
+        next_day = pd.Timestamp(formatter(friday + 1)) - pd.Timestamp(formatter(friday))
+        assert next_day == pd.Timedelta(days=3)
+
+        plt.close(fig)
+
+    def test_invalid_time_unit(self):
+        prices = _gen_data()
+        fig, ax = plt.subplots(1, 1)
+
+        with pytest.raises(Exception, match="this time frequency is not supported"):
+            format_timeseries_axis(
+                ax, "S", 1, business_index=prices.index  # type: ignore
+            )
+
+        plt.close(fig)
+
+
+class TestAutoTicks:
+    def test_bounded_ticks_long_series(self):
+        dates = pd.date_range("2010-01-01", "2020-01-01", freq="D")
+
+        fig, ax = plt.subplots(1, 1)
+        ax: Axes
+        ax.plot(dates, np.arange(len(dates)))
+        format_timeseries_axis(ax)
+
+        ticks = ax.xaxis.get_major_locator()()
+
+        assert 2 <= len(ticks) <= MAX_TICKS
+        assert ax.xaxis.get_major_locator().time_unit == "Y"
+
+        plt.close(fig)
+
+    def test_bounded_ticks_fixed_unit(self):
+        """Only the unit is given, the frequency is chosen automatically"""
+        dates = pd.date_range("2010-01-01", "2020-01-01", freq="D")
+
+        fig, ax = plt.subplots(1, 1)
+        ax: Axes
+        ax.plot(dates, np.arange(len(dates)))
+        format_timeseries_axis(ax, "D")
+
+        ticks = ax.xaxis.get_major_locator()()
+
+        assert len(ticks) <= MAX_TICKS
+
+        plt.close(fig)
+
+    def test_short_series(self):
+        dates = pd.date_range("2023-01-01", "2023-01-10", freq="D")
+
+        fig, ax = plt.subplots(1, 1)
+        ax: Axes
+        ax.plot(dates, np.arange(len(dates)))
+        format_timeseries_axis(ax)
+
+        ticks = ax.xaxis.get_major_locator()()
+
+        assert ax.xaxis.get_major_locator().time_unit == "D"
+        assert len(ticks) <= MAX_TICKS
+
+        plt.close(fig)
+
+    def test_business_time(self):
+        prices = _gen_data()
+
+        fig, ax = plt.subplots(1, 1)
+        ax: Axes
+        ax.plot(np.arange(len(prices)), prices.values)
+        format_timeseries_axis(ax, business_index=prices.index)
+
+        ticks = ax.xaxis.get_major_locator()()
+        labels = ax.xaxis.get_major_formatter().format_ticks(ticks)
+
+        assert 2 <= len(ticks) <= MAX_TICKS
+        assert all(label != "" for label in labels)
+
+        plt.close(fig)
+
+
+class TestDatesToNum:
+    def test_matches_date2num(self):
+        dates = pd.date_range("2023-01-01", periods=100, freq="37h", tz="US/Eastern")
+
+        assert np.allclose(dates_to_num(dates), mdates.date2num(dates))
+
+    def test_nat(self):
+        dates = pd.DatetimeIndex(["2023-01-01", None])
+
+        nums = dates_to_num(dates)
+
+        assert nums[0] == mdates.date2num(dates[0]) and np.isnan(nums[1])
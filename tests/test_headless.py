@@ -0,0 +1,98 @@
+import gc
+import os
+import subprocess
+import sys
+import weakref
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.offsetbox import AnnotationBbox
+
+from mpl_bsic import export_figure, headless, plot_trade, plot_trades
+from mpl_bsic.headless import HEADLESS_ENV, _is_headless
+
+
+def _gen_trade():
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range("2022-01-03", periods=300)
+
+    underlying = pd.Series(100 + rng.standard_normal(300).cumsum(), index)
+    pnl = pd.Series(rng.standard_normal(300), index)
+    pnl.iloc[:250] = np.nan
+
+    return underlying, pnl
+
+
+class TestHeadless:
+    def test_plot_trade(self, tmp_path):
+        open_before = plt.get_fignums()
+
+        with headless():
+            trade = plot_trade(*_gen_trade(), "nominal", "Trade", "Underlying")
+            fig = trade.fig
+
+            assert plt.get_fignums() == open_before
+            assert isinstance(fig.canvas, FigureCanvasAgg)
+            assert fig.canvas.manager is None
+
+            export_figure(fig, str(tmp_path / "trade"))
+
+        assert not _is_headless()
+        assert (tmp_path / "trade.svg").exists()
+        # the deferred style (and logo) was applied, and nothing is left to run
+        assert any(isinstance(a, AnnotationBbox) for a in trade[1][0].artists)
+        assert not hasattr(fig, "_bsic_animations")
+        fig.canvas.draw()
+
+        # freed without closing it
+        ref = weakref.ref(fig)
+        del trade, fig
+        gc.collect()
+        assert ref() is None
+
+    def test_grid(self):
+        underlying, pnl = _gen_trade()
+        open_before = plt.get_fignums()
+
+        with headless():
+            ((fig, axes),) = plot_trades(
+                pd.concat([underlying, underlying * 2], axis=1),
+                pd.concat([pnl, pnl], axis=1),
+                "cumulative",
+                layout="grid",
+            )
+
+        assert fig.canvas.manager is None
+        assert plt.get_fignums() == open_before
+        assert len(axes) == 2
+
+    def test_env(self, tmp_path):
+        code = (
+            "import matplotlib, numpy as np, pandas as pd;"
+            "import matplotlib.pyplot as plt;"
+            "from mpl_bsic import export_figure, plot_trade;"
+            "index = pd.bdate_range('2022-01-03', periods=100);"
+            "underlying = pd.Series(np.arange(100.0), index);"
+            "pnl = pd.Series(np.r_[[np.nan] * 80, np.ones(20)], index);"
+            "trade = plot_trade(underlying, pnl, 'nominal', 'Trade', 'U');"
+            f"export_figure(trade.fig, {str(tmp_path / 'trade')!r});"
+            "print(matplotlib.rcParams._get_backend_or_none(), plt.get_fignums())"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+        env = {**os.environ, HEADLESS_ENV: "1", "PYTHONPATH": root}
+        env.pop("MPLBACKEND", None)
+
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            capture_output=True,
+            text=True,
+            cwd=root,
+            env=env,
+        )
+
+        # no backend was ever selected, and no figure registered in pyplot
+        assert result.stdout.splitlines()[-1] == "None []"
+        assert (tmp_path / "trade.svg").exists()
@@ -0,0 +1,74 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mpl_bsic import load_dataframe
+
+
+def _gen_data():
+    dates = pd.bdate_range("2022-01-03", "2023-12-29")
+    rng = np.random.default_rng(0)
+
+    return pd.DataFrame(
+        {
+            "Date": dates,
+            "Underlying": 100 + rng.standard_normal(len(dates)).cumsum(),
+            "PnL": rng.standard_normal(len(dates)),
+            "Other": rng.standard_normal(len(dates)),
+        }
+    )
+
+
+class TestLoadDataframe:
+    def test_projection_and_filter(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        pa = pytest.importorskip("pyarrow")
+        df = _gen_data()
+        path = str(tmp_path / "trade.parquet")
+        pq.write_table(
+            pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=50
+        )
+
+        result = load_dataframe(
+            path, columns=["underlying", "PNL"], start_date="2023-09-01"
+        )
+
+        expected = df.set_index("Date").loc["2023-09-01":, ["Underlying", "PnL"]]
+        assert list(result.columns) == ["underlying", "pnl"]
+        assert result.index.name == "date"
+        assert np.array_equal(result.index, expected.index)
+        assert np.allclose(result.to_numpy(), expected.to_numpy())
+
+    def test_arrow_string_dates(self, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        feather = pytest.importorskip("pyarrow.feather")
+        df = _gen_data()
+        df["Date"] = df["Date"].dt.strftime("%m/%d/%Y")
+        path = str(tmp_path / "trade.arrow")
+        feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), path)
+
+        result = load_dataframe(path, end_date="2022-03-31", downcast=True)
+
+        assert result.index[-1] == pd.Timestamp("2022-03-31")
+        assert (result.dtypes == np.float32).all()
+
+    def test_missing_columns(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        pa = pytest.importorskip("pyarrow")
+        path = str(tmp_path / "trade.parquet")
+        pq.write_table(pa.Table.from_pandas(_gen_data(), preserve_index=False), path)
+
+        try:
+            load_dataframe(path, columns=["pnl", "delta"])
+        except Exception as e:
+            assert "['delta'] are not in the file" in str(e)
+
+    def test_without_pyarrow(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+        try:
+            load_dataframe("trade.parquet")
+        except Exception as e:
+            assert "mpl_bsic[parquet]" in str(e)
@@ -4,6 +4,7 @@ from matplotlib.axes import Axes
 from tools import baseline_save_fig, image_compare  # noqa
 
 from mpl_bsic import apply_bsic_logo, apply_bsic_style
+from mpl_bsic.apply_bsic_logo import _logo_imagebox
 
 
 def _gen_data():
@@ -267,3 +268,14 @@ class TestLogoBtmRight:
         apply_bsic_style(fig, ax)
 
         return fig
+
+
+class TestLogoMemory:
+    def test_shared_image(self):
+        """All the logos share the image normalized for drawing"""
+        boxes = [_logo_imagebox("formal", 0.03, alpha) for alpha in (1, 0.5)]
+        arrays = [box.image.get_array() for box in boxes]
+
+        assert arrays[0] is arrays[1]
+        assert not arrays[0].flags.writeable
+        assert boxes[1].get_data().shape == arrays[0].shape
@@ -0,0 +1,537 @@
+import importlib
+
+import matplotlib.dates as mdates
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib.figure import Figure
+
+from mpl_bsic import plot_trade
+from mpl_bsic.plot_trade import (
+    _first_breaches,
+    _first_valid_position,
+    _get_dates,
+    _plot_levels,
+    _pnl_paths,
+    _preprocess_arrays,
+    _preprocess_data,
+)
+
+# the module, shadowed by the function in the package
+plot_trade_module = importlib.import_module("mpl_bsic.plot_trade")
+
+
+def _gen_data(n: int = 20_000):
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2023-01-02", periods=n, freq="10min")
+
+    underlying = pd.Series(100 + rng.standard_normal(n).cumsum() * 0.01, dates)
+    pnl = pd.Series(rng.standard_normal(n), dates)
+    pnl.iloc[: n // 2] = np.nan
+
+    return underlying, pnl
+
+
+def _new_ticks(last_date: pd.Timestamp, values: list[float]):
+    dates = pd.date_range(last_date, periods=len(values) + 1, freq="10min")[1:]
+
+    return pd.Series(values, dates)
+
+
+def _area(path) -> float:
+    """Total area of the polygons of a compound path (shoelace formula)."""
+    return sum(
+        abs(np.dot(p[:, 0], np.roll(p[:, 1], 1)) - np.dot(p[:, 1], np.roll(p[:, 0], 1)))
+        / 2
+        for p in path.to_polygons()
+    )
+
+
+class TestPnlAreas:
+    def test_zero_crossings(self):
+        x = np.array([0.0, 1.0, 2.0, 3.0])
+        y = np.array([1.0, -1.0, 1.0, -1.0])
+
+        profit, loss = _pnl_paths(x, y)
+
+        assert len(profit.to_polygons()) == 2 and len(loss.to_polygons()) == 2
+        assert np.isclose(_area(profit), 0.75) and np.isclose(_area(loss), 0.75)
+
+    def test_matches_integral(self):
+        rng = np.random.default_rng(0)
+        x = np.arange(1000.0)
+        y = rng.standard_normal(len(x)).cumsum()
+
+        profit, loss = _pnl_paths(x, y)
+
+        # integral of the positive and negative parts of the interpolated PnL
+        fine_x = np.linspace(0, 999, 10_000_001)
+        fine_y = np.interp(fine_x, x, y)
+        step = fine_x[1] - fine_x[0]
+
+        assert np.isclose(_area(profit), np.maximum(fine_y, 0).sum() * step, rtol=1e-3)
+        assert np.isclose(_area(loss), -np.minimum(fine_y, 0).sum() * step, rtol=1e-3)
+
+
+def _reference_window(underlying, pnl, start_date, end_date, pnl_type):
+    """The window of the trade, computed on the whole history with .loc."""
+    if pnl_type == "cumulative":
+        pnl = pnl.loc[:end_date].cumsum()
+
+    return underlying.loc[start_date:end_date], pnl.loc[start_date:end_date]
+
+
+class TestPreprocess:
+    def test_leading_nan_pnl(self):
+        values = np.full(5_000, np.nan)
+
+        for position in [0, 999, 1_000, 2_500, 4_999]:
+            values[:] = np.nan
+            values[position:] = 1.0
+            assert _first_valid_position(values, chunk_size=1_000) == position
+
+        underlying, pnl = _gen_data()
+        start_date, end_date, entry_date = _get_dates(underlying, pnl, 3)
+        assert entry_date == pnl.first_valid_index()
+
+        for pnl_type in ["nominal", "cumulative"]:
+            result = _preprocess_data(
+                underlying, pnl, start_date, end_date, entry_date, pnl_type
+            )
+            expected = _reference_window(
+                underlying, pnl, start_date, end_date, pnl_type
+            )
+
+            pd.testing.assert_series_equal(result[0], expected[0])
+            pd.testing.assert_series_equal(result[1], expected[1])
+            # no PnL before the entry
+            assert result[1].loc[: entry_date - pd.Timedelta("1min")].isna().all()
+
+    def test_all_nan_pnl(self):
+        assert _first_valid_position(np.full(100, np.nan), chunk_size=7) is None
+        assert _first_valid_position(np.array([])) is None
+
+        underlying, pnl = _gen_data()
+        pnl[:] = np.nan
+
+        with pytest.raises(Exception, match="entry date"):
+            plot_trade(underlying, pnl, "nominal", "Trade", "Underlying")
+
+        with pytest.raises(Exception, match="entry date"):
+            plot_trade(
+                (underlying.index.asi8, underlying.to_numpy()),
+                (pnl.index.asi8, pnl.to_numpy()),
+                "nominal",
+                "Trade",
+                "Underlying",
+            )
+
+    def test_entry_not_on_underlying_index(self):
+        rng = np.random.default_rng(0)
+        business_days = pd.bdate_range("2023-01-02", "2023-12-29")
+        underlying = pd.Series(
+            100 + rng.standard_normal(len(business_days)).cumsum(), business_days
+        )
+
+        # the PnL is daily, weekends included, and the trade starts on a Saturday
+        days = pd.date_range("2023-01-01", "2023-12-31")
+        pnl = pd.Series(rng.standard_normal(len(days)), days)
+
+        for entry in ["2023-03-04", "2023-11-04"]:  # before and in the window
+            entry_pnl = pnl.where(pnl.index >= entry)
+            start_date, end_date, entry_date = _get_dates(underlying, entry_pnl, 3)
+            assert entry_date == pd.Timestamp(entry)
+            assert entry_date not in underlying.index
+
+            for pnl_type in ["nominal", "cumulative"]:
+                expected = _reference_window(
+                    underlying, entry_pnl, start_date, end_date, pnl_type
+                )
+                result = _preprocess_data(
+                    underlying, entry_pnl, start_date, end_date, entry_date, pnl_type
+                )
+                arrays = _preprocess_arrays(
+                    (underlying.index.asi8, underlying.to_numpy()),
+                    (entry_pnl.index.asi8, entry_pnl.to_numpy()),
+                    start_date,
+                    end_date,
+                    entry_date,
+                    pnl_type,
+                )
+
+                for series in [result, arrays]:
+                    pd.testing.assert_series_equal(
+                        series[0], expected[0], check_freq=False
+                    )
+                    pd.testing.assert_series_equal(
+                        series[1], expected[1], check_freq=False
+                    )
+
+    def test_entry_through_plot_trade(self):
+        rng = np.random.default_rng(0)
+        business_days = pd.bdate_range("2023-01-02", "2023-12-29")
+        underlying = pd.Series(
+            100 + rng.standard_normal(len(business_days)).cumsum(), business_days
+        )
+        days = pd.date_range("2023-01-01", "2023-12-31")
+        pnl = pd.Series(rng.standard_normal(len(days)), days)
+
+        # on a Saturday, before and in the window
+        for entry, in_window in [("2023-03-04", False), ("2023-11-04", True)]:
+            entry_pnl = pnl.where(pnl.index >= entry)
+            inputs = [
+                (underlying, entry_pnl),
+                (
+                    (underlying.index.asi8, underlying.to_numpy()),
+                    (entry_pnl.index.asi8, entry_pnl.to_numpy()),
+                ),
+            ]
+
+            for pnl_type in ["nominal", "cumulative"]:
+                start_date, end_date, _ = _get_dates(underlying, entry_pnl, 3)
+                expected = _reference_window(
+                    underlying, entry_pnl, start_date, end_date, pnl_type
+                )
+
+                for trade_underlying, trade_pnl in inputs:
+                    trade = plot_trade(
+                        trade_underlying,
+                        trade_pnl,
+                        pnl_type,
+                        "Trade",
+                        "Underlying",
+                        decimation=None,
+                    )
+
+                    pnl_line = trade.axs[0].get_lines()[0]
+                    assert np.allclose(pnl_line.get_ydata(), expected[1].fillna(0))
+
+                    markers = trade.axs[1].collections
+                    if in_window:
+                        # at the price of the Friday before the entry
+                        friday = underlying.loc["2023-11-03"]
+                        ((x, y),) = markers[0].get_offsets()
+                        assert x == mdates.date2num(pd.Timestamp(entry))
+                        assert np.isclose(y, friday * 1.075)
+                    else:
+                        assert len(markers) == 0
+
+                    plt.close(trade.fig)
+
+    def test_entry_before_window(self):
+        underlying, pnl = _gen_data()
+        # the trade is entered before the window
+        pnl.iloc[5_000] = 1.0
+        start_date, end_date, _ = _get_dates(underlying, pnl, 3)
+        expected = _reference_window(
+            underlying, pnl, start_date, end_date, "cumulative"
+        )
+
+        for trade_underlying, trade_pnl in [
+            (underlying, pnl),
+            (
+                (underlying.index.asi8, underlying.to_numpy()),
+                (pnl.index.asi8, pnl.to_numpy()),
+            ),
+        ]:
+            trade = plot_trade(
+                trade_underlying,
+                trade_pnl,
+                "cumulative",
+                "Trade",
+                "Underlying",
+                decimation=None,
+                stats=True,
+            )
+
+            pnl_line = trade.axs[0].get_lines()[0]
+            assert np.allclose(pnl_line.get_ydata(), expected[1].fillna(0))
+            assert len(trade.axs[1].collections) == 0
+
+            plt.close(trade.fig)
+
+
+def _brute_force_breaches(prices: np.ndarray, levels: np.ndarray) -> list[int]:
+    first = []
+    for level in levels:
+        valid = np.flatnonzero(~np.isnan(level))
+        if len(valid) == 0:
+            first.append(-1)
+            continue
+
+        # the side is the one of the first value of the level
+        below = level[valid[0]] <= prices[valid[0]]
+        breached = level >= prices if below else level <= prices
+        first.append(int(np.argmax(breached)) if breached.any() else -1)
+
+    return first
+
+
+class TestLevels:
+    def test_constant_levels(self):
+        underlying, _ = _gen_data()
+        prices = underlying.to_numpy()
+        levels = prices[0] + np.linspace(-3, 3, 101)
+        matrix = np.broadcast_to(levels[:, None], (len(levels), len(prices)))
+
+        first = _first_breaches(prices, matrix, constant=True)
+
+        assert list(first) == _brute_force_breaches(prices, matrix)
+        assert (first == -1).any() and (first > 0).any()
+
+    def test_trailing_levels(self):
+        underlying, _ = _gen_data()
+        prices = underlying.to_numpy()
+        distances = np.linspace(0.1, 2, 50)
+        trailing = np.maximum.accumulate(prices)[None, :] - distances[:, None]
+
+        first = _first_breaches(prices, trailing, constant=False)
+
+        assert list(first) == _brute_force_breaches(prices, trailing)
+
+    def test_levels_set_after_entry(self, monkeypatch):
+        underlying, _ = _gen_data()
+        prices = underlying.to_numpy()
+        distances = np.linspace(0.1, 2, 50)
+        trailing = np.maximum.accumulate(prices)[None, :] - distances[:, None]
+        # short trades: the levels trail above the price
+        trailing[25:] = np.minimum.accumulate(prices) + distances[25:, None]
+
+        # the levels are set later and later, the last one never
+        for i, start in enumerate(np.linspace(0, len(prices), 50).astype(int)):
+            trailing[i, :start] = np.nan
+
+        # small chunks, so that levels are set in different chunks
+        monkeypatch.setattr(plot_trade_module, "_BREACH_CHUNK", 50 * 1_000)
+        first = _first_breaches(prices, trailing, constant=False)
+
+        assert list(first) == _brute_force_breaches(prices, trailing)
+        assert (first[1:25] > 0).any() and (first[26:-1] > 0).any()
+        assert first[-1] == -1
+
+    def test_empty_window(self):
+        underlying, pnl = _gen_data()
+        for constant in [True, False]:
+            first = _first_breaches(np.array([]), np.empty((2, 0)), constant)
+            assert list(first) == [-1, -1]
+
+        # entered after the last price: nothing drawn, nor breached
+        fig, ax = plt.subplots()
+        breaches = _plot_levels(
+            ax,
+            underlying,
+            underlying.index[-1] + pd.Timedelta("1D"),
+            underlying.cummax() - 0.5,
+            [101.0, 102.0],
+            "minmax",
+        )
+
+        assert list(breaches["type"]) == ["stop_loss"] + ["take_profit"] * 2
+        assert breaches["breach_date"].isna().all()
+        assert len(ax.collections) == 0
+
+        plt.close(fig)
+
+    def test_breaches(self):
+        underlying, pnl = _gen_data()
+        entry_price = underlying[pnl.first_valid_index()]
+        trailing = underlying.cummax() - 0.5
+
+        trade = plot_trade(
+            underlying,
+            pnl,
+            "nominal",
+            "Trade",
+            "Underlying",
+            stop_loss=trailing,
+            take_profit=[entry_price + 1, entry_price + 1e3],
+        )
+        breaches = trade.breaches
+
+        assert list(breaches["type"]) == ["stop_loss"] + ["take_profit"] * 2
+        assert breaches["breach_date"].notna().tolist() == [True, True, False]
+        assert breaches["breach_date"].min() >= pnl.first_valid_index()
+
+        plt.close(trade.fig)
+
+
+class TestLiveUpdate:
+    def test_unpacks_as_tuple(self):
+        underlying, pnl = _gen_data()
+
+        fig, axs = plot_trade(underlying, pnl, "cumulative", "Trade", "Underlying")
+
+        assert isinstance(fig, Figure) and len(axs) == 2
+
+        plt.close(fig)
+
+    def test_appends_ticks(self):
+        underlying, pnl = _gen_data()
+        trade = plot_trade(underlying, pnl, "cumulative", "Trade", "Underlying")
+        pnl_line, underlying_line = (ax.get_lines()[0] for ax in trade.axs)
+        last_pnl = pnl_line.get_ydata()[-1]
+        n_points = len(underlying_line.get_xdata())
+
+        # the first tick is not after the last date, so it is ignored
+        stale = pd.Series([1e6], [underlying.index[-1]])
+        trade.update(
+            pd.concat([stale, _new_ticks(underlying.index[-1], [50.0, 51.0])]),
+            _new_ticks(pnl.index[-1], [1.0, np.nan, 2.0]),
+        )
+
+        assert len(underlying_line.get_xdata()) == n_points + 2
+        assert underlying_line.get_ydata()[-1] == 51.0
+        assert np.allclose(pnl_line.get_ydata()[-3:], [last_pnl + 1, 0, last_pnl + 3])
+        assert [t.get_text() for t in trade.axs[1].texts] == ["51"]
+
+        plt.close(trade.fig)
+
+    def test_blitting_matches_full_redraw(self):
+        underlying, pnl = _gen_data()
+        trade = plot_trade(underlying, pnl, "nominal", "Trade", "Underlying")
+        trade.fig.canvas.draw()
+
+        rng = np.random.default_rng(1)
+        last_date = underlying.index[-1]
+        for _ in range(20):
+            underlying_ticks = _new_ticks(
+                last_date, 100 + rng.standard_normal(5) * 0.01
+            )
+            pnl_ticks = _new_ticks(last_date, rng.standard_normal(5) * 0.1)
+            trade.update(underlying_ticks, pnl_ticks)
+            last_date = underlying_ticks.index[-1]
+
+        blitted = np.asarray(trade.fig.canvas.buffer_rgba(), dtype=float)
+        trade.fig.canvas.draw()
+        redrawn = np.asarray(trade.fig.canvas.buffer_rgba(), dtype=float)
+
+        assert np.sqrt(((blitted - redrawn) ** 2).mean()) < 5
+
+        plt.close(trade.fig)
+
+    def test_bounded_areas(self, monkeypatch):
+        # a small pixel budget, so that the line is decimated after a few updates
+        n_pixels = 200
+        monkeypatch.setattr(
+            plot_trade_module, "_axis_pixel_budget", lambda ax: n_pixels
+        )
+
+        underlying, pnl = _gen_data()
+        trade = plot_trade(underlying, pnl, "nominal", "Trade", "Underlying")
+        pnl_line = trade.axs[0].get_lines()[0]
+        areas = trade.axs[0].collections[-1]
+
+        rng = np.random.default_rng(1)
+        last_date = pnl.index[-1]
+        for _ in range(300):
+            ticks = _new_ticks(last_date, rng.standard_normal(50))
+            trade.update(new_pnl_ticks=ticks)
+            last_date = ticks.index[-1]
+
+            n_vertices = sum(len(path.vertices) for path in areas.get_paths())
+            assert n_vertices <= 4 * len(pnl_line.get_xdata()) + 8
+
+        # the line was decimated, and the areas with it
+        assert len(pnl_line.get_xdata()) <= 8 * n_pixels
+        assert n_vertices <= 32 * n_pixels + 8
+
+        # the areas still shade the line
+        profit, loss = _pnl_paths(*pnl_line.get_data())
+        assert np.isclose(_area(areas.get_paths()[0]), _area(profit), rtol=0.05)
+        assert np.isclose(_area(areas.get_paths()[1]), _area(loss), rtol=0.05)
+
+        plt.close(trade.fig)
+
+
+def _to_memmap(path, values: np.ndarray) -> np.memmap:
+    mm = np.memmap(path, dtype=values.dtype, mode="w+", shape=values.shape)
+    mm[:] = values
+    mm.flush()
+
+    return np.memmap(path, dtype=values.dtype, mode="r", shape=values.shape)
+
+
+class TestArrayInputs:
+    def test_memmap_matches_series(self, tmp_path):
+        underlying, pnl = _gen_data()
+        underlying_arrays = (
+            _to_memmap(tmp_path / "times", underlying.index.asi8),
+            _to_memmap(tmp_path / "prices", underlying.to_numpy()),
+        )
+        pnl_arrays = (underlying_arrays[0], _to_memmap(tmp_path / "pnl", pnl.values))
+
+        for pnl_type in ["nominal", "cumulative"]:
+            expected = plot_trade(
+                underlying, pnl, pnl_type, "Trade", "Underlying", decimation=None
+            )
+            trade = plot_trade(
+                underlying_arrays,
+                pnl_arrays,
+                pnl_type,
+                "Trade",
+                "Underlying",
+                decimation=None,
+            )
+
+            for ax, expected_ax in zip(trade.axs, expected.axs):
+                line, expected_line = ax.get_lines()[0], expected_ax.get_lines()[0]
+                assert np.array_equal(line.get_xdata(), expected_line.get_xdata())
+                assert np.allclose(line.get_ydata(), expected_line.get_ydata())
+
+            plt.close(trade.fig)
+            plt.close(expected.fig)
+
+    def test_cumulative_before_window(self):
+        underlying, pnl = _gen_data()
+        # the trade is entered before the window
+        pnl.iloc[5_000] = 1.0
+        start_date, end_date, entry_date = _get_dates(underlying, pnl, 3)
+
+        expected = _preprocess_data(
+            underlying, pnl, start_date, end_date, entry_date, "cumulative"
+        )
+        result = _preprocess_arrays(
+            (underlying.index.asi8, underlying.to_numpy()),
+            (pnl.index.asi8, pnl.to_numpy()),
+            start_date,
+            end_date,
+            entry_date,
+            "cumulative",
+        )
+
+        pd.testing.assert_series_equal(result[0], expected[0], check_freq=False)
+        pd.testing.assert_series_equal(result[1], expected[1], check_freq=False)
+
+    def test_level_arrays(self):
+        underlying, pnl = _gen_data()
+        times, prices = underlying.index.asi8, underlying.to_numpy()
+        levels = np.stack([prices - 0.5, prices + 0.5])
+
+        trade = plot_trade(
+            (times, prices),
+            (times, pnl.to_numpy()),
+            "nominal",
+            "Trade",
+            "Underlying",
+            stop_loss=levels,
+        )
+
+        assert len(trade.breaches) == 2
+        assert trade.breaches["breach_date"].isna().all()
+
+        plt.close(trade.fig)
+
+    def test_mixed_inputs(self):
+        underlying, pnl = _gen_data()
+
+        try:
+            plot_trade(
+                underlying,
+                (pnl.index.asi8, pnl.to_numpy()),
+                "nominal",
+                "Trade",
+                "Underlying",
+            )
+        except Exception as e:
+            assert "must be both Series" in str(e)
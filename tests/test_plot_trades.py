@@ -0,0 +1,138 @@
+import os
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from mpl_bsic import headless, plot_trades
+from mpl_bsic.plot_trade import _get_dates, _preprocess_data
+from mpl_bsic.plot_trades import MAX_GRID_HEIGHT, _prepare_trades
+
+
+def _gen_data(n_trades: int = 4):
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2022-01-03", "2023-12-29")
+
+    underlyings = pd.DataFrame(
+        100 + rng.standard_normal((len(dates), n_trades)).cumsum(axis=0),
+        index=dates,
+        columns=[f"UND{i}" for i in range(n_trades)],
+    )
+    pnls = pd.DataFrame(
+        rng.standard_normal((len(dates), n_trades)),
+        index=dates,
+        columns=[f"Trade {i}" for i in range(n_trades)],
+    )
+
+    # trades are entered, and underlyings stop, at different dates
+    for i in range(n_trades):
+        pnls.iloc[: len(dates) - 50 + 5 * i, i] = np.nan
+        underlyings.iloc[len(dates) - 10 * i :, i] = np.nan
+
+    return underlyings, pnls
+
+
+class TestPrepareTrades:
+    def test_matches_plot_trade(self):
+        underlyings, pnls = _gen_data()
+
+        for pnl_type in ["nominal", "cumulative"]:
+            trades = _prepare_trades(underlyings, pnls, pnl_type, 3)
+
+            for i, (underlying, pnl, entry_date) in enumerate(trades):
+                und, pnl_i = underlyings.iloc[:, i].dropna(), pnls.iloc[:, i]
+                start, end, entry = _get_dates(und, pnl_i, 3)
+                exp_und, exp_pnl = _preprocess_data(
+                    und, pnl_i, start, end, entry, pnl_type
+                )
+
+                assert entry_date == entry
+                pd.testing.assert_series_equal(underlying, exp_und)
+                pd.testing.assert_series_equal(pnl, exp_pnl)
+
+    def test_different_columns(self):
+        underlyings, pnls = _gen_data()
+
+        try:
+            _prepare_trades(underlyings, pnls.iloc[:, :2], "nominal", 3)
+        except Exception as e:
+            assert "same number of columns" in str(e)
+
+
+class TestPlotTrades:
+    def test_grid(self):
+        underlyings, pnls = _gen_data(3)
+
+        ((fig, axes),) = plot_trades(underlyings, pnls, "cumulative", layout="grid")
+
+        assert len(axes) == 3
+        titles = [axs[0].get_figure().get_suptitle() for axs in axes]
+        assert titles == list(pnls.columns)
+
+        plt.close(fig)
+
+    def test_grid_pages(self):
+        underlyings, pnls = _gen_data(4)
+        n_trades = 150
+        underlyings = pd.concat([underlyings] * 38, axis=1).iloc[:, :n_trades]
+        pnls = pd.concat([pnls] * 38, axis=1).iloc[:, :n_trades]
+        underlyings.columns = [f"UND{i}" for i in range(n_trades)]
+        pnls.columns = [f"Trade {i}" for i in range(n_trades)]
+
+        with headless():
+            pages = plot_trades(underlyings, pnls, "nominal", layout="grid")
+
+        # 2 rows of 2 trades per page, so each page fits in a Word page
+        assert len(pages) == 38
+        assert all(len(axes) == 4 for _, axes in pages[:-1])
+        assert len(pages[-1][1]) == 2
+        heights = [fig.get_size_inches()[1] for fig, _ in pages]
+        assert max(heights) <= MAX_GRID_HEIGHT
+        assert heights[-1] < heights[0]  # the last page has a single row
+
+        titles = [
+            axs[0].get_figure().get_suptitle() for _, axes in pages for axs in axes
+        ]
+        assert titles == list(pnls.columns)
+
+        pages = plot_trades(
+            underlyings.iloc[:, :9],
+            pnls.iloc[:, :9],
+            "nominal",
+            layout="grid",
+            ncols=3,
+            rows_per_page=1,
+        )
+        assert [len(axes) for _, axes in pages] == [3, 3, 3]
+        for fig, _ in pages:
+            plt.close(fig)
+
+    def test_old_entry(self, tmp_path):
+        underlyings, pnls = _gen_data(2)
+        # an open trade, entered long before the 3 months plotted
+        pnls.iloc[:, 0] = np.random.default_rng(1).standard_normal(len(pnls))
+        assert pnls.iloc[:, 0].first_valid_index() == pd.Timestamp("2022-01-03")
+
+        ((fig, axes),) = plot_trades(underlyings, pnls, "cumulative", layout="grid")
+
+        # the entry marker is only drawn for the trade entered in the window
+        assert [len(axs[1].collections) for axs in axes] == [0, 1]
+        plt.close(fig)
+
+        files = plot_trades(
+            underlyings, pnls, "cumulative", output_dir=str(tmp_path), n_jobs=1
+        )
+        assert all(os.path.exists(f) for f in files)
+
+    def test_export(self, tmp_path):
+        underlyings, pnls = _gen_data(2)
+
+        files = plot_trades(
+            underlyings, pnls, "nominal", output_dir=str(tmp_path), n_jobs=1
+        )
+
+        assert [os.path.basename(f) for f in files] == [
+            "000_Trade_0.svg",
+            "001_Trade_1.svg",
+        ]
+        assert all(os.path.exists(f) for f in files)
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from mpl_bsic import preprocess_dataframe
+
+DATA_PATH = "tests/data/usyieldsdata.csv"
+
+
+def _gen_data():
+    df = pd.read_csv(DATA_PATH)
+    df["Ticker"] = np.where(np.arange(len(df)) % 2 == 0, "UST", "TIPS")
+
+    return df
+
+
+class TestPreprocessDataframe:
+    def test_inplace(self):
+        df = _gen_data()
+
+        assert preprocess_dataframe(df) is None
+        assert list(df.columns) == ["us10y", "us30y", "us02y", "ticker"]
+        assert df.index.name == "date"
+        assert df.index[0] == pd.Timestamp("2021-08-04")
+
+    def test_new_frame(self):
+        df = _gen_data()
+        expected = df.copy()
+        preprocess_dataframe(expected)
+
+        result = preprocess_dataframe(df, inplace=False)
+
+        pd.testing.assert_frame_equal(result, expected)
+        # the input is unchanged, and its columns are not copied
+        assert "Date" in df.columns
+        assert np.shares_memory(result["us10y"].to_numpy(), df["US10Y"].to_numpy())
+
+    def test_downcast_and_categorical(self):
+        df = _gen_data()
+
+        result = preprocess_dataframe(
+            df, downcast=True, categorical_threshold=0.1, inplace=False
+        )
+
+        assert (result.dtypes.iloc[:3] == np.float32).all()
+        assert isinstance(result["ticker"].dtype, pd.CategoricalDtype)
+        assert np.allclose(result["us10y"], df["US10Y"])
+
+    def test_chunks(self):
+        expected = preprocess_dataframe(
+            _gen_data(), downcast=True, categorical_threshold=0.1, inplace=False
+        )
+
+        # the tickers are UST in the first chunk, and TIPS in the second
+        df = _gen_data().sort_values("Ticker", ascending=False, kind="stable")
+        chunks = (df.iloc[i : i + 100] for i in range(0, len(df), 100))
+        result = preprocess_dataframe(
+            chunks,
+            date_format="%m/%d/%Y",
+            downcast=True,
+            categorical_threshold=0.1,
+            inplace=False,
+        )
+
+        assert isinstance(result["ticker"].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(
+            result.sort_index(),
+            expected,
+            check_categorical=False,
+        )
+
+    def test_chunks_inplace(self):
+        chunks = pd.read_csv(DATA_PATH, chunksize=100)
+
+        try:
+            preprocess_dataframe(chunks)
+        except Exception as e:
+            assert "inplace=False" in str(e)
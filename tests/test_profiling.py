@@ -0,0 +1,97 @@
+import json
+import os
+import subprocess
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from mpl_bsic import apply_bsic_style, df_to_excel, export_figure, profiling
+from mpl_bsic.profiling import _PROFILES, PROFILE_ENV
+
+
+def _gen_figure(n_axes: int = 1):
+    x = np.linspace(0, 5, 100)
+
+    fig, axs = plt.subplots(1, n_axes)
+    for ax in np.ravel(axs):
+        ax.plot(x, np.sin(x))
+        ax.set_title("Sin(x)")
+
+    return fig, axs
+
+
+class TestProfiling:
+    def test_phases(self, tmp_path):
+        fig, axs = _gen_figure(3)
+
+        with profiling() as profile:
+            apply_bsic_style(fig, axs)
+            export_figure(fig, str(tmp_path / "figure"))
+
+        totals = profile.totals()
+        assert totals["_style_axis"]["calls"] == 3
+        for phase in (
+            "add_fonts",
+            "_add_sources",
+            "run_animations",
+            "savefig",
+            "tight_bbox",
+        ):
+            assert phase in totals
+
+        # the tight bounding box is computed within savefig
+        assert totals["tight_bbox"]["wall"] <= totals["savefig"]["wall"]
+        assert totals["savefig"]["cpu"] > 0
+        assert "savefig" in profile.summary()
+        # the method timed within savefig is restored
+        assert "get_tightbbox" not in vars(fig)
+
+        plt.close(fig)
+
+    def test_excel_phases(self, tmp_path):
+        df = pd.DataFrame(np.ones((10, 3)), columns=["a", "b", "c"])
+
+        with profiling() as profile:
+            df_to_excel(df, str(tmp_path / "table.xlsx"))
+
+        assert {"_write_index", "_write_data"} <= profile.totals().keys()
+
+    def test_disabled_outside_context(self):
+        fig, ax = _gen_figure()
+
+        with profiling() as profile:
+            pass
+        apply_bsic_style(fig, ax)
+
+        assert profile.events == []
+        assert _PROFILES == []
+
+        plt.close(fig)
+
+    def test_env_events(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        code = (
+            "import matplotlib; matplotlib.use('Agg');"
+            "import matplotlib.pyplot as plt;"
+            "from mpl_bsic import apply_bsic_style;"
+            "fig, ax = plt.subplots(); apply_bsic_style(fig, ax)"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+        subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            capture_output=True,
+            cwd=root,
+            env={**os.environ, PROFILE_ENV: str(path), "PYTHONPATH": root},
+        )
+
+        events = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [e["phase"] for e in events] == [
+            "add_fonts",
+            "_style_axis",
+            "_add_sources",
+        ]
+        assert all(e["wall"] >= 0 for e in events)
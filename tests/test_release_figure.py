@@ -0,0 +1,67 @@
+import weakref
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from mpl_bsic import (
+    apply_bsic_logo,
+    apply_bsic_style,
+    closing_figures,
+    export_figure,
+    plot_trade,
+    release_figure,
+)
+
+
+def _gen_trade():
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range("2022-01-03", periods=300)
+
+    underlying = pd.Series(100 + rng.standard_normal(300).cumsum(), index)
+    pnl = pd.Series(rng.standard_normal(300), index)
+    pnl.iloc[:250] = np.nan
+
+    return underlying, pnl
+
+
+class TestReleaseFigure:
+    def test_release(self):
+        fig, ax = plt.subplots(1, 1)
+        ax.plot([1, 2], [3, 4])
+        apply_bsic_style(fig, ax)
+        apply_bsic_logo(fig, ax)
+        fig.canvas.draw()
+
+        release_figure(fig)
+
+        assert not plt.fignum_exists(fig.number)
+        assert not hasattr(fig, "_bsic_animations")
+        assert len(fig.axes) == 0
+        assert "renderer" not in vars(fig.canvas)
+
+    def test_export_and_release(self, tmp_path):
+        trade = plot_trade(*_gen_trade(), "nominal", "Trade", "Underlying")
+        fig = trade.fig
+
+        export_figure(fig, str(tmp_path / "trade"), release=True)
+
+        assert (tmp_path / "trade.svg").exists()
+        assert not plt.fignum_exists(fig.number)
+        assert len(fig.axes) == 0
+
+    def test_closing_figures(self, tmp_path):
+        kept, _ = plt.subplots(1, 1)
+
+        with closing_figures():
+            trade = plot_trade(*_gen_trade(), "nominal", "Trade", "Underlying")
+            export_figure(trade.fig, str(tmp_path / "trade"))
+            ref = weakref.ref(trade.fig)
+            del trade
+
+        # the figures open before the context are left open
+        assert plt.fignum_exists(kept.number)
+        # the figure is freed when the context exits
+        assert ref() is None
+
+        plt.close(kept)
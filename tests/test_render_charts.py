@@ -0,0 +1,141 @@
+import importlib
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mpl_bsic import hash_chart, render_charts
+
+# the module, shadowed by the function in the package
+render_module = importlib.import_module("mpl_bsic.render_charts")
+
+
+def _line_spec(**kwargs):
+    spec = {
+        "kind": "line",
+        "title": "Prices",
+        "index": ["2024-01-01", "2024-01-02", "2024-01-03"],
+        "series": {"a": [1, 3, 2], "b": [2, 1, 3]},
+        "dpi": 50,
+    }
+
+    return {**spec, **kwargs}
+
+
+def _trade_spec():
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range("2022-01-03", periods=300)
+
+    pnl = pd.Series(rng.standard_normal(300), index)
+    pnl.iloc[:250] = np.nan
+
+    return {
+        "kind": "trade",
+        "title": "Trade",
+        "underlying": pd.Series(100 + rng.standard_normal(300).cumsum(), index),
+        "pnl": pnl,
+        "underlying_name": "Underlying",
+        "pnl_type": "cumulative",
+        "dpi": 50,
+    }
+
+
+class TestRenderCharts:
+    def test_hash(self):
+        spec = _line_spec()
+        same = _line_spec(
+            index=pd.to_datetime(spec["index"]),
+            series={"a": np.array([1.0, 3.0, 2.0]), "b": [2, 1, 3]},
+            logo=True,
+            format="svg",
+            filename="prices",
+        )
+
+        assert hash_chart(spec) == hash_chart(same)
+        # the order of the series changes the chart
+        reordered = _line_spec(series={"b": [2, 1, 3], "a": [1, 3, 2]})
+        assert hash_chart(spec) != hash_chart(reordered)
+        assert hash_chart(spec) != hash_chart(_line_spec(series={"a": [1, 3, 3]}))
+        assert hash_chart(spec) != hash_chart(_line_spec(format="png"))
+
+    def test_dedup(self, tmp_path, monkeypatch):
+        calls = []
+        render_spec = render_module._render_spec
+
+        def counting_render(spec):
+            calls.append(spec["kind"])
+            return render_spec(spec)
+
+        monkeypatch.setattr(render_module, "_render_spec", counting_render)
+
+        bar = {
+            "kind": "bar",
+            "categories": ["2Y", "5Y", "10Y"],
+            "series": {"bps": [10, -5, 3]},
+            "format": "png",
+            "dpi": 50,
+        }
+        images = render_charts(
+            [_line_spec(), _line_spec(filename=str(tmp_path / "prices")), bar],
+            n_jobs=1,
+        )
+
+        assert calls == ["line", "bar"]
+        assert images[0] == images[1]
+        assert images[0].startswith(b"<?xml")
+        assert images[2].startswith(b"\x89PNG")
+        assert (tmp_path / "prices.svg").read_bytes() == images[0]
+
+    def test_cache(self, tmp_path, monkeypatch):
+        cache_dir = str(tmp_path / "cache")
+        (image,) = render_charts([_line_spec()], n_jobs=1, cache_dir=cache_dir)
+
+        def failing_render(spec):
+            raise AssertionError("rendered again")
+
+        monkeypatch.setattr(render_module, "_render_spec", failing_render)
+
+        assert render_charts([_line_spec()], n_jobs=1, cache_dir=cache_dir) == [image]
+        # only the images are left in the cache, no temporary file
+        assert os.listdir(cache_dir) == [f"{hash_chart(_line_spec())}.svg"]
+
+    def test_versions_hashed(self, monkeypatch):
+        spec = _line_spec()
+        key = hash_chart(spec)
+
+        versions = {**render_module._versions(), "matplotlib": "99.0"}
+        monkeypatch.setattr(render_module, "_versions", lambda: versions)
+
+        # the images cached by another version are rendered again
+        assert hash_chart(spec) != key
+
+    def test_parallel(self):
+        logo = {"location": "bottom right", "type": "square"}
+        specs = [
+            _trade_spec(),
+            _line_spec(logo=logo, figsize={"width": 5, "aspect_ratio": 2}),
+            _line_spec(logo=False),
+        ]
+
+        images = render_charts(specs, n_jobs=2)
+
+        assert len(images) == 3
+        assert all(image.startswith(b"<?xml") for image in images)
+        assert len(set(images)) == 3
+
+    def test_invalid_specs(self):
+        for spec, error in [
+            ({"kind": "pie"}, "Chart kind pie is not supported"),
+            (_line_spec(colour="red"), "Unknown options"),
+            (_line_spec(format="gif"), "Format gif is not supported"),
+            (_line_spec(series={"a": [1, 2]}), "same length"),
+            (_line_spec(logo={"size": 2}), "Unknown logo options"),
+            ({"kind": "bar", "series": {"a": [1]}}, "Missing data"),
+            (_line_spec(dpi=0), "dpi must be"),
+            (_line_spec(dpi=10**6), "dpi must be"),
+            (_line_spec(dpi="300"), "dpi must be"),
+            (_line_spec(dpi=float("nan")), "dpi must be"),
+        ]:
+            with pytest.raises(Exception, match=error):
+                render_charts([spec], n_jobs=1)
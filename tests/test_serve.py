@@ -0,0 +1,212 @@
+import http.client
+import io
+import json
+import socket
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mpl_bsic.serve import SPEC_HEADER, _make_server
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path: str):
+        super().__init__("localhost")
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+def _serve(**kwargs):
+    server = _make_server(port=0, workers=1, **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
+
+
+def _stop(server):
+    server.shutdown()
+    server.server_close()
+    server.renderer.shutdown()
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = _serve()
+    yield server
+    _stop(server)
+
+
+def _request(server, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+    conn.request(method, path, body=body, headers=headers or {})
+    response = conn.getresponse()
+
+    return response.status, response.getheader("Content-Type"), response.read()
+
+
+def _gen_trade():
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range("2022-01-03", periods=300)
+
+    underlying = 100 + rng.standard_normal(300).cumsum()
+    pnl = rng.standard_normal(300)
+    pnl[:250] = np.nan
+
+    return index, underlying, pnl
+
+
+class TestServe:
+    def test_trade_json(self, server):
+        index, underlying, pnl = _gen_trade()
+        dates = [str(d.date()) for d in index]
+        spec = {
+            "title": "Trade",
+            "underlying_name": "Underlying",
+            "pnl_type": "cumulative",
+            "underlying": {"index": dates, "values": underlying.tolist()},
+            "pnl": {
+                "index": dates,
+                "values": [None if np.isnan(x) else x for x in pnl],
+            },
+        }
+
+        status, content_type, body = _request(
+            server,
+            "POST",
+            "/trade",
+            json.dumps(spec),
+            {"Content-Type": "application/json"},
+        )
+
+        assert status == 200
+        assert content_type == "image/svg+xml"
+        assert body.startswith(b"<?xml")
+
+    def test_line_npz(self, server):
+        index, underlying, _ = _gen_trade()
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            index=index.to_numpy(),
+            values=np.column_stack([underlying, underlying * 2]),
+        )
+        spec = {"title": "Line", "labels": ["a", "b"], "format": "png", "dpi": 50}
+
+        status, content_type, body = _request(
+            server,
+            "POST",
+            "/line",
+            buffer.getvalue(),
+            {"Content-Type": "application/x-npz", SPEC_HEADER: json.dumps(spec)},
+        )
+
+        assert status == 200
+        assert content_type == "image/png"
+        assert body.startswith(b"\x89PNG")
+
+    def test_invalid_requests(self, server):
+        json_type = {"Content-Type": "application/json"}
+        line = {"index": [1, 2], "series": {"a": [1, 2]}}
+
+        for path, spec, error in [
+            ("/pie", line, "Unknown chart kind"),
+            ("/line", {"index": [1, 2]}, "Missing data"),
+            ("/line", {**line, "format": "gif"}, "Format gif is not supported"),
+            ("/trade", {"pnl_type": "nominal"}, "Missing data"),
+            ("/line", {**line, "dpi": 10**6}, "dpi must be"),
+        ]:
+            status, _, body = _request(
+                server, "POST", path, json.dumps(spec), json_type
+            )
+
+            assert status == 400
+            assert error in json.loads(body)["error"]
+
+        status, _, body = _request(
+            server, "POST", "/line", b"{}", {"Content-Type": "text/csv"}
+        )
+        assert status == 400
+
+        # the server keeps serving after the errors
+        status, _, body = _request(server, "GET", "/health")
+        assert status == 200
+        assert json.loads(body)["workers"] == 1
+
+    def test_invalid_content_length(self, server):
+        for length in ("abc", "-1"):
+            with socket.create_connection(
+                ("127.0.0.1", server.server_address[1])
+            ) as sock:
+                sock.sendall(
+                    b"POST /line HTTP/1.1\r\nHost: localhost\r\n"
+                    + f"Content-Length: {length}\r\n\r\n".encode()
+                )
+                response = http.client.HTTPResponse(sock)
+                response.begin()
+
+                assert response.status == 400
+                assert "Content-Length" in json.loads(response.read())["error"]
+
+    def test_render_error(self, server):
+        index, underlying, _ = _gen_trade()
+        dates = [str(d.date()) for d in index]
+        # a valid spec, but the trade has no entry: plot_trade raises
+        spec = {
+            "underlying": {"index": dates, "values": underlying.tolist()},
+            "pnl": {"index": dates, "values": [None] * len(dates)},
+        }
+
+        status, _, body = _request(
+            server,
+            "POST",
+            "/trade",
+            json.dumps(spec),
+            {"Content-Type": "application/json"},
+        )
+
+        assert status == 500
+        assert "failed to render" in json.loads(body)["error"]
+
+    def test_busy(self, server):
+        renderer = server.renderer
+        for _ in range(renderer.max_pending):
+            renderer._slots.acquire()
+
+        try:
+            status, _, _ = _request(
+                server,
+                "POST",
+                "/line",
+                json.dumps({"index": [1, 2], "series": {"a": [1, 2]}}),
+                {"Content-Type": "application/json"},
+            )
+        finally:
+            for _ in range(renderer.max_pending):
+                renderer._slots.release()
+
+        assert status == 503
+
+    def test_unix_socket(self, tmp_path):
+        path = str(tmp_path / "bsic.sock")
+        server = _serve(socket_path=path)
+
+        try:
+            conn = _UnixConnection(path)
+            spec = {"index": [1, 2, 3], "series": {"a": [1, 3, 2]}, "dpi": 72}
+            conn.request(
+                "POST",
+                "/line",
+                body=json.dumps(spec),
+                headers={"Content-Type": "application/json"},
+            )
+            response = conn.getresponse()
+
+            assert response.status == 200
+            assert response.read().startswith(b"<?xml")
+        finally:
+            _stop(server)
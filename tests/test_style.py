@@ -1,9 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib as mpl
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from tools import baseline_save_fig, image_compare  # noqa
 
-from mpl_bsic import apply_bsic_style
+from mpl_bsic import apply_bsic_style, bsic_style
+from mpl_bsic.apply_bsic_style import (
+    BSIC_COLORS,
+    BSIC_FONT,
+    BSIC_RC,
+    DEFAULT_COLOR_CYCLE,
+    DEFAULT_FONT_SIZE,
+    DEFAULT_TITLE_STYLE,
+)
+from mpl_bsic.export_figure import EXPORT_DPI
+from utils.run_animations import run_animations
 
 
 def _gen_data():
@@ -239,3 +254,134 @@ class TestStyle:
         apply_bsic_style(fig, axs)
 
         return fig
+
+    @image_compare(baseline_images="test_style_legend")
+    def test_style_scoped(self):
+        """Tests the scoped style, with a legend added after applying style"""
+
+        x, y = _gen_data()
+        fig, ax = plt.subplots(1, 1)
+        ax: Axes
+
+        ax.plot(x, y, label="Sin(x)")
+        ax.set_title("Sin(x)")
+        apply_bsic_style(fig, ax, scoped=True)
+        ax.legend()
+
+        return fig
+
+
+def _render_scoped(title: str) -> np.ndarray:
+    x, y = _gen_data()
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.subplots(1, 1)
+
+    ax.plot(x, y, label=title)
+    ax.set_title(title)
+    apply_bsic_style(fig, ax, scoped=True)
+    ax.legend()
+
+    run_animations(fig)
+    fig.canvas.draw()
+
+    return np.asarray(fig.canvas.buffer_rgba()).copy()
+
+
+class TestScopedStyle:
+    def test_rcparams_untouched(self):
+        with mpl.rc_context():
+            mpl.rcdefaults()
+            defaults = dict(mpl.rcParams)
+
+            fig, ax = plt.subplots(1, 1)
+            apply_bsic_style(fig, ax, scoped=True)
+            run_animations(fig)
+
+            assert dict(mpl.rcParams) == defaults
+            assert ax.xaxis.get_major_ticks()[0].label1.get_fontfamily() == [BSIC_FONT]
+
+            plt.close(fig)
+
+    def test_threads(self):
+        titles = ["Sin(x)", "Cos(x)"] * 4
+        expected = [_render_scoped(title) for title in titles]
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            images = list(pool.map(_render_scoped, titles))
+
+        assert all(np.array_equal(a, b) for a, b in zip(images, expected))
+
+    def test_context(self):
+        dpi = mpl.rcParams["savefig.dpi"]
+
+        with bsic_style():
+            assert mpl.rcParams["font.sans-serif"] == [BSIC_FONT]
+            assert mpl.rcParams["savefig.dpi"] == 1200
+
+            fig, ax = plt.subplots(1, 1)
+            apply_bsic_style(fig, ax)
+            plt.close(fig)
+
+        assert mpl.rcParams["savefig.dpi"] == dpi
+
+
+class TestStyleSheet:
+    def test_matches_defaults(self):
+        assert BSIC_RC["axes.prop_cycle"] == DEFAULT_COLOR_CYCLE
+        assert BSIC_RC["font.size"] == DEFAULT_FONT_SIZE
+        assert BSIC_RC["axes.titlesize"] == DEFAULT_TITLE_STYLE["fontsize"]
+        assert BSIC_RC["savefig.dpi"] == EXPORT_DPI
+
+    def test_registered(self):
+        assert "bsic" in plt.style.available
+
+        for name in ["bsic", "mpl_bsic.bsic"]:
+            with plt.style.context(name):
+                assert mpl.rcParams["axes.prop_cycle"] == DEFAULT_COLOR_CYCLE
+
+    def test_no_restyle(self):
+        """Lines and legends of figures created in the BSIC style are kept"""
+        x, y = _gen_data()
+
+        with plt.style.context("bsic"):
+            fig, ax = plt.subplots(1, 1)
+            ax.plot(x, y, label="Sin(x)")
+            ax.plot(x, -y, label="-Sin(x)")
+            legend = ax.legend()
+
+            apply_bsic_style(fig, ax, scoped=True)
+            ax.plot(x, 2 * y)
+
+        colors = [line.get_color() for line in ax.get_lines()]
+        assert colors == BSIC_COLORS[:3]
+        assert ax.get_legend() is legend
+
+        plt.close(fig)
+
+
+class TestGrid:
+    def test_2d_grid(self):
+        x, y = _gen_data()
+        fig, axs = plt.subplots(4, 5)
+
+        for i, ax in enumerate(axs.flat):
+            ax.plot(x, y)
+            if i % 2 == 0:
+                ax.set_title(f"Sin(x) {i}")
+
+        apply_bsic_style(fig, axs)
+
+        # the other titles are set after applying the style
+        for i, ax in enumerate(axs.flat):
+            if i % 2 == 1:
+                ax.set_title(f"Sin(x) {i}")
+
+        run_animations(fig)
+
+        assert len(fig._bsic_animations) == 1
+        for ax in axs.flat:
+            assert ax.title.get_fontname() == DEFAULT_TITLE_STYLE["fontname"]
+            assert ax.get_lines()[0].get_color() == BSIC_COLORS[0]
+
+        plt.close(fig)
@@ -0,0 +1,145 @@
+import warnings
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from mpl_bsic import plot_trade, trade_stats
+from mpl_bsic.trade_stats import _format_stats
+
+
+def _gen_pnl(n: int = 500, entry: int = 100):
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2022-01-03", periods=n)
+
+    pnl = pd.Series(rng.standard_normal(n) + 0.05, dates)
+    pnl.iloc[:entry] = np.nan
+
+    return pnl
+
+
+class TestTradeStats:
+    def test_matches_pandas(self):
+        pnl = _gen_pnl()
+        returns = pnl.dropna()
+        equity = returns.cumsum()
+
+        stats = trade_stats(pnl, "nominal", periods_per_year=252)
+
+        assert np.isclose(stats["max_drawdown"], (equity - equity.cummax()).min())
+        assert np.isclose(stats["hit_rate"], (returns > 0).mean())
+        assert np.isclose(
+            stats["sharpe"], returns.mean() / returns.std() * np.sqrt(252)
+        )
+        assert np.isclose(stats["volatility"], returns.std() * np.sqrt(252))
+
+    def test_time_under_water(self):
+        dates = pd.date_range("2023-01-01", periods=6, freq="D")
+        pnl = pd.Series([1.0, -1.0, -1.0, 3.0, -1.0, 0.5], dates)
+
+        stats = trade_stats(pnl, "nominal")
+
+        # on Jan 3, 2 days after the last peak (recovered on Jan 4)
+        assert stats["time_under_water"] == pd.Timedelta(days=2)
+        assert stats["max_drawdown"] == -2.0
+        assert stats["hit_rate"] == 0.5
+
+    def test_cumulative_matches_nominal(self):
+        pnl = _gen_pnl()
+        pnl.iloc[200:210] = np.nan
+
+        nominal = trade_stats(pnl, "nominal")
+        cumulative = trade_stats(pnl.cumsum(), "cumulative")
+
+        # NaNs are kept by cumsum, and forward filled by trade_stats
+        assert nominal["max_drawdown"] == cumulative["max_drawdown"]
+        assert nominal["time_under_water"] == cumulative["time_under_water"]
+
+    def test_invalid_pnl_type(self):
+        pnl = _gen_pnl()
+
+        with pytest.raises(Exception, match="pnl type is not supported"):
+            trade_stats(pnl, "log")  # type: ignore
+
+    def test_undefined_stats(self):
+        index = pd.bdate_range("2024-01-01", periods=5)
+        same_date = pd.DatetimeIndex([index[0]] * 5)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            constant = trade_stats(pd.Series([1.0] * 5, index), "nominal")
+            instant = trade_stats(pd.Series([1.0, -1, 2, 0, 1], same_date), "nominal")
+
+        # no risk, so no Sharpe ratio
+        assert np.isnan(constant["sharpe"]) and constant["volatility"] == 0
+        # no time elapsed, so nothing to annualise
+        assert np.isnan(instant["sharpe"]) and np.isnan(instant["volatility"])
+        assert instant["max_drawdown"] == -1
+
+        assert "Sharpe: n/a" in _format_stats(constant)
+
+
+class TestStatsPanel:
+    def test_plot_trade_stats(self):
+        # the trade is entered within the plotted window
+        pnl = _gen_pnl(entry=450)
+        underlying = pd.Series(
+            100 + np.random.default_rng(1).standard_normal(500).cumsum(), pnl.index
+        )
+
+        trade = plot_trade(
+            underlying, pnl, "nominal", "Trade", "Underlying", stats=True
+        )
+
+        expected = trade_stats(pnl, "nominal")
+        assert trade.stats.keys() == expected.keys()
+        assert np.isclose(trade.stats["sharpe"], expected["sharpe"])
+        assert any("Sharpe" in t.get_text() for t in trade.axs[1].texts)
+
+        plt.close(trade.fig)
+
+    def test_no_stats_by_default(self):
+        pnl = _gen_pnl(entry=450)
+        underlying = pd.Series(100.0, pnl.index)
+
+        trade = plot_trade(underlying, pnl, "nominal", "Trade", "Underlying")
+
+        assert trade.stats is None
+
+        plt.close(trade.fig)
+
+    def test_missing_values(self):
+        # 1 a day, and a missing tick after the entry
+        pnl = pd.Series(1.0, pd.bdate_range("2024-01-01", periods=60))
+        pnl.iloc[:10] = np.nan
+        pnl.iloc[30] = np.nan
+        underlying = pd.Series(100.0, pnl.index)
+
+        for pnl_type, expected in [
+            ("nominal", trade_stats(pnl, "nominal")),
+            ("cumulative", trade_stats(pnl.cumsum(), "cumulative")),
+        ]:
+            trade = plot_trade(
+                underlying, pnl, pnl_type, "Trade", "Underlying", stats=True
+            )
+
+            # the missing tick is no PnL, not a drop to 0
+            assert trade.stats == expected
+            assert trade.stats["max_drawdown"] == 0
+
+            plt.close(trade.fig)
+
+    def test_too_short_window(self):
+        # a single PnL value from the entry: the chart is plotted without the box
+        pnl = _gen_pnl(entry=499)
+        underlying = pd.Series(100.0, pnl.index)
+
+        trade = plot_trade(
+            underlying, pnl, "nominal", "Trade", "Underlying", stats=True
+        )
+
+        assert trade.stats is None
+        assert not any("Sharpe" in t.get_text() for t in trade.axs[1].texts)
+
+        plt.close(trade.fig)
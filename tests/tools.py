@@ -1,39 +1,115 @@
 import functools
+import hashlib
+import io
+import json
 import os
-from os.path import join, split
+import time
+from os.path import join
 
-from flaky import flaky
+import matplotlib as mpl
+import numpy as np
 from matplotlib import pyplot as plt
 from matplotlib.figure import Figure
-from matplotlib.testing.compare import compare_images
+from matplotlib.testing.compare import calculate_rms, compare_images
 from matplotlib.testing.decorators import remove_ticks_and_titles
 from matplotlib.testing.exceptions import ImageComparisonFailure
+from PIL import Image
 
 from utils.run_animations import run_animations
 
+BASELINE_DIR = join("tests", "baseline")
+OUTPUT_DIR = join("tests", "output_images")
 
-def _compare_img(fig: Figure, expected: str, format_: str, tol: float):
-    base_dir, filename = split(join("tests", "baseline", expected))
-    out_dir = split(join("tests", "output_images", expected))[0]
+RENDER_TIMES = join(OUTPUT_DIR, "render_times.jsonl")
+"""Render and comparison times of each image test, one JSON line per test."""
 
-    if not os.path.exists(out_dir):
-        os.makedirs(out_dir)
+_SAVEFIG_RC = {"savefig.bbox": "standard", "savefig.dpi": "figure"}
+"""Settings the baselines were saved with."""
 
-    plt.rcParams["savefig.bbox"] = "standard"
-    plt.rcParams["savefig.dpi"] = "figure"
 
-    run_animations(fig)
-    fig.savefig(os.path.join(out_dir, (filename + format_)))
+def _load_pixels(image: Image.Image) -> np.ndarray:
+    # as compare_images: an opaque RGBA image compares equal to an RGB one
+    if image.mode != "RGBA" or image.getextrema()[3][0] == 255:
+        image = image.convert("RGB")
 
-    image_name = filename + format_
-    expected_name = os.path.join(base_dir, image_name)
-    actual_name = os.path.join(out_dir, filename + format_)
+    return np.asarray(image)
+
+
+def _digest(pixels: np.ndarray) -> str:
+    return hashlib.sha1(pixels.tobytes() + str(pixels.shape).encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _baseline(path: str, mtime: float) -> tuple[np.ndarray, str]:
+    """Pixels and digest of a baseline, decoded once per process (and per change)."""
+    with Image.open(path) as image:
+        pixels = _load_pixels(image)
+
+    return pixels, _digest(pixels)
+
+
+def _record_time(event: dict):
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    # a single short append per test, safe with parallel workers
+    with open(RENDER_TIMES, "a") as f:
+        f.write(json.dumps(event) + "\n")
 
-    err = compare_images(expected_name, actual_name, tol, in_decorator=True)
 
+def _compare_img(fig: Figure, expected: str, format_: str, tol: float, name: str):
+    """Compares the figure with its baseline, rendering it only once.
+
+    The figure is rendered in memory, and its pixels compared with the
+    (cached) baseline: identical pixels pass at once, and the RMS is only
+    computed when they differ. The images are written to ``OUTPUT_DIR``
+    (under the name of the test, so that parallel tests do not clash)
+    only when the comparison fails, with the diff of ``compare_images``.
+    """
+    expected_name = join(BASELINE_DIR, expected + format_)
     if not os.path.exists(expected_name):
         raise ImageComparisonFailure("image does not exist: %s" % expected_name)
 
+    start = time.perf_counter()
+    run_animations(fig)
+    buffer = io.BytesIO()
+    with mpl.rc_context(_SAVEFIG_RC):
+        fig.savefig(buffer, format=format_.lstrip("."))
+    render_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with Image.open(buffer) as image:
+        actual = _load_pixels(image)
+    baseline, baseline_digest = _baseline(
+        expected_name, os.path.getmtime(expected_name)
+    )
+
+    stage = "exact"
+    passed = _digest(actual) == baseline_digest
+    if not passed:
+        stage = "rms"
+        passed = actual.shape == baseline.shape and bool(
+            calculate_rms(baseline.astype(np.int16), actual.astype(np.int16)) <= tol
+        )
+
+    _record_time(
+        {
+            "test": name,
+            "baseline": expected,
+            "render": render_time,
+            "compare": time.perf_counter() - start,
+            "stage": stage,
+            "passed": passed,
+        }
+    )
+    if passed:
+        return
+
+    # writes the image, and lets compare_images report (and draw) the difference
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    actual_name = join(OUTPUT_DIR, name + format_)
+    with open(actual_name, "wb") as f:
+        f.write(buffer.getvalue())
+
+    err = compare_images(expected_name, actual_name, tol, in_decorator=True)
     if err is not None:
         for key in ["actual", "expected"]:
             err[key] = os.path.relpath(err[key])  # type: ignore
@@ -49,20 +125,18 @@ def image_compare(
     remove_text: bool = False,
 ):
     def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
         @functools.wraps(func)
-        @flaky(max_runs=3, min_passes=1)
         def wrapper(*args, **kwargs):
-            print("decorator got called")
-            plt.close("all")
-
             fig = func(*args, **kwargs)
             if remove_text:
                 remove_ticks_and_titles(fig)
 
             try:
-                _compare_img(fig, baseline_images, fmt, tol)
+                _compare_img(fig, baseline_images, fmt, tol, name)
             finally:
-                plt.close("all")
+                plt.close(fig)
 
         return wrapper
 
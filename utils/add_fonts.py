@@ -5,6 +5,9 @@ from pathlib import Path
 
 import matplotlib.font_manager as font_manager
 
+# the fonts only need to be added once per process
+_FONTS_ADDED = False
+
 
 def _get_fonts_path():
     BASE_DIR = None
@@ -23,10 +26,15 @@ def _get_fonts_path():
 
 
 def add_fonts():
+    global _FONTS_ADDED
+    if _FONTS_ADDED:
+        return
+
     # first try to find if the fonts are installed
     fontlist = font_manager.get_font_names()
     if "Garamond" in fontlist and "Gill Sans MT" in fontlist:
         print("fonts already added so will not add again")
+        _FONTS_ADDED = True
         return
 
     # if not, add them
@@ -45,3 +53,5 @@ def add_fonts():
             # print(
             #     "font name: ", font_manager.FontProperties(fname=font_path).get_name()
             # )
+
+    _FONTS_ADDED = True
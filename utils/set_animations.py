@@ -1,4 +1,6 @@
-from matplotlib.animation import Animation
+from typing import Callable
+
+from matplotlib.animation import Animation, FuncAnimation
 from matplotlib.figure import Figure
 
 
@@ -10,3 +12,53 @@ def insert_animation(fig: Figure, animation: Animation):
         # initialize the animation
         animations = [animation]
         setattr(fig, "_bsic_animations", animations)
+
+
+def insert_deferred(fig: Figure, func: Callable[[], None]):
+    """Runs ``func`` when the figure is drawn (or exported), in a single animation
+    shared by all the functions deferred on the figure.
+
+    ``func`` may run more than once, so it must be idempotent.
+    """
+    if hasattr(fig, "_bsic_deferred"):
+        getattr(fig, "_bsic_deferred").append(func)
+        return
+
+    deferred = [func]
+    setattr(fig, "_bsic_deferred", deferred)
+
+    def run_deferred(_):
+        for deferred_func in deferred:
+            deferred_func()
+
+        return []
+
+    ani = FuncAnimation(
+        fig,
+        run_deferred,
+        frames=1,
+        blit=False,
+        cache_frame_data=False,
+        repeat=False,
+    )
+
+    insert_animation(fig, ani)
+
+
+def clear_animations(fig: Figure):
+    """Removes the animations (and deferred functions) of the figure,
+    so that they do not run when it is drawn again (e.g. when it is reused).
+    """
+    for ani in getattr(fig, "_bsic_animations", []):
+        fig.canvas.mpl_disconnect(ani._first_draw_id)
+        fig.canvas.mpl_disconnect(ani._close_id)
+        # the timer of a started animation (e.g. shown) references it
+        if getattr(ani, "event_source", None) is not None:
+            ani.event_source.remove_callback(ani._step)
+            ani.event_source.stop()
+        # the animation is dropped on purpose, do not warn that it never ran
+        ani._draw_was_started = True
+
+    for name in ("_bsic_animations", "_bsic_deferred"):
+        if hasattr(fig, name):
+            delattr(fig, name)